@@ -0,0 +1,158 @@
+"""``/admin/*``: on-demand profiling and slow-request traces.
+
+Opt-in with ``profiling.enabled``; every endpoint returns 404 otherwise.
+
+- ``GET /admin/profile?seconds=N`` runs the sampling profiler for N seconds
+  while the API keeps serving, then returns collapsed stacks for a
+  flamegraph.
+- ``GET /admin/traces`` lists the kept request traces, newest first, with the
+  time spent in each phase and the request's allocations.
+- ``GET /admin/memory`` reports the process RSS and, while ``tracemalloc`` runs
+  (``profiling.trace_allocations``), the top allocating source lines.
+
+Request tracing itself is always on. ``RequestTracingMiddleware`` opens a
+``RequestTrace`` per request and offers it to the ``TraceBuffer`` when the
+response is sent, so slow requests are captured before anyone asks for them.
+"""
+import threading
+import time
+import tracemalloc
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from api.lifecycle import UNTRACKED_PATHS
+from src.config.configuration import ConfigurationManager, ProfilingConfig
+from src.monitoring.profiling import RequestTrace, SamplingProfiler, TraceBuffer, current_trace, phase
+from src.utils.logger import setup_logger
+from src.utils.memory import peak_rss_bytes, rss_bytes, to_mb, top_allocators
+
+logger = setup_logger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+config: Optional[ProfilingConfig] = None
+traces: Optional[TraceBuffer] = None
+_profile_lock = threading.Lock()
+
+
+def get_config() -> ProfilingConfig:
+    global config
+    if config is None:
+        config = ConfigurationManager().get_profiling_config()
+    return config
+
+
+def get_traces() -> TraceBuffer:
+    global traces
+    if traces is None:
+        traces = TraceBuffer.from_config(get_config())
+    return traces
+
+
+def start_allocation_tracing():
+    """Start ``tracemalloc`` if ``profiling.trace_allocations`` asks for per-request allocation sizes"""
+    if get_config().trace_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        logger.info("Tracing Python allocations; expect slower requests")
+
+
+async def validation_phase():
+    """App-wide dependency: runs after the body is read, before it is validated"""
+    phase("validation")
+
+
+class RequestTracingMiddleware:
+    """ASGI middleware tracing each HTTP request's phases into the ``TraceBuffer``"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        path = scope["path"] if scope["type"] == "http" else None
+        if path is None or path in UNTRACKED_PATHS or path.startswith(("/admin", "/static")):
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace(scope["method"], path)
+        token = current_trace.set(trace)
+        status = 500
+
+        async def send_traced(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_traced)
+        finally:
+            current_trace.reset(token)
+            trace.finish(status)
+            buffer = get_traces()
+            buffer.offer(trace)
+            if trace.duration_ms >= buffer.slow_request_ms:
+                logger.warning(f"Slow request: {trace.method} {path} took {trace.duration_ms:.1f}ms "
+                               f"{trace.to_dict()['phases']}")
+
+
+def _require_enabled():
+    if not get_config().enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(seconds: float = Query(10.0, gt=0), interval_ms: Optional[float] = Query(None, gt=0),
+                  include_idle: bool = False):
+    """Sample all threads for ``seconds`` and return collapsed stacks"""
+    _require_enabled()
+    profiling_config = get_config()
+    if seconds > profiling_config.max_seconds:
+        raise HTTPException(status_code=400, detail=f"seconds must be at most {profiling_config.max_seconds}")
+    if not _profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    try:
+        profiler = SamplingProfiler((interval_ms or profiling_config.sample_interval_ms) / 1000, include_idle)
+        logger.info(f"Profiling for {seconds}s")
+        await run_in_threadpool(profiler.run, seconds)
+    finally:
+        _profile_lock.release()
+
+    filename = f"profile-{time.strftime('%Y%m%d-%H%M%S')}.collapsed"
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Profile-Samples": str(profiler.samples),
+        },
+    )
+
+
+@router.get("/traces")
+async def recent_traces(limit: int = Query(50, ge=1)):
+    """Kept request traces, newest first, with per-phase milliseconds"""
+    _require_enabled()
+    buffer = get_traces()
+    return {**buffer.stats(), 'traces': buffer.recent(limit)}
+
+
+@router.get("/memory")
+async def memory(top: int = Query(10, ge=0, le=100)):
+    """Process RSS, and the top allocators while allocations are traced"""
+    _require_enabled()
+    report = {
+        'rss_mb': to_mb(rss_bytes()),
+        'peak_rss_mb': to_mb(peak_rss_bytes()),
+        'tracemalloc': tracemalloc.is_tracing(),
+    }
+    if report['tracemalloc']:
+        current, traced_peak = tracemalloc.get_traced_memory()
+        report['traced_mb'] = to_mb(current)
+        report['traced_peak_mb'] = to_mb(traced_peak)
+        if top:
+            report['top_allocators'] = await run_in_threadpool(
+                lambda: top_allocators(tracemalloc.take_snapshot(), limit=top)
+            )
+    return report
@@ -0,0 +1,84 @@
+"""``/analytics/*``: prediction analytics for the dashboard.
+
+Served predictions are added to a ``PredictionAnalytics`` ring of time
+buckets as they are made; these endpoints only sum the retained buckets, so
+they cost O(buckets) however much traffic the API has served. ``buckets``
+limits a query to the most recent buckets.
+
+Each uvicorn worker process has its own tracker, so with
+``concurrency.serving_workers > 1`` a response covers only the worker that
+served it. The buckets are then not persisted either: the workers would
+overwrite one state file and each reload the others' counts on restart.
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from src.config.configuration import ConfigurationManager
+from src.monitoring.prediction_analytics import PredictionAnalytics
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+tracker: Optional[PredictionAnalytics] = None
+state_path: Optional[str] = None
+
+
+def get_tracker() -> PredictionAnalytics:
+    global tracker, state_path
+    if tracker is None:
+        config_manager = ConfigurationManager()
+        config = config_manager.get_analytics_config()
+        serving_workers = config_manager.get_concurrency_config().serving_workers
+        if serving_workers > 1:
+            logger.warning(f"{serving_workers} serving workers: analytics are per worker and not persisted")
+            config.state_path = ""
+        state_path = config.state_path
+        tracker = PredictionAnalytics.from_config(config)
+    return tracker
+
+
+def save_state():
+    """Persist the buckets so a restart keeps the dashboard history"""
+    if tracker is not None and state_path:
+        try:
+            tracker.save(state_path)
+        except Exception as e:
+            logger.error(f"Failed to save analytics state: {str(e)}")
+
+
+def _buckets():
+    return Query(None, ge=1, description="Limit to the most recent buckets")
+
+
+@router.get("/summary")
+async def summary(buckets: Optional[int] = _buckets()):
+    """Prediction volume, predicted churn rate and high-risk count"""
+    return get_tracker().summary(buckets)
+
+
+@router.get("/risk_distribution")
+async def risk_distribution(buckets: Optional[int] = _buckets()):
+    """Count and share of predictions per risk level"""
+    return get_tracker().risk_distribution(buckets)
+
+
+@router.get("/probability_histogram")
+async def probability_histogram(buckets: Optional[int] = _buckets()):
+    """Histogram of served churn probabilities"""
+    return get_tracker().probability_histogram(buckets)
+
+
+@router.get("/segments")
+async def segments(buckets: Optional[int] = _buckets()):
+    """Predicted churn rate by contract length, payment method and internet service"""
+    return get_tracker().segment_rates(buckets)
+
+
+@router.get("/volume")
+async def volume(buckets: Optional[int] = _buckets()):
+    """Predictions per time bucket, oldest first"""
+    tracker = get_tracker()
+    return {'bucket_seconds': tracker.bucket_seconds, 'buckets': tracker.volume(buckets)}
@@ -0,0 +1,165 @@
+"""Columnar batch scoring: one array per field instead of one object per customer.
+
+Request bodies are either a JSON object mapping each ``CustomerFeatures``
+field to an array, or an Arrow IPC stream with those columns. The ``Field``
+constraints of ``CustomerFeatures`` are checked as NumPy masks over whole
+columns, and a 422 lists the offending row indices per field. Responses are
+columnar as well: JSON encoded by orjson, or Arrow IPC when requested via
+``Accept``.
+
+Oversized batches are refused before the expensive work: ``read_body`` checks
+``Content-Length`` (and the bytes actually streamed) against
+``MAX_BODY_BYTES``, and ``decode_columns`` checks the row count right after
+parsing JSON, or batch by batch while reading an Arrow stream, before any
+column is converted or validated.
+"""
+import io
+from typing import Dict, List
+
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow as pa
+from fastapi import Request
+from fastapi.responses import Response
+
+from api.schemas import CustomerFeatures
+from src.data.feature_schema import FEATURE_SCHEMA
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+MAX_BATCH_ROWS = 1000
+# Far above what MAX_BATCH_ROWS rows take as JSON or Arrow
+MAX_BODY_BYTES = 4 * 1024 * 1024
+
+_BOUNDS = {"ge": np.greater_equal, "gt": np.greater, "le": np.less_equal, "lt": np.less}
+
+
+class ColumnarValidationError(ValueError):
+    def __init__(self, errors: List[Dict]):
+        super().__init__(f"{len(errors)} invalid field(s)")
+        self.errors = errors
+
+
+class BatchTooLargeError(ValueError):
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def field_constraints(model=CustomerFeatures) -> Dict[str, Dict[str, float]]:
+    """Numeric bounds declared on the model's fields, e.g. ``{'age': {'ge': 18, 'le': 100}}``"""
+    constraints = {}
+    for name, field in model.model_fields.items():
+        bounds = {}
+        for metadata in field.metadata:
+            for bound in _BOUNDS:
+                if getattr(metadata, bound, None) is not None:
+                    bounds[bound] = getattr(metadata, bound)
+        constraints[name] = bounds
+    return constraints
+
+
+CONSTRAINTS = field_constraints()
+
+
+def _too_many_rows(max_rows: int) -> BatchTooLargeError:
+    return BatchTooLargeError(f"Batch size too large. Maximum {max_rows} predictions at once.")
+
+
+async def read_body(request: Request, max_bytes: int = MAX_BODY_BYTES) -> bytes:
+    """Request body, refused with a 413 as soon as it is known to exceed ``max_bytes``"""
+    too_large = BatchTooLargeError(f"Request body too large. Maximum {max_bytes} bytes.", status_code=413)
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > max_bytes:
+        raise too_large
+    # Chunked bodies carry no length, so count while reading
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def decode_columns(body: bytes, content_type: str, max_rows: int = MAX_BATCH_ROWS) -> Dict[str, np.ndarray]:
+    """Column arrays from a JSON object of arrays or an Arrow IPC stream of at most ``max_rows`` rows"""
+    if content_type.startswith(ARROW_STREAM):
+        reader = pa.ipc.open_stream(body)
+        batches, rows = [], 0
+        for batch in reader:
+            rows += batch.num_rows
+            if rows > max_rows:
+                raise _too_many_rows(max_rows)
+            batches.append(batch)
+        table = pa.Table.from_batches(batches, schema=reader.schema)
+        return {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}
+    data = orjson.loads(body)
+    if not isinstance(data, dict) or not all(isinstance(values, list) for values in data.values()):
+        raise ValueError("Expected a JSON object with one array per field")
+    if max(map(len, data.values()), default=0) > max_rows:
+        raise _too_many_rows(max_rows)
+    return data
+
+
+def validate_columns(columns: Dict) -> pd.DataFrame:
+    """Typed feature frame, or ``ColumnarValidationError`` listing bad rows per field"""
+    missing = [name for name in FEATURE_SCHEMA.feature_names if name not in columns]
+    if missing:
+        raise ColumnarValidationError([
+            {"loc": ["body", name], "msg": "Field required"} for name in missing
+        ])
+    lengths = {len(columns[name]) for name in FEATURE_SCHEMA.feature_names}
+    if len(lengths) > 1:
+        raise ColumnarValidationError([{"loc": ["body"], "msg": "All fields must have the same length"}])
+
+    errors, typed = [], {}
+    for spec in FEATURE_SCHEMA.features:
+        values = columns[spec.name]
+        if spec.is_categorical:
+            values = np.asarray(values, dtype=object)
+            if pd.api.types.infer_dtype(values, skipna=False) == "string":
+                invalid = np.zeros(len(values), dtype=bool)
+            else:
+                invalid = np.fromiter((not isinstance(v, str) for v in values), dtype=bool, count=len(values))
+            msg = "Input should be a valid string"
+        else:
+            try:
+                values = np.asarray(values, dtype=np.float64)
+            except (TypeError, ValueError):
+                values = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+            # NaN covers nulls and non-numeric input
+            with np.errstate(invalid="ignore"):
+                invalid = np.isnan(values)
+                if spec.dtype.startswith("int"):
+                    invalid |= values != np.floor(values)
+                for bound, limit in CONSTRAINTS[spec.name].items():
+                    invalid |= ~_BOUNDS[bound](values, limit)
+            bounds = ", ".join(f"{bound} {limit}" for bound, limit in CONSTRAINTS[spec.name].items())
+            msg = f"Input should be a valid {'integer' if spec.dtype.startswith('int') else 'number'}"
+            msg += f" ({bounds})" if bounds else ""
+        if invalid.any():
+            errors.append({"loc": ["body", spec.name], "msg": msg, "rows": np.flatnonzero(invalid).tolist()})
+        else:
+            typed[spec.name] = values
+
+    if errors:
+        raise ColumnarValidationError(errors)
+    return FEATURE_SCHEMA.from_columns(typed)
+
+
+def encode_columns(columns: Dict[str, np.ndarray], accept: str) -> Response:
+    """Arrow IPC when the client accepts it, otherwise JSON arrays encoded straight from NumPy"""
+    if ARROW_STREAM in accept:
+        table = pa.table(columns)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(content=sink.getvalue(), media_type=ARROW_STREAM)
+    content = {
+        name: values if values.dtype.kind in "biuf" else values.tolist()
+        for name, values in columns.items()
+    }
+    return Response(content=orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY),
+                    media_type="application/json")
@@ -0,0 +1,170 @@
+"""``/jobs``: asynchronous batch scoring of whole datasets.
+
+Clients submit a server-side dataset path or upload a file and poll the job
+until it completes, then page through or download the scored rows. Jobs are
+persisted in the SQLite ``JobStore`` and scored by ``src.pipeline.job_queue``
+workers, either threads started with the API (``jobs.n_workers``) or
+``python -m src.pipeline.job_queue`` processes sharing ``jobs.jobs_dir``.
+With several uvicorn workers (``concurrency.serving_workers > 1``) no
+threads are started with the API, since every worker process would start
+its own pool; run ``src.pipeline.job_queue`` alongside instead.
+"""
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse
+
+from api.schemas import JobRequest, JobResponse
+from src.config.configuration import ConfigurationManager
+from src.pipeline.job_queue import JobStore, JobWorkerPool, OUTPUT_FORMATS
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+UPLOAD_FORMATS = {"csv": ".csv", "parquet": ".parquet"}
+
+store: Optional[JobStore] = None
+worker_pool: Optional[JobWorkerPool] = None
+
+
+def get_store() -> JobStore:
+    global store
+    if store is None:
+        store = JobStore(ConfigurationManager().get_jobs_config())
+    return store
+
+
+def worker_threads(serving_workers: int = 1) -> int:
+    """In-process job threads per API process: ``jobs.n_workers``, or none with several uvicorn workers"""
+    return get_store().config.n_workers if serving_workers <= 1 else 0
+
+
+def start_workers(prediction_pipeline, serving_workers: int = 1, monitor=None):
+    """Start the in-process workers; ``jobs.n_workers: 0`` leaves scoring to external workers"""
+    global worker_pool
+    job_store = get_store()
+    n_workers = worker_threads(serving_workers)
+    if n_workers > 0:
+        worker_pool = JobWorkerPool(job_store, prediction_pipeline, n_workers, monitor=monitor)
+        worker_pool.start()
+    elif job_store.config.n_workers > 0:
+        logger.warning(
+            f"{serving_workers} serving workers: not starting in-process job workers; "
+            "run `python -m src.pipeline.job_queue` to score jobs"
+        )
+
+
+def stop_workers():
+    global worker_pool
+    if worker_pool is not None:
+        worker_pool.stop(timeout=5)
+        worker_pool = None
+
+
+def _output_format(output_format: Optional[str]) -> str:
+    output_format = output_format or get_store().config.output_format
+    if output_format not in OUTPUT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"output_format must be one of: {', '.join(OUTPUT_FORMATS)}")
+    return output_format
+
+
+def _get_job(job_id: str) -> dict:
+    job = get_store().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.post("", response_model=JobResponse, status_code=202)
+async def submit_job(job_request: JobRequest):
+    """Queue a scoring job for a dataset already on the server"""
+    try:
+        return get_store().create(job_request.input_path, _output_format(job_request.output_format))
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Job submission error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Job submission failed: {str(e)}")
+
+
+@router.post("/upload", response_model=JobResponse, status_code=202)
+async def upload_job(
+    request: Request,
+    input_format: str = Query("csv", description="Format of the uploaded body: csv or parquet"),
+    output_format: Optional[str] = Query(None, description="parquet or csv"),
+):
+    """Queue a scoring job for a dataset sent as the raw request body"""
+    try:
+        if input_format not in UPLOAD_FORMATS:
+            raise HTTPException(status_code=400, detail=f"input_format must be one of: {', '.join(UPLOAD_FORMATS)}")
+        output_format = _output_format(output_format)
+        job_store = get_store()
+        job_id = uuid.uuid4().hex
+        path = job_store.upload_path(job_id, UPLOAD_FORMATS[input_format])
+
+        # Stream to disk so large uploads never sit in memory
+        size = 0
+        with open(path, "wb") as f:
+            async for block in request.stream():
+                size += len(block)
+                if size > job_store.config.max_upload_bytes:
+                    f.close()
+                    path.unlink()
+                    raise HTTPException(status_code=413, detail="Upload exceeds jobs.max_upload_bytes")
+                f.write(block)
+        if size == 0:
+            path.unlink()
+            raise HTTPException(status_code=400, detail="Empty upload")
+
+        return job_store.create(str(path), output_format, job_id=job_id)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Job upload error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Job upload failed: {str(e)}")
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def job_status(job_id: str):
+    """Status and progress of a job"""
+    return _get_job(job_id)
+
+
+@router.get("/{job_id}/results")
+async def job_results(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=10000),
+):
+    """A page of scored rows; rows of finished chunks are readable while the job runs"""
+    job = _get_job(job_id)
+    try:
+        page = get_store().read_results(job_id, offset, limit)
+        return {
+            "job_id": job_id,
+            "status": job['status'],
+            "offset": offset,
+            "total_rows": job['total_rows'],
+            "rows_available": job['rows_done'],
+            "results": page.to_dict(orient="records"),
+        }
+    except Exception as e:
+        logger.error(f"Job results error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Reading results failed: {str(e)}")
+
+
+@router.get("/{job_id}/download")
+async def download_job(job_id: str):
+    """The complete result file of a finished job"""
+    job = _get_job(job_id)
+    if job['status'] != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    media_type = "text/csv" if job['output_format'] == "csv" else "application/vnd.apache.parquet"
+    return FileResponse(job['result_path'], media_type=media_type, filename=f"{job_id}.{job['output_format']}")
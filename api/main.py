@@ -1,10 +1,10 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 import uvicorn
 from datetime import datetime
+import numpy as np
 import pandas as pd
 import time
 import os
@@ -14,8 +14,23 @@ from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
+from src.config.configuration import ConfigurationManager
 from src.pipeline.prediction_pipeline import PredictionPipeline
-from api.schemas import CustomerFeatures, PredictionResponse, HealthResponse
+from src.pipeline.score_store import ScoreStore
+from src.models.threshold_optimizer import DecisionPolicy
+from api.schemas import (
+    CustomerFeatures, PredictionResponse, HealthResponse,
+    ExplanationResponse, BatchExplanationResponse, CustomerScoreResponse
+)
+from api.columnar import (
+    BatchTooLargeError, ColumnarValidationError, decode_columns, encode_columns, read_body, validate_columns
+)
+from api import admin, analytics, jobs, lifecycle, monitoring
+from api.page_cache import CachedStaticFiles, PageCache, render_page
+from api.warmup import start_warm_up
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.monitoring.profiling import phase
+from src.utils.concurrency import ThreadBudget
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -26,7 +41,8 @@ app = FastAPI(
     description="API for predicting customer churn using machine learning",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    dependencies=[Depends(admin.validation_phase)]
 )
 
 # Add CORS middleware
@@ -38,48 +54,105 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Count in-flight requests so SIGTERM can drain them
+app.add_middleware(lifecycle.InFlightMiddleware)
+# Per-request phase timings; slow requests are kept for /admin/traces
+app.add_middleware(admin.RequestTracingMiddleware)
+
 # Mount static files and templates
-app.mount("/static", StaticFiles(directory="api/static"), name="static")
+app.mount(
+    "/static",
+    CachedStaticFiles(directory="api/static", max_age=ConfigurationManager().get_api_config().static_max_age),
+    name="static"
+)
 templates = Jinja2Templates(directory="api/templates")
 
+# Pages are rendered and compressed once, then served from memory
+pages = PageCache()
+pages.register("/", lambda: render_page(templates, "index.html"))
+pages.register("/api", lambda: get_api_info_page())
+
+app.include_router(analytics.router)
+app.include_router(jobs.router)
+app.include_router(admin.router)
+app.include_router(monitoring.router)
+
 # Global variables
 prediction_pipeline = None
+decision_policy = DecisionPolicy()
+score_store = None
+ready = False
 start_time = time.time()
 
+def mark_ready():
+    global ready
+    ready = True
+
 @app.on_event("startup")
 async def startup_event():
-    """Initialize the prediction pipeline on startup"""
-    global prediction_pipeline
+    """Load the prediction pipeline and warm it up in the background; readiness flips once both succeed"""
+    global prediction_pipeline, decision_policy, score_store
     try:
         logger.info("Starting up the application...")
+        score_store = ScoreStore(ConfigurationManager().get_score_store_config())
+        analytics.get_tracker()
+        admin.start_allocation_tracing()
+        pages.warm()
         
         # Check if model artifacts exist
         model_path = "artifacts/model.pkl"
         preprocessor_path = "artifacts/preprocessor.pkl"
         
         if not (Path(model_path).exists() and Path(preprocessor_path).exists()):
-            logger.warning("Model artifacts not found. Training model...")
-            # Import and run training pipeline
-            from src.pipeline.training_pipeline import TrainingPipeline
-            training_pipeline = TrainingPipeline()
-            training_pipeline.run_training_pipeline()
+            # Training belongs in the training pipeline, never in a serving process
+            logger.error(
+                "Model artifacts not found; run `python -m src.pipeline.training_pipeline`. "
+                "The API stays live but not ready until they exist."
+            )
+            return
         
-        prediction_pipeline = PredictionPipeline()
+        config_manager = ConfigurationManager()
+        api_config = config_manager.get_api_config()
+        concurrency_config = config_manager.get_concurrency_config()
+        serving_workers = concurrency_config.serving_workers
+        budget = ThreadBudget.for_serving(concurrency_config, jobs.worker_threads(serving_workers)).apply()
+        prediction_pipeline = PredictionPipeline(score_table=api_config.score_table, n_jobs=budget.threads)
+        budget.report(prediction_pipeline.model)
+        decision_policy = prediction_pipeline.decision_policy
         logger.info("Prediction pipeline loaded successfully")
+        jobs.start_workers(prediction_pipeline, serving_workers, monitor=monitoring.get_monitor())
+        lifecycle.install_drain_handler(
+            api_config.drain_delay_seconds, api_config.drain_timeout_seconds, on_drain=[jobs.stop_workers]
+        )
+        # Return now so the server starts listening; /readyz turns 200 when warm-up is done
+        start_warm_up(
+            prediction_pipeline, api_config.warmup_batch_sizes, api_config.warmup_rounds, on_ready=mark_ready
+        )
         
     except Exception as e:
         logger.error(f"Failed to initialize prediction pipeline: {str(e)}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the batch scoring workers and flush analytics and logs"""
+    jobs.stop_workers()
+    analytics.save_state()
+    lifecycle.flush_logs()
+
 # FRONTEND ROUTES
 @app.get("/", response_class=HTMLResponse)
 async def dashboard(request: Request):
     """Main dashboard page"""
-    return templates.TemplateResponse("index.html", {"request": request})
+    return pages.response("/", request)
 
 @app.get("/api", response_class=HTMLResponse)
-async def api_info():
+async def api_info(request: Request):
     """API information page"""
-    html_content = """
+    return pages.response("/api", request)
+
+def get_api_info_page():
+    """API information page content"""
+    return """
     <html>
         <head>
             <title>Churn Prediction API</title>
@@ -110,9 +183,24 @@ async def api_info():
         </body>
     </html>
     """
-    return html_content
 
 # API ROUTES (your existing routes)
+@app.get("/livez")
+async def liveness():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "alive"}
+
+@app.get("/readyz")
+async def readiness():
+    """Readiness probe: the model is loaded and warmed up"""
+    if lifecycle.tracker.draining:
+        return JSONResponse(status_code=503, content={"status": "not ready", "reason": "draining",
+                                                      "in_flight": lifecycle.tracker.in_flight})
+    if prediction_pipeline is None or not ready:
+        reason = "model not loaded" if prediction_pipeline is None else "warming up"
+        return JSONResponse(status_code=503, content={"status": "not ready", "reason": reason})
+    return {"status": "ready"}
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
@@ -121,6 +209,10 @@ async def health_check():
         
         if prediction_pipeline is None:
             status = "unhealthy - model not loaded"
+        elif lifecycle.tracker.draining:
+            status = "draining"
+        elif not ready:
+            status = "starting - warming up"
         else:
             status = "healthy"
             
@@ -146,25 +238,26 @@ async def predict_churn(features: CustomerFeatures):
             raise HTTPException(status_code=503, detail="Prediction pipeline not available")
         
         # Convert to dictionary
-        features_dict = features.dict()
+        features_dict = features.dict(exclude={"customer_id"})
         
         # Make prediction
         prediction, probability = prediction_pipeline.predict_single(features_dict)
+        phase("postprocess")
         
-        # Determine risk level
-        if probability < 0.3:
-            risk_level = "Low"
-        elif probability < 0.7:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
+        # Determine risk level from the cutoffs tuned at training time
+        risk_level = decision_policy.risk_level(probability)
+        analytics.get_tracker().record(features_dict, probability, prediction, risk_level)
+        if features.customer_id is not None:
+            monitoring.record_predictions([features.customer_id], [probability], [prediction])
         
         logger.info(f"Prediction made: {prediction}, probability: {probability:.3f}")
         
+        phase("serialization")
         return PredictionResponse(
             churn_prediction=prediction,
             churn_probability=round(probability, 4),
-            risk_level=risk_level
+            risk_level=risk_level,
+            customer_id=None if features.customer_id is None else str(features.customer_id)
         )
         
     except Exception as e:
@@ -184,10 +277,14 @@ async def batch_predict(features_list: list[CustomerFeatures]):
         results = []
         for i, features in enumerate(features_list):
             try:
-                features_dict = features.dict()
+                features_dict = features.dict(exclude={"customer_id"})
                 prediction, probability = prediction_pipeline.predict_single(features_dict)
+                phase("postprocess")
                 
-                risk_level = "Low" if probability < 0.3 else "Medium" if probability < 0.7 else "High"
+                risk_level = decision_policy.risk_level(probability)
+                analytics.get_tracker().record(features_dict, probability, prediction, risk_level)
+                if features.customer_id is not None:
+                    monitoring.record_predictions([features.customer_id], [probability], [prediction])
                 
                 results.append({
                     "index": i,
@@ -203,12 +300,123 @@ async def batch_predict(features_list: list[CustomerFeatures]):
                 })
         
         logger.info(f"Batch prediction completed for {len(features_list)} customers")
+        phase("serialization")
         return {"predictions": results}
         
     except Exception as e:
         logger.error(f"Batch prediction error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
 
+@app.post("/batch_predict/columnar")
+async def batch_predict_columnar(request: Request):
+    """Predict churn for a columnar batch.
+
+    The body is a JSON object with one array per ``CustomerFeatures`` field or
+    an Arrow IPC stream (``Content-Type: application/vnd.apache.arrow.stream``).
+    The response holds one array per output, as Arrow IPC if the ``Accept``
+    header asks for it.
+    """
+    try:
+        if prediction_pipeline is None:
+            raise HTTPException(status_code=503, detail="Prediction pipeline not available")
+        
+        phase("receive")
+        body = await read_body(request)
+        phase("validation")
+        columns = decode_columns(body, request.headers.get("content-type", ""))
+        features_df = validate_columns(columns)
+        
+        predictions, probabilities = prediction_pipeline.predict(features_df)
+        phase("postprocess")
+        risk_levels = decision_policy.risk_levels(probabilities)
+        analytics.get_tracker().record_batch(features_df, probabilities, predictions, risk_levels)
+        customer_ids = columns.get(FEATURE_SCHEMA.id_column)
+        if customer_ids is not None and len(customer_ids) == len(features_df):
+            monitoring.record_predictions(customer_ids, probabilities, predictions)
+        logger.info(f"Columnar batch prediction completed for {len(features_df)} customers")
+        phase("serialization")
+        return encode_columns({
+            "churn_prediction": np.asarray(predictions, dtype=np.int64),
+            "churn_probability": np.round(np.asarray(probabilities, dtype=np.float64), 4),
+            "risk_level": risk_levels,
+        }, request.headers.get("accept", ""))
+        
+    except HTTPException:
+        raise
+    except ColumnarValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+    except BatchTooLargeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid columnar body: {str(e)}")
+    except Exception as e:
+        logger.error(f"Columnar batch prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+
+@app.get("/customers/{customer_id}/score", response_model=CustomerScoreResponse)
+async def customer_score(customer_id: int):
+    """Precomputed score for a customer, served from the score store"""
+    try:
+        if score_store is None:
+            raise HTTPException(status_code=503, detail="Score store not available")
+        
+        score = score_store.get(customer_id)
+        if score is None:
+            raise HTTPException(status_code=404, detail=f"No precomputed score for customer {customer_id}")
+        monitoring.record_predictions([customer_id], [score['churn_probability']], [score['churn_prediction']])
+        
+        return CustomerScoreResponse(
+            customer_id=str(score['customer_id']),
+            churn_prediction=score['churn_prediction'],
+            churn_probability=score['churn_probability'],
+            risk_level=score['risk_level'],
+            model_version=score['model_version'],
+            scored_at=datetime.fromtimestamp(score['scored_at']).isoformat()
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Score lookup error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Score lookup failed: {str(e)}")
+
+@app.post("/explain", response_model=ExplanationResponse)
+async def explain_churn(features: CustomerFeatures):
+    """Explain the churn prediction for a single customer"""
+    return (await batch_explain([features])).explanations[0]
+
+@app.post("/batch_explain", response_model=BatchExplanationResponse)
+async def batch_explain(features_list: list[CustomerFeatures]):
+    """Per-feature contributions for multiple customers, computed in one pass"""
+    try:
+        if prediction_pipeline is None:
+            raise HTTPException(status_code=503, detail="Prediction pipeline not available")
+            
+        if len(features_list) > 1000:
+            raise HTTPException(status_code=400, detail="Batch size too large. Maximum 1000 explanations at once.")
+        
+        phase("dataframe")
+        features_df = FEATURE_SCHEMA.to_frame([features.dict() for features in features_list])
+        phase("explain")
+        explanations = prediction_pipeline.explain(features_df)
+        
+        phase("serialization")
+        return BatchExplanationResponse(explanations=[
+            ExplanationResponse(
+                risk_level=decision_policy.risk_level(explanation['churn_probability']),
+                **explanation
+            )
+            for explanation in explanations
+        ])
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        logger.error(f"Explanation error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Explanation failed: {str(e)}")
+
 @app.get("/model/info")
 async def model_info():
     """Get information about the current model"""
@@ -223,6 +431,7 @@ async def model_info():
             "model_type": model_type,
             "model_version": "1.0.0",
             "features_count": len(prediction_pipeline.preprocessor.transformers),
+            "memory_mb": prediction_pipeline.artifact_memory,
             "last_updated": datetime.now().isoformat()
         }
         
@@ -233,10 +442,19 @@ async def model_info():
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the churn prediction API")
+    parser.add_argument("--reload", action="store_true", help="Restart on code changes (development, one worker)")
+    args = parser.parse_args()
+
+    # Each worker process takes its share of the cores (concurrency.serving_workers)
+    serving_workers = ConfigurationManager().get_concurrency_config().serving_workers
     uvicorn.run(
-        "main:app",
+        "api.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=args.reload,
+        workers=1 if args.reload else serving_workers,
         log_level="info"
     )
\ No newline at end of file
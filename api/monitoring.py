@@ -0,0 +1,70 @@
+"""``/monitoring/*``: live model quality from delayed churn labels.
+
+Served predictions that carry a ``customer_id`` (``/predict``,
+``/batch_predict``, ``/batch_predict/columnar``, ``/customers/{id}/score`` and
+in-process batch jobs) are held by a ``PerformanceMonitor`` until the outcome
+is known. ``POST /monitoring/labels`` joins the labels to them and checks the
+window metric against ``monitoring.performance_threshold``; alerts are logged
+and returned. ``GET /monitoring/performance`` reports the window metrics.
+
+Like analytics, the monitor lives in each uvicorn worker process, so with
+``concurrency.serving_workers > 1`` a label only matches predictions served
+by the worker that receives it.
+"""
+from typing import Iterable, Optional
+
+from fastapi import APIRouter
+
+from api.schemas import LabelBatch
+from src.config.configuration import ConfigurationManager
+from src.monitoring.performance_monitor import PerformanceMonitor
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+router = APIRouter(prefix="/monitoring", tags=["monitoring"])
+
+monitor: Optional[PerformanceMonitor] = None
+
+
+def get_monitor() -> PerformanceMonitor:
+    global monitor
+    if monitor is None:
+        monitor = PerformanceMonitor.from_config(ConfigurationManager().get_monitoring_config())
+    return monitor
+
+
+def record_predictions(customer_ids: Iterable, probabilities: Iterable, predictions: Iterable):
+    """Hold served predictions until their labels arrive; rows without a customer id are skipped"""
+    try:
+        get_monitor().record_predictions(customer_ids, probabilities, predictions)
+    except Exception as e:
+        logger.error(f"Failed to record predictions for monitoring: {str(e)}")
+
+
+@router.post("/labels")
+async def ingest_labels(batch: LabelBatch):
+    """Join observed churn outcomes to served predictions and check the performance threshold"""
+    performance_monitor = get_monitor()
+    matched = performance_monitor.record_labels((label.customer_id, label.churn) for label in batch.labels)
+    alerts = performance_monitor.check_alerts()
+    return {
+        'received': len(batch.labels),
+        'matched': matched,
+        'alerts': alerts,
+        'metrics': performance_monitor.metrics(),
+    }
+
+
+@router.get("/performance")
+async def performance():
+    """Metrics over the window of labelled predictions, the threshold and past alerts"""
+    performance_monitor = get_monitor()
+    return {
+        'metric': performance_monitor.metric,
+        'threshold': performance_monitor.performance_threshold,
+        'window_size': performance_monitor.window_size,
+        'degraded': performance_monitor.degraded,
+        'metrics': performance_monitor.metrics(),
+        'alerts': performance_monitor.recent_alerts(20),
+    }
@@ -0,0 +1,175 @@
+"""Pre-rendered, pre-compressed page bodies and in-memory static assets.
+
+Each page is rendered once (template, or the inline fallback page) and kept
+as identity, gzip and, when the optional ``brotli`` package is installed,
+brotli bodies. Every encoding has its own strong ETag, so a revalidating
+browser gets a bodiless 304. Static assets are loaded the same way when the
+app starts and are served with ``Cache-Control: public, max-age=...``. Serving
+the dashboard therefore costs a dict lookup, not rendering or compression.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+from fastapi import Request
+from fastapi.responses import Response
+from fastapi.staticfiles import StaticFiles
+
+from src.utils.logger import setup_logger
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+logger = setup_logger(__name__)
+
+# Smaller bodies are not worth compressing
+MIN_COMPRESS_BYTES = 512
+# Larger static files are left to StaticFiles, which streams them from disk
+MAX_CACHED_FILE_BYTES = 1 << 20
+# Preference order when the client accepts several encodings
+ENCODINGS = ("br", "gzip", "identity")
+COMPRESSIBLE_TYPES = ("application/javascript", "application/json", "image/svg+xml")
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    """``Accept-Encoding`` as ``{coding: q}``"""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def _etag_matches(header: str, etags) -> bool:
+    """``If-None-Match`` check; weak comparison as the header requires"""
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return not candidates.isdisjoint(etags)
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    media_type: str
+    bodies: Dict[str, bytes]
+    etags: Dict[str, str]
+
+    @classmethod
+    def build(cls, body: bytes, media_type: str) -> "CachedBody":
+        bodies = {"identity": body}
+        compressible = media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+        if compressible and len(body) >= MIN_COMPRESS_BYTES:
+            bodies["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                bodies["br"] = brotli.compress(body, quality=11)
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        etags = {
+            encoding: f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+            for encoding in bodies
+        }
+        return cls(media_type, bodies, etags)
+
+    def _encoding(self, accept_encoding: str) -> str:
+        accepted = _accepted_encodings(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        for encoding in ENCODINGS[:-1]:
+            if encoding in self.bodies and accepted.get(encoding, wildcard) > 0:
+                return encoding
+        return "identity"
+
+    def response(self, request: Request, cache_control: str) -> Response:
+        encoding = self._encoding(request.headers.get("accept-encoding", ""))
+        headers = {"ETag": self.etags[encoding], "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        if _etag_matches(request.headers.get("if-none-match", ""), self.etags.values()):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=self.bodies[encoding], media_type=self.media_type, headers=headers)
+
+
+def render_page(templates, name: str, fallback: Callable[[], str] = None) -> str:
+    """Render a template once (none of them depend on the request), else the inline fallback page"""
+    try:
+        return templates.get_template(name).render(request=None)
+    except Exception:
+        if fallback is None:
+            raise
+        return fallback()
+
+
+class PageCache:
+    """HTML pages rendered and compressed on first use (or by ``warm`` at startup)"""
+
+    def __init__(self, cache_control: str = "no-cache"):
+        # no-cache: browsers revalidate every time and get a 304 while the page is unchanged
+        self.cache_control = cache_control
+        self.renderers: Dict[str, Callable[[], str]] = {}
+        self.pages: Dict[str, CachedBody] = {}
+
+    def register(self, name: str, render: Callable[[], str]):
+        self.renderers[name] = render
+        self.pages.pop(name, None)
+
+    def get(self, name: str) -> CachedBody:
+        page = self.pages.get(name)
+        if page is None:
+            page = self.pages[name] = CachedBody.build(
+                self.renderers[name]().encode("utf-8"), "text/html; charset=utf-8"
+            )
+        return page
+
+    def warm(self):
+        for name in self.renderers:
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.error(f"Failed to render page {name}: {str(e)}")
+
+    def response(self, name: str, request: Request) -> Response:
+        return self.get(name).response(request, self.cache_control)
+
+
+class CachedStaticFiles(StaticFiles):
+    """``StaticFiles`` serving small assets from memory, pre-compressed, with ``Cache-Control``.
+
+    Assets are read when the app is created, so files changed on disk
+    afterwards need a restart. Anything not cached falls through to
+    ``StaticFiles``, which still handles ETag/304 itself.
+    """
+
+    def __init__(self, *, directory: str, max_age: int = 3600, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.cache_control = f"public, max-age={max_age}"
+        self.files: Dict[str, CachedBody] = {}
+        for root, _, names in os.walk(directory):
+            for name in names:
+                path = os.path.join(root, name)
+                if os.path.getsize(path) > MAX_CACHED_FILE_BYTES:
+                    continue
+                media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                with open(path, "rb") as f:
+                    self.files[os.path.relpath(path, directory)] = CachedBody.build(f.read(), media_type)
+
+    async def get_response(self, path: str, scope) -> Response:
+        cached = self.files.get(path)
+        if cached is not None and scope["method"] in ("GET", "HEAD"):
+            return cached.response(Request(scope), self.cache_control)
+        response = await super().get_response(path, scope)
+        response.headers.setdefault("Cache-Control", self.cache_control)
+        return response
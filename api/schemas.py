@@ -1,5 +1,9 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional, Union
+from src.data.feature_schema import FEATURE_SCHEMA
+
+def _choices(name: str) -> str:
+    return ", ".join(FEATURE_SCHEMA.vocabulary(name))
 
 class CustomerFeatures(BaseModel):
     age: float = Field(..., ge=18, le=100, description="Customer age")
@@ -7,10 +11,13 @@ class CustomerFeatures(BaseModel):
     monthly_charges: float = Field(..., ge=0, description="Monthly charges")
     total_charges: float = Field(..., ge=0, description="Total charges")
     contract_length: int = Field(..., ge=1, le=24, description="Contract length in months")
-    payment_method: str = Field(..., description="Payment method")
-    internet_service: str = Field(..., description="Internet service type")
-    online_security: str = Field(..., description="Online security service")
-    tech_support: str = Field(..., description="Tech support service")
+    payment_method: str = Field(..., description=f"Payment method ({_choices('payment_method')})")
+    internet_service: str = Field(..., description=f"Internet service type ({_choices('internet_service')})")
+    online_security: str = Field(..., description=f"Online security service ({_choices('online_security')})")
+    tech_support: str = Field(..., description=f"Tech support service ({_choices('tech_support')})")
+    customer_id: Optional[Union[int, str]] = Field(
+        None, description="Optional customer id; lets churn labels posted to /monitoring/labels be joined"
+    )
 
     class Config:
         schema_extra = {
@@ -33,6 +40,44 @@ class PredictionResponse(BaseModel):
     churn_probability: float = Field(..., ge=0, le=1, description="Probability of churn")
     risk_level: str = Field(..., description="Risk level: Low, Medium, High")
 
+class CustomerScoreResponse(PredictionResponse):
+    model_version: str = Field(..., description="Fingerprint of the model artifact that produced the score")
+    scored_at: str = Field(..., description="When the score was computed (ISO 8601)")
+
+class ExplanationResponse(BaseModel):
+    churn_probability: float = Field(..., ge=0, le=1, description="Probability of churn")
+    risk_level: str = Field(..., description="Risk level: Low, Medium, High")
+    base_value: float = Field(..., description="Model output before any feature is taken into account")
+    contributions: Dict[str, float] = Field(..., description="Contribution of each field, largest magnitude first")
+    units: str = Field(..., description="probability (random forest) or log_odds (logistic regression)")
+
+class BatchExplanationResponse(BaseModel):
+    explanations: List[ExplanationResponse]
+
+class ChurnLabel(BaseModel):
+    customer_id: Union[int, str] = Field(..., description="Customer id the prediction was served for")
+    churn: int = Field(..., ge=0, le=1, description="Observed outcome: 1 if the customer churned")
+
+class LabelBatch(BaseModel):
+    labels: List[ChurnLabel]
+
+class JobRequest(BaseModel):
+    input_path: str = Field(..., description="CSV/Parquet file or directory of shards on the server")
+    output_format: Optional[str] = Field(None, description="parquet or csv (defaults to jobs.output_format)")
+
+class JobResponse(BaseModel):
+    id: str
+    status: str = Field(..., description="queued, running, completed or failed")
+    input_path: str
+    output_format: str
+    total_rows: Optional[int] = None
+    rows_done: int
+    chunks_done: int
+    progress: float = Field(..., ge=0, le=1, description="Fraction of rows scored")
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+
 class HealthResponse(BaseModel):
     status: str
     timestamp: str
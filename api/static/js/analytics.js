@@ -0,0 +1,103 @@
+// Analytics dashboard: renders the /analytics/* aggregates
+
+const VOLUME_BUCKETS = 24;
+
+function formatPercent(value) {
+    return (value * 100).toFixed(1) + '%';
+}
+
+function bar(share) {
+    return `<div class="bar"><div class="bar-fill" style="width: ${(share * 100).toFixed(1)}%"></div></div>`;
+}
+
+async function fetchJson(path) {
+    const response = await fetch(path);
+    if (!response.ok) {
+        throw new Error(`${path}: HTTP ${response.status}`);
+    }
+    return response.json();
+}
+
+function renderSummary(summary) {
+    document.getElementById('total-predictions').textContent = summary.total_predictions.toLocaleString();
+    document.getElementById('high-risk').textContent = summary.high_risk_predictions.toLocaleString();
+    document.getElementById('churn-rate').textContent = formatPercent(summary.predicted_churn_rate);
+    document.getElementById('mean-probability').textContent = summary.mean_churn_probability.toFixed(3);
+}
+
+function renderRiskDistribution(distribution) {
+    document.getElementById('risk-distribution').innerHTML = Object.entries(distribution).map(([level, entry]) => `
+        <div class="metric-card">
+            <div class="metric-number">${entry.count.toLocaleString()}</div>
+            <div class="metric-label">${level} risk (${formatPercent(entry.share)})</div>
+        </div>`).join('');
+}
+
+function renderVolume(volume) {
+    const peak = Math.max(1, ...volume.buckets.map(bucket => bucket.predictions));
+    const rows = volume.buckets.map(bucket => `
+        <tr>
+            <td>${new Date(bucket.bucket_start * 1000).toLocaleString()}</td>
+            <td>${bucket.predictions.toLocaleString()}</td>
+            <td>${bucket.predicted_churners.toLocaleString()}</td>
+            <td>${bar(bucket.predictions / peak)}</td>
+        </tr>`).join('');
+    document.getElementById('volume').innerHTML = `
+        <table class="data-table">
+            <tr><th>Period start</th><th>Predictions</th><th>Predicted churners</th><th></th></tr>
+            ${rows}
+        </table>`;
+}
+
+function renderSegments(segments) {
+    document.getElementById('segments').innerHTML = Object.entries(segments).map(([feature, values]) => `
+        <h3>${feature.replace(/_/g, ' ')}</h3>
+        <table class="data-table">
+            <tr><th>Value</th><th>Predictions</th><th>Predicted churn rate</th><th>Mean probability</th><th></th></tr>
+            ${Object.entries(values).map(([value, entry]) => `
+                <tr>
+                    <td>${value}</td>
+                    <td>${entry.count.toLocaleString()}</td>
+                    <td>${formatPercent(entry.predicted_churn_rate)}</td>
+                    <td>${entry.mean_churn_probability.toFixed(3)}</td>
+                    <td>${bar(entry.predicted_churn_rate)}</td>
+                </tr>`).join('')}
+        </table>`).join('');
+}
+
+function renderHistogram(histogram) {
+    const peak = Math.max(1, ...histogram.counts);
+    const rows = histogram.counts.map((count, i) => `
+        <tr>
+            <td>${histogram.bin_edges[i].toFixed(2)} - ${histogram.bin_edges[i + 1].toFixed(2)}</td>
+            <td>${count.toLocaleString()}</td>
+            <td>${bar(count / peak)}</td>
+        </tr>`).join('');
+    document.getElementById('probability-histogram').innerHTML = `
+        <table class="data-table">
+            <tr><th>Churn probability</th><th>Predictions</th><th></th></tr>
+            ${rows}
+        </table>`;
+}
+
+async function loadAnalytics() {
+    try {
+        const [summary, distribution, volume, segments, histogram] = await Promise.all([
+            fetchJson('/analytics/summary'),
+            fetchJson('/analytics/risk_distribution'),
+            fetchJson(`/analytics/volume?buckets=${VOLUME_BUCKETS}`),
+            fetchJson('/analytics/segments'),
+            fetchJson('/analytics/probability_histogram'),
+        ]);
+        renderSummary(summary);
+        renderRiskDistribution(distribution);
+        renderVolume(volume);
+        renderSegments(segments);
+        renderHistogram(histogram);
+        document.getElementById('last-updated').textContent = new Date().toLocaleString();
+    } catch (error) {
+        console.error('Error loading analytics:', error);
+    }
+}
+
+window.addEventListener('load', loadAnalytics);
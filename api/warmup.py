@@ -0,0 +1,86 @@
+"""Startup warm-up: score synthetic customers before the API reports ready.
+
+The first predictions after a model loads pay for lazy initialization in
+NumPy/scikit-learn, allocator growth and cold caches. Running them here, at
+each configured batch size and through the single-row and explanation paths,
+keeps that cost out of the first real requests. Synthetic rows respect the
+``CustomerFeatures`` bounds and the schema's declared values.
+
+``start_warm_up`` runs it on a background thread. Uvicorn only opens its
+socket once the startup hooks return, so warming up inside them would keep
+``/livez`` from answering and ``/readyz`` from ever reporting "warming up".
+"""
+import threading
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from api.columnar import CONSTRAINTS
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Width of the sampled range for fields with only a lower bound
+UNBOUNDED_SPAN = 100.0
+
+
+def synthetic_features(n: int, seed: int = 0) -> pd.DataFrame:
+    """``n`` valid, varied feature rows"""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for spec in FEATURE_SCHEMA.features:
+        if spec.categories:
+            columns[spec.name] = rng.choice(np.array(spec.categories, dtype=object), size=n)
+        else:
+            bounds = CONSTRAINTS.get(spec.name, {})
+            low = bounds.get("ge", bounds.get("gt", 0.0))
+            high = bounds.get("le", bounds.get("lt", low + UNBOUNDED_SPAN))
+            columns[spec.name] = rng.uniform(low, high, size=n)
+    return FEATURE_SCHEMA.from_columns(columns)
+
+
+def warm_up(prediction_pipeline, batch_sizes: List[int], rounds: int = 2) -> Dict[str, float]:
+    """Run every serving path ``rounds`` times; returns the last round's milliseconds per path"""
+    if not batch_sizes or rounds < 1:
+        return {}
+    features = synthetic_features(max(batch_sizes))
+    records = features.head(max(rounds, 1)).to_dict(orient="records")
+    timings = {}
+    for round_index in range(rounds):
+        for batch_size in batch_sizes:
+            start = time.perf_counter()
+            prediction_pipeline.predict(features.head(batch_size))
+            timings[f"predict_{batch_size}"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        prediction_pipeline.predict_single(records[round_index % len(records)])
+        timings["predict_single"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        try:
+            prediction_pipeline.explain(features.head(min(batch_sizes)))
+            timings["explain"] = (time.perf_counter() - start) * 1000
+        except ValueError:
+            # Model type without explanations
+            pass
+    logger.info("Warm-up complete: " + ", ".join(f"{name} {ms:.1f} ms" for name, ms in timings.items()))
+    return timings
+
+
+def start_warm_up(prediction_pipeline, batch_sizes: List[int], rounds: int,
+                  on_ready: Callable[[], None]) -> threading.Thread:
+    """Warm up on a daemon thread and call ``on_ready`` once it succeeds; a failure leaves the API unready"""
+    def run():
+        try:
+            warm_up(prediction_pipeline, batch_sizes, rounds)
+        except Exception as e:
+            logger.error(f"Warm-up failed; the API stays not ready: {str(e)}")
+            return
+        on_ready()
+
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread
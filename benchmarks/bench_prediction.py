@@ -0,0 +1,65 @@
+import pytest
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.models.score_table import ScoreTable
+from src.pipeline.prediction_pipeline import PredictionPipeline
+from benchmarks.utils import (
+    API_BATCH_SIZES, BATCH_SIZES, make_frame, feature_columns, feature_records, record_memory
+)
+
+
+class BenchPredictionPipeline:
+
+    def bench_predict_single(self, benchmark, prediction_pipeline, sample_features):
+        prediction, probability = benchmark(prediction_pipeline.predict_single, sample_features)
+        assert 0 <= probability <= 1
+
+    @pytest.mark.parametrize("batch_size", BATCH_SIZES)
+    def bench_predict(self, benchmark, prediction_pipeline, batch_size):
+        features = FEATURE_SCHEMA.select(make_frame(batch_size))
+        record_memory(benchmark, prediction_pipeline.predict, features)
+        predictions, probabilities = benchmark(prediction_pipeline.predict, features)
+        assert len(probabilities) == batch_size
+
+    def bench_load_artifacts(self, benchmark, artifacts):
+        """Load time, with the in-memory size of the loaded model and preprocessor"""
+        model_path, preprocessor_path = artifacts
+        pipeline = benchmark.pedantic(
+            PredictionPipeline, kwargs={"model_path": model_path, "preprocessor_path": preprocessor_path}, rounds=3
+        )
+        benchmark.extra_info.update(pipeline.artifact_memory)
+        assert pipeline.artifact_memory['model_mb'] > 0
+
+
+class BenchScoreTable:
+    """Single-row scoring with precomputed discrete combinations, against bench_predict_single"""
+
+    def bench_predict_single_score_table(self, benchmark, score_table_pipeline, sample_features):
+        prediction, probability = benchmark(score_table_pipeline.predict_single, sample_features)
+        assert 0 <= probability <= 1
+
+    def bench_build_score_table(self, benchmark, prediction_pipeline):
+        table = benchmark.pedantic(
+            ScoreTable.build, args=(prediction_pipeline.model, prediction_pipeline.preprocessor), rounds=3
+        )
+        assert table is not None
+
+
+class BenchAPI:
+
+    def bench_predict_endpoint(self, benchmark, api_client, sample_features):
+        response = benchmark(api_client.post, "/predict", json=sample_features)
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize("batch_size", API_BATCH_SIZES)
+    def bench_batch_predict_endpoint(self, benchmark, api_client, batch_size):
+        payload = feature_records(make_frame(batch_size))
+        record_memory(benchmark, api_client.post, "/batch_predict", json=payload)
+        response = benchmark(api_client.post, "/batch_predict", json=payload)
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize("batch_size", API_BATCH_SIZES)
+    def bench_batch_predict_columnar_endpoint(self, benchmark, api_client, batch_size):
+        payload = feature_columns(make_frame(batch_size))
+        record_memory(benchmark, api_client.post, "/batch_predict/columnar", json=payload)
+        response = benchmark(api_client.post, "/batch_predict/columnar", json=payload)
+        assert response.status_code == 200
@@ -0,0 +1,48 @@
+import pytest
+from src.data.data_transformation import DataTransformation
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.models.model_trainer import ModelTrainer
+from src.monitoring.data_drift import DataDriftDetector
+from benchmarks.utils import DATA_ROWS, make_frame, record_memory
+
+
+class BenchDataTransformation:
+
+    @pytest.mark.parametrize("n_rows", DATA_ROWS)
+    def bench_initiate_data_transformation(self, benchmark, tmp_path, monkeypatch, n_rows):
+        df = make_frame(n_rows)
+        split = int(n_rows * 0.8)
+        train_path, test_path = tmp_path / "train.csv", tmp_path / "test.csv"
+        df.iloc[:split].to_csv(train_path, index=False)
+        df.iloc[split:].to_csv(test_path, index=False)
+        monkeypatch.chdir(tmp_path)
+
+        record_memory(benchmark, DataTransformation().initiate_data_transformation, str(train_path), str(test_path))
+        result = benchmark(
+            DataTransformation().initiate_data_transformation, str(train_path), str(test_path)
+        )
+        assert result[0].shape[0] == split
+
+
+class BenchDataDrift:
+
+    @pytest.mark.parametrize("n_rows", DATA_ROWS)
+    def bench_detect_drift(self, benchmark, n_rows):
+        reference = make_frame(n_rows, random_state=1)
+        current = make_frame(n_rows, random_state=2)
+        detector = DataDriftDetector(reference)
+
+        report = benchmark(detector.detect_drift, current)
+        assert set(report) == set(FEATURE_SCHEMA.feature_names)
+
+
+class BenchModelTrainer:
+
+    @pytest.mark.parametrize("model_name", ["RandomForestClassifier", "LogisticRegression", "SVC"])
+    def bench_fit_candidate(self, benchmark, model_config, training_data, model_name):
+        _, X, y = training_data
+        model = ModelTrainer(config=model_config).models[model_name]
+
+        record_memory(benchmark, model.fit, X, y)
+        benchmark.pedantic(model.fit, args=(X, y), rounds=3, iterations=1)
+        assert hasattr(model, "classes_")
@@ -0,0 +1,98 @@
+import pytest
+import joblib
+from sklearn.ensemble import RandomForestClassifier
+from fastapi.testclient import TestClient
+from src.config.configuration import ConfigurationManager
+from src.data.data_transformation import DataTransformation
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.pipeline.prediction_pipeline import PredictionPipeline
+from benchmarks.utils import TRAIN_ROWS, make_frame, feature_records
+
+# Traced peak growth over the compared run that is flagged in the memory summary
+MEMORY_REGRESSION = 0.2
+
+
+def pytest_sessionstart(session):
+    """The first run on a machine only saves a baseline; later runs fail on regressions"""
+    benchmark_session = getattr(session.config, "_benchmarksession", None)
+    if benchmark_session is not None and not benchmark_session.compared_mapping:
+        benchmark_session.compare_fail = None
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Traced peak memory of each benchmark that recorded it, against the compared run"""
+    benchmark_session = getattr(config, "_benchmarksession", None)
+    if benchmark_session is None:
+        return
+    baseline = {}
+    for compared in (benchmark_session.compared_mapping or {}).values():
+        baseline.update(compared)
+    lines = []
+    for bench in benchmark_session.benchmarks:
+        peak = bench.extra_info.get("memory_traced_peak_mb")
+        if peak is None:
+            continue
+        previous = baseline.get(bench.fullname, {}).get("extra_info", {}).get("memory_traced_peak_mb")
+        line = f"{bench.name:<60} {peak:>10.3f} MB"
+        if previous is not None:
+            line += f"  (was {previous:.3f} MB)"
+            if peak > previous * (1 + MEMORY_REGRESSION) and peak - previous > 0.1:
+                line += "  REGRESSION"
+        lines.append(line)
+    if lines:
+        terminalreporter.section("traced peak memory")
+        for line in lines:
+            terminalreporter.write_line(line)
+
+
+@pytest.fixture(scope="session")
+def model_config():
+    return ConfigurationManager().get_model_training_config()
+
+
+@pytest.fixture(scope="session")
+def sample_features():
+    return feature_records(make_frame(1))[0]
+
+
+@pytest.fixture(scope="session")
+def training_data():
+    """Transformed training matrix and target"""
+    df = make_frame(TRAIN_ROWS)
+    preprocessor = DataTransformation().get_data_transformer()
+    X = preprocessor.fit_transform(FEATURE_SCHEMA.select(df))
+    return preprocessor, X, df[FEATURE_SCHEMA.target_column]
+
+
+@pytest.fixture(scope="session")
+def artifacts(tmp_path_factory, training_data, model_config):
+    """Model and preprocessor artifacts trained on benchmark data"""
+    preprocessor, X, y = training_data
+    model = RandomForestClassifier(**model_config.hyperparameters).fit(X, y)
+    artifact_dir = tmp_path_factory.mktemp("artifacts")
+    model_path = artifact_dir / "model.pkl"
+    preprocessor_path = artifact_dir / "preprocessor.pkl"
+    joblib.dump(model, model_path)
+    joblib.dump(preprocessor, preprocessor_path)
+    return str(model_path), str(preprocessor_path)
+
+
+@pytest.fixture(scope="session")
+def prediction_pipeline(artifacts):
+    model_path, preprocessor_path = artifacts
+    return PredictionPipeline(model_path=model_path, preprocessor_path=preprocessor_path)
+
+
+@pytest.fixture(scope="session")
+def score_table_pipeline(artifacts):
+    model_path, preprocessor_path = artifacts
+    return PredictionPipeline(model_path=model_path, preprocessor_path=preprocessor_path, score_table=True)
+
+
+@pytest.fixture
+def api_client(monkeypatch, prediction_pipeline):
+    """Test client with the benchmark pipeline installed"""
+    import api.main
+
+    monkeypatch.setattr(api.main, "prediction_pipeline", prediction_pipeline)
+    return TestClient(api.main.app)
@@ -0,0 +1,231 @@
+"""Load generator for the churn prediction API.
+
+Replays recorded request logs, rows of a CSV such as ``testing.csv``, or
+synthesized ``CustomerFeatures`` payloads against a running server at a target
+request rate (open loop) or a fixed concurrency (closed loop), mixing
+``/predict`` and ``/batch_predict`` calls, and reports throughput, latency
+percentiles and error rates as JSON.
+
+Recorded logs are JSON lines. A line with an ``endpoint`` key is replayed as-is
+(``{"endpoint": "/predict", "payload": {...}}``); any other line is taken as a
+feature record and fed into the configured mix.
+
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --rps 200 --duration 30
+    python -m benchmarks.load_test --concurrency 32 --source testing.csv --batch-ratio 0.1
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data.feature_schema import FEATURE_SCHEMA
+
+PERCENTILES = {'p50': 50, 'p95': 95, 'p99': 99, 'p999': 99.9}
+
+
+def synthesize_payloads(n: int, random_state: int = 42) -> List[Dict]:
+    """Random ``CustomerFeatures`` payloads within the API field bounds"""
+    rng = np.random.default_rng(random_state)
+    columns = {
+        'age': np.clip(rng.normal(40, 15, n), 18, 100),
+        'tenure': rng.exponential(2, n),
+        'monthly_charges': np.clip(rng.normal(65, 20, n), 0, None),
+        'total_charges': np.clip(rng.normal(1500, 800, n), 0, None),
+        'contract_length': rng.choice([1, 12, 24], n),
+    }
+    for col in FEATURE_SCHEMA.categorical_features:
+        columns[col] = rng.choice(FEATURE_SCHEMA.vocabulary(col), n)
+    return FEATURE_SCHEMA.from_columns(columns).to_dict(orient="records")
+
+
+def load_requests(path: str) -> List[Dict]:
+    """Recorded requests from a JSON-lines log or feature records from a CSV"""
+    if path.endswith(".csv"):
+        df = pd.read_csv(path, dtype=FEATURE_SCHEMA.dtypes())
+        return df[FEATURE_SCHEMA.feature_names].to_dict(orient="records")
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class RequestMix:
+    """Cycles over payloads, emitting ``(endpoint, body)`` pairs"""
+
+    def __init__(self, records: List[Dict], batch_ratio: float = 0.0, batch_size: int = 100,
+                 random_state: int = 42):
+        self.records = itertools.cycle(records)
+        self.batch_ratio = batch_ratio
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(random_state)
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self):
+        record = next(self.records)
+        if 'endpoint' in record:
+            return record['endpoint'], record['payload']
+        if self.batch_ratio and self.rng.random() < self.batch_ratio:
+            batch = [record] + [self._features(next(self.records)) for _ in range(self.batch_size - 1)]
+            return "/batch_predict", batch
+        return "/predict", record
+
+    def _features(self, record: Dict) -> Dict:
+        return record['payload'] if 'endpoint' in record else record
+
+
+class LoadTestStats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.status_codes = defaultdict(lambda: defaultdict(int))
+        self.errors = defaultdict(int)
+        self.rows = defaultdict(int)
+        self.dropped = 0
+
+    def record(self, endpoint: str, latency: float, status_code: Optional[int], rows: int):
+        self.latencies[endpoint].append(latency)
+        self.status_codes[endpoint][str(status_code) if status_code else "exception"] += 1
+        if status_code is None or status_code >= 400:
+            self.errors[endpoint] += 1
+        else:
+            self.rows[endpoint] += rows
+
+    def _summary(self, latencies: List[float], errors: int, rows: int, elapsed: float) -> Dict:
+        latencies_ms = np.asarray(latencies) * 1000
+        summary = {
+            'requests': len(latencies),
+            'errors': errors,
+            'error_rate': errors / len(latencies) if latencies else 0.0,
+            'throughput_rps': len(latencies) / elapsed if elapsed else 0.0,
+            'rows_per_second': rows / elapsed if elapsed else 0.0,
+        }
+        if len(latencies_ms):
+            summary['latency_ms'] = {
+                name: float(np.percentile(latencies_ms, q)) for name, q in PERCENTILES.items()
+            }
+            summary['latency_ms']['mean'] = float(latencies_ms.mean())
+            summary['latency_ms']['max'] = float(latencies_ms.max())
+        return summary
+
+    def report(self, elapsed: float) -> Dict:
+        endpoints = {
+            endpoint: {
+                **self._summary(latencies, self.errors[endpoint], self.rows[endpoint], elapsed),
+                'status_codes': dict(self.status_codes[endpoint])
+            }
+            for endpoint, latencies in self.latencies.items()
+        }
+        all_latencies = [latency for values in self.latencies.values() for latency in values]
+        return {
+            'duration_seconds': elapsed,
+            'dropped': self.dropped,
+            'overall': self._summary(all_latencies, sum(self.errors.values()),
+                                     sum(self.rows.values()), elapsed),
+            'endpoints': endpoints
+        }
+
+
+async def _send(client: httpx.AsyncClient, endpoint: str, body, stats: LoadTestStats,
+                start: float = None):
+    start = start or time.perf_counter()
+    status_code = None
+    try:
+        response = await client.post(endpoint, json=body)
+        status_code = response.status_code
+    except httpx.HTTPError:
+        pass
+    rows = len(body) if isinstance(body, list) else 1
+    stats.record(endpoint, time.perf_counter() - start, status_code, rows)
+
+
+async def run_load_test(url: str, mix: RequestMix, duration: float = 10.0,
+                        rps: Optional[float] = None, concurrency: int = 10,
+                        timeout: float = 30.0, transport: httpx.AsyncBaseTransport = None) -> Dict:
+    """Drive load for ``duration`` seconds and return the JSON report.
+
+    With ``rps`` requests are issued on a fixed schedule regardless of response
+    times (open loop), with at most ``concurrency`` in flight. Latency is measured
+    from the scheduled send time, so client-side queueing behind a slow server
+    is included; requests still queued at the deadline are counted as dropped.
+    Without it, ``concurrency`` workers each send their next request as soon as
+    the previous one completes (closed loop).
+    """
+    stats = LoadTestStats()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits,
+                                 transport=transport) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+
+        if rps:
+            in_flight = asyncio.Semaphore(concurrency)
+            tasks = set()
+
+            async def scheduled(endpoint, body, scheduled_at):
+                async with in_flight:
+                    if time.perf_counter() >= deadline:
+                        stats.dropped += 1
+                        return
+                    await _send(client, endpoint, body, stats, start=scheduled_at)
+
+            next_time = start
+            while next_time < deadline:
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                endpoint, body = next(mix)
+                task = asyncio.create_task(scheduled(endpoint, body, next_time))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                next_time += 1.0 / rps
+            if tasks:
+                await asyncio.gather(*tasks)
+        else:
+            async def worker():
+                while time.perf_counter() < deadline:
+                    endpoint, body = next(mix)
+                    await _send(client, endpoint, body, stats)
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+        elapsed = time.perf_counter() - start
+    return stats.report(elapsed)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Load test the churn prediction API")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--source", help="JSON-lines request log or CSV of features; synthesized if omitted")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--rps", type=float, help="Target request rate (open loop)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Workers, or max in flight with --rps")
+    parser.add_argument("--batch-ratio", type=float, default=0.0, help="Fraction of calls to /batch_predict")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    records = load_requests(args.source) if args.source else synthesize_payloads(10000)
+    mix = RequestMix(records, batch_ratio=args.batch_ratio, batch_size=args.batch_size)
+    report = asyncio.run(run_load_test(
+        args.url, mix, duration=args.duration, rps=args.rps, concurrency=args.concurrency
+    ))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import os
+import pandas as pd
+from src.config.configuration import DataIngestionConfig
+from src.data.data_ingestion import DataIngestion
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.utils.memory import track_memory
+
+
+def _row_counts(name: str, default: str) -> list:
+    return [int(n) for n in os.environ.get(name, default).split(",") if n.strip()]
+
+
+# Row counts are configurable through environment variables so CI can run a
+# small matrix and capacity planning can run a large one.
+DATA_ROWS = _row_counts("BENCH_ROWS", "1000,10000,100000")
+TRAIN_ROWS = _row_counts("BENCH_TRAIN_ROWS", "2000")[0]
+BATCH_SIZES = _row_counts("BENCH_BATCH_SIZES", "1,10,100,1000,10000")
+API_BATCH_SIZES = [n for n in BATCH_SIZES if n <= 1000]
+
+
+def make_frame(n_rows: int, random_state: int = 42) -> pd.DataFrame:
+    """Sample customer data scaled to ``n_rows``"""
+    config = DataIngestionConfig(
+        raw_data_path="", processed_data_path="", test_size=0.2, random_state=random_state
+    )
+    return DataIngestion(config).generate_sample_data(n_samples=n_rows)
+
+
+def _clipped_features(df: pd.DataFrame) -> pd.DataFrame:
+    features = df[FEATURE_SCHEMA.feature_names].copy()
+    features['age'] = features['age'].clip(18, 100)
+    for col in ['tenure', 'monthly_charges', 'total_charges']:
+        features[col] = features[col].clip(lower=0)
+    return features
+
+
+def record_memory(benchmark, fn, *args, **kwargs):
+    """Run ``fn`` once with allocation tracing and save its memory in the benchmark's ``extra_info``"""
+    with track_memory() as memory:
+        result = fn(*args, **kwargs)
+    benchmark.extra_info.update({f"memory_{key}": value for key, value in memory.items()})
+    return result
+
+
+def feature_records(df: pd.DataFrame) -> list:
+    """Feature dicts clipped to the ``CustomerFeatures`` field bounds"""
+    return _clipped_features(df).to_dict(orient="records")
+
+
+def feature_columns(df: pd.DataFrame) -> dict:
+    """One list per feature, clipped to the ``CustomerFeatures`` field bounds"""
+    return _clipped_features(df).to_dict(orient="list")
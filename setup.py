@@ -33,6 +33,7 @@ setup(
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
+            "pytest-benchmark>=4.0.0",
             "black>=23.0.0",
             "flake8>=6.0.0",
             "pre-commit>=3.0.0",
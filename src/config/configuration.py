@@ -1,8 +1,8 @@
 import os
 import yaml
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Dict, Any
+from dataclasses import dataclass, field
+from typing import Dict, Any, List
 
 @dataclass
 class DataIngestionConfig:
@@ -10,22 +10,106 @@ class DataIngestionConfig:
     processed_data_path: str
     test_size: float
     random_state: int
+    n_samples: int = 10000
+    sharded: bool = False
+    n_jobs: int = 1
+    chunk_bytes: int = 268435456
+
+@dataclass
+class DataSamplingConfig:
+    strategy: str = "none"
+    fraction: float = 1.0
+    reservoir_size: int = 100000
+    negative_fraction: float = 1.0
+    chunk_size: int = 1000000
+    random_state: int = 42
 
 @dataclass
 class ModelTrainingConfig:
     model_name: str
     hyperparameters: Dict[str, Any]
     target_column: str
+    log_top_k: int = 1
+    selection_metric: str = "roc_auc"
+    cv_folds: int = 0
+    cv_n_jobs: int = -1
+
+@dataclass
+class TrainingConfig:
+    experiment_name: str = "churn_prediction"
+    registered_model_name: str = "churn_model"
+
+@dataclass
+class DecisionConfig:
+    churn_cost: float = 500.0
+    action_cost: float = 50.0
+    action_success_rate: float = 0.3
+    medium_risk_action_cost: float = 10.0
+    medium_risk_action_success_rate: float = 0.1
+    high_risk_action_cost: float = 100.0
+    high_risk_action_success_rate: float = 0.5
 
 @dataclass
 class ApiConfig:
     host: str
     port: int
+    score_table: bool = False
+    static_max_age: int = 3600
+    warmup_batch_sizes: List[int] = field(default_factory=lambda: [1, 10, 100, 1000])
+    warmup_rounds: int = 2
+    drain_delay_seconds: float = 5.0
+    drain_timeout_seconds: float = 30.0
+
+@dataclass
+class ConcurrencyConfig:
+    cpus: int = 0
+    serving_workers: int = 1
+    serving_threads: int = 1
+    scoring_threads: int = 0
+    training_threads: int = 0
+
+@dataclass
+class JobsConfig:
+    jobs_dir: str = "data/jobs"
+    chunk_size: int = 50000
+    n_workers: int = 1
+    output_format: str = "parquet"
+    poll_interval: float = 1.0
+    heartbeat_timeout: float = 120.0
+    allowed_input_dirs: List[str] = field(default_factory=lambda: ["data"])
+    max_upload_bytes: int = 1073741824
+
+@dataclass
+class ScoreStoreConfig:
+    db_path: str = "data/score_store/scores.db"
+    input_path: str = "data/raw/customer_data.csv"
+    chunk_size: int = 100000
+
+@dataclass
+class AnalyticsConfig:
+    bucket_seconds: int = 3600
+    n_buckets: int = 168
+    n_bins: int = 20
+    state_path: str = "data/analytics/state.npz"
 
 @dataclass
 class MonitoringConfig:
     drift_threshold: float
     performance_threshold: float
+    performance_window: int = 1000
+    performance_metric: str = "accuracy"
+
+@dataclass
+class ProfilingConfig:
+    enabled: bool = False
+    max_seconds: float = 60.0
+    sample_interval_ms: float = 5.0
+    slow_request_ms: float = 250.0
+    trace_capacity: int = 200
+    trace_sample_rate: float = 0.0
+    trace_allocations: bool = False
+    stage_tracemalloc: bool = True
+    top_allocators: int = 10
 
 class ConfigurationManager:
     def __init__(self, config_filepath: str = "config/config.yaml"):
@@ -41,14 +125,46 @@ class ConfigurationManager:
         config = self.config["data"]
         return DataIngestionConfig(**config)
     
+    def get_data_sampling_config(self) -> DataSamplingConfig:
+        config = self.config.get("sampling", {})
+        return DataSamplingConfig(**config)
+    
     def get_model_training_config(self) -> ModelTrainingConfig:
         config = self.config["model"]
         return ModelTrainingConfig(**config)
     
+    def get_training_config(self) -> TrainingConfig:
+        config = self.config.get("training", {})
+        return TrainingConfig(**config)
+    
+    def get_decision_config(self) -> DecisionConfig:
+        config = self.config.get("decision", {})
+        return DecisionConfig(**config)
+    
     def get_api_config(self) -> ApiConfig:
         config = self.config["api"]
         return ApiConfig(**config)
     
+    def get_concurrency_config(self) -> ConcurrencyConfig:
+        config = self.config.get("concurrency", {})
+        return ConcurrencyConfig(**config)
+    
+    def get_jobs_config(self) -> JobsConfig:
+        config = self.config.get("jobs", {})
+        return JobsConfig(**config)
+    
+    def get_score_store_config(self) -> ScoreStoreConfig:
+        config = self.config.get("score_store", {})
+        return ScoreStoreConfig(**config)
+    
+    def get_analytics_config(self) -> AnalyticsConfig:
+        config = self.config.get("analytics", {})
+        return AnalyticsConfig(**config)
+    
     def get_monitoring_config(self) -> MonitoringConfig:
         config = self.config["monitoring"]
         return MonitoringConfig(**config)
+    
+    def get_profiling_config(self) -> ProfilingConfig:
+        config = self.config.get("profiling", {})
+        return ProfilingConfig(**config)
@@ -3,45 +3,158 @@ import numpy as np
 from sklearn.model_selection import train_test_split
 from src.utils.logger import setup_logger
 from src.config.configuration import DataIngestionConfig
+from src.utils.common import list_data_files
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import io
+import os
 
 logger = setup_logger(__name__)
 
+# Rows generated per seed; output is identical for any chunking of the dataset
+SAMPLE_BLOCK_SIZE = 100_000
+
+# Randomly drawn columns; each has its own stream within a block
+RANDOM_COLUMNS = ('age', 'tenure', 'monthly_charges', 'total_charges', 'contract_length', 'payment_method',
+                  'internet_service', 'online_security', 'tech_support', 'churn')
+
+CONTRACT_LENGTHS = np.array([1, 12, 24])
+PAYMENT_METHODS = np.array(['Credit Card', 'Bank Transfer', 'Electronic Check', 'Mailed Check'], dtype=object)
+INTERNET_SERVICES = np.array(['DSL', 'Fiber Optic', 'No'], dtype=object)
+YES_NO = np.array(['Yes', 'No'], dtype=object)
+
 class DataIngestion:
     def __init__(self, config: DataIngestionConfig):
         self.config = config
     
-    def generate_sample_data(self) -> pd.DataFrame:
-        """Generate sample customer data for demonstration"""
-        np.random.seed(self.config.random_state)
-        n_samples = 10000
+    def _generate_block(self, block_index: int, n_rows: int = SAMPLE_BLOCK_SIZE) -> pd.DataFrame:
+        """Generate the first ``n_rows`` rows of one block from its own seed.
+        
+        Every column is drawn from its own stream, so a shorter block is a
+        prefix of the full one and small ranges cost only the rows they need.
+        """
+        start = block_index * SAMPLE_BLOCK_SIZE
+        n = n_rows
+        seed = np.random.SeedSequence(self.config.random_state, spawn_key=(block_index,))
+        rng = dict(zip(RANDOM_COLUMNS, map(np.random.default_rng, seed.spawn(len(RANDOM_COLUMNS)))))
+        
+        monthly_charges = rng['monthly_charges'].normal(65, 20, n)
+        tenure = rng['tenure'].exponential(2, n)
+        contract_length = CONTRACT_LENGTHS[rng['contract_length'].choice(3, n, p=[0.3, 0.4, 0.3])]
+        tech_support = YES_NO[rng['tech_support'].choice(2, n, p=[0.7, 0.3])]
         
         data = {
-            'customer_id': range(1, n_samples + 1),
-            'age': np.random.normal(40, 15, n_samples),
-            'tenure': np.random.exponential(2, n_samples),
-            'monthly_charges': np.random.normal(65, 20, n_samples),
-            'total_charges': np.random.normal(1500, 800, n_samples),
-            'contract_length': np.random.choice([1, 12, 24], n_samples, p=[0.3, 0.4, 0.3]),
-            'payment_method': np.random.choice(['Credit Card', 'Bank Transfer', 'Electronic Check', 'Mailed Check'], n_samples),
-            'internet_service': np.random.choice(['DSL', 'Fiber Optic', 'No'], n_samples, p=[0.4, 0.5, 0.1]),
-            'online_security': np.random.choice(['Yes', 'No'], n_samples, p=[0.6, 0.4]),
-            'tech_support': np.random.choice(['Yes', 'No'], n_samples, p=[0.7, 0.3]),
+            'customer_id': np.arange(start + 1, start + n + 1),
+            'age': rng['age'].normal(40, 15, n),
+            'tenure': tenure,
+            'monthly_charges': monthly_charges,
+            'total_charges': rng['total_charges'].normal(1500, 800, n),
+            'contract_length': contract_length,
+            'payment_method': PAYMENT_METHODS[rng['payment_method'].integers(0, len(PAYMENT_METHODS), n)],
+            'internet_service': INTERNET_SERVICES[rng['internet_service'].choice(3, n, p=[0.4, 0.5, 0.1])],
+            'online_security': YES_NO[rng['online_security'].choice(2, n, p=[0.6, 0.4])],
+            'tech_support': tech_support,
         }
         
         # Create churn based on business logic
-        df = pd.DataFrame(data)
         churn_probability = (
             0.1 +  # Base churn rate
-            0.3 * (df['monthly_charges'] > 80) +  # High monthly charges
-            0.2 * (df['tenure'] < 1) +  # Low tenure
-            0.15 * (df['contract_length'] == 1) +  # Month-to-month contract
-            0.1 * (df['tech_support'] == 'No')  # No tech support
+            0.3 * (monthly_charges > 80) +  # High monthly charges
+            0.2 * (tenure < 1) +  # Low tenure
+            0.15 * (contract_length == 1) +  # Month-to-month contract
+            0.1 * (tech_support == 'No')  # No tech support
         )
+        data['churn'] = (rng['churn'].random(n) < np.clip(churn_probability, 0, 1)).astype(np.int64)
+        
+        return pd.DataFrame(data)
+    
+    def generate_rows(self, start: int, stop: int) -> pd.DataFrame:
+        """Generate rows ``[start, stop)`` of the sample dataset.
+        
+        Rows are produced in fixed blocks of ``SAMPLE_BLOCK_SIZE`` with one seed per
+        block, so any row has the same values however the range is chunked.
+        """
+        if stop <= start:
+            return self._generate_block(0, 0)
+        first_block = start // SAMPLE_BLOCK_SIZE
+        last_block = (stop - 1) // SAMPLE_BLOCK_SIZE
+        blocks = [
+            self._generate_block(i, min(SAMPLE_BLOCK_SIZE, stop - i * SAMPLE_BLOCK_SIZE))
+            for i in range(first_block, last_block + 1)
+        ]
+        df = pd.concat(blocks, ignore_index=True) if len(blocks) > 1 else blocks[0]
+        offset = start - first_block * SAMPLE_BLOCK_SIZE
+        return df.iloc[offset:offset + stop - start].reset_index(drop=True)
+    
+    def generate_sample_data(self, n_samples: int = None) -> pd.DataFrame:
+        """Generate sample customer data for demonstration"""
+        if n_samples is None:
+            n_samples = self.config.n_samples
+        return self.generate_rows(0, n_samples)
+    
+    def iter_sample_data(self, n_samples: int = None, chunk_size: int = SAMPLE_BLOCK_SIZE):
+        """Yield the sample dataset in chunks of ``chunk_size`` rows.
         
-        df['churn'] = np.random.binomial(1, np.clip(churn_probability, 0, 1), n_samples)
+        Each block is generated once and sliced into as many chunks as it spans.
+        """
+        if n_samples is None:
+            n_samples = self.config.n_samples
+        pending, pending_rows = [], 0
+        for block_start in range(0, n_samples, SAMPLE_BLOCK_SIZE):
+            block = self._generate_block(
+                block_start // SAMPLE_BLOCK_SIZE, min(SAMPLE_BLOCK_SIZE, n_samples - block_start)
+            )
+            offset = 0
+            while offset < len(block):
+                rows = min(chunk_size - pending_rows, len(block) - offset)
+                pending.append(block.iloc[offset:offset + rows])
+                pending_rows += rows
+                offset += rows
+                if pending_rows == chunk_size:
+                    yield pd.concat(pending, ignore_index=True)
+                    pending, pending_rows = [], 0
+        if pending:
+            yield pd.concat(pending, ignore_index=True)
+    
+    def _write_shard(self, shard: tuple) -> str:
+        shard_index, start, stop, output_dir, file_format = shard
+        df = self.generate_rows(start, stop)
+        path = Path(output_dir) / f"part-{shard_index:05d}.{file_format}"
+        if file_format == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+        return str(path)
+    
+    def write_sample_data(self, output_dir: str, n_samples: int = None,
+                          rows_per_shard: int = 1_000_000, file_format: str = "parquet",
+                          n_jobs: int = 1) -> list:
+        """Write the sample dataset as CSV or Parquet shards.
         
-        return df
+        Each shard is generated and written independently, so memory is bounded by
+        one shard per worker. Parquet output requires pyarrow.
+        """
+        try:
+            if n_samples is None:
+                n_samples = self.config.n_samples
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            shards = [
+                (i, start, min(start + rows_per_shard, n_samples), output_dir, file_format)
+                for i, start in enumerate(range(0, n_samples, rows_per_shard))
+            ]
+            
+            logger.info(f"Writing {n_samples} rows as {len(shards)} {file_format} shards to {output_dir}")
+            if n_jobs == 1:
+                paths = [self._write_shard(shard) for shard in shards]
+            else:
+                with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                    paths = list(executor.map(self._write_shard, shards))
+            
+            return paths
+            
+        except Exception as e:
+            logger.error(f"Error writing sample data: {str(e)}")
+            raise e
     
     def initiate_data_ingestion(self) -> tuple:
         """Main method to handle data ingestion"""
@@ -84,3 +197,111 @@ class DataIngestion:
         except Exception as e:
             logger.error(f"Error in data ingestion: {str(e)}")
             raise e
+    
+    def _hash_split(self, customer_ids: np.ndarray) -> np.ndarray:
+        """Deterministic test-set mask from a salted 64-bit hash of ``customer_id``"""
+        hashes = pd.util.hash_array(np.asarray(customer_ids))
+        hashes = pd.util.hash_array(hashes ^ np.uint64(self.config.random_state))
+        return (hashes >> np.uint64(11)) * (1.0 / 2 ** 53) < self.config.test_size
+    
+    @staticmethod
+    def _read_csv_range(path: str, start: int, end: int, columns: list) -> pd.DataFrame:
+        """Parse the CSV lines that start within byte range ``[start, end)``"""
+        with open(path, "rb") as f:
+            if start == 0:
+                f.readline()  # header
+            else:
+                f.seek(start - 1)
+                f.readline()  # the line in progress belongs to the previous range
+            position = f.tell()
+            data = f.read(max(end - position, 0))
+            if data and not data.endswith(b"\n"):
+                data += f.readline()
+        if not data:
+            return pd.DataFrame(columns=columns)
+        return pd.read_csv(io.BytesIO(data), header=None, names=columns)
+    
+    def _ingest_range(self, task: tuple) -> dict:
+        """Split one input range and write its train/test shards"""
+        task_index, path, start, end, columns, output_dir = task
+        if path.endswith(".parquet"):
+            df = pd.read_parquet(path)
+        else:
+            df = self._read_csv_range(path, start, end, columns)
+        if df.empty:
+            # A range that starts inside the last line, a header-only CSV or an empty shard
+            return {'rows': 0, 'train': [0, 0], 'test': [0, 0]}
+        
+        is_test = self._hash_split(df['customer_id'].to_numpy())
+        train_path = Path(output_dir) / "train" / f"part-{task_index:05d}.csv"
+        test_path = Path(output_dir) / "test" / f"part-{task_index:05d}.csv"
+        df[~is_test].to_csv(train_path, index=False)
+        df[is_test].to_csv(test_path, index=False)
+        
+        churn = df['churn'].to_numpy()
+        return {
+            'rows': len(df),
+            'train': np.bincount(churn[~is_test], minlength=2).tolist(),
+            'test': np.bincount(churn[is_test], minlength=2).tolist()
+        }
+    
+    def initiate_sharded_ingestion(self) -> tuple:
+        """Split a large raw dataset into train/test shards with bounded memory.
+        
+        The input (a CSV file or a directory of CSV/Parquet shards) is cut into byte
+        ranges of ``chunk_bytes`` that a process pool parses independently. Each row
+        goes to the test split when a salted hash of its ``customer_id`` falls below
+        ``test_size``; since the hash is independent of the label, every churn class
+        is split at the same rate. Splits are written as ``train/part-*.csv`` and
+        ``test/part-*.csv`` under ``processed_data_path``. CSV input must not contain
+        quoted newlines.
+        """
+        try:
+            logger.info("Starting sharded data ingestion")
+            
+            raw_path = self.config.raw_data_path
+            output_dir = Path(self.config.processed_data_path)
+            if not Path(raw_path).exists():
+                logger.info("Generating sample data")
+                Path(raw_path).parent.mkdir(parents=True, exist_ok=True)
+                self.generate_sample_data().to_csv(raw_path, index=False)
+            
+            for split in ("train", "test"):
+                (output_dir / split).mkdir(parents=True, exist_ok=True)
+                for stale in list_data_files(output_dir / split):
+                    os.remove(stale)
+            
+            tasks = []
+            for path in list_data_files(raw_path):
+                if path.endswith(".parquet"):
+                    tasks.append((len(tasks), path, 0, 0, None, str(output_dir)))
+                    continue
+                with open(path, "r") as f:
+                    columns = f.readline().strip().split(",")
+                size = os.path.getsize(path)
+                for start in range(0, size, self.config.chunk_bytes):
+                    end = min(start + self.config.chunk_bytes, size)
+                    tasks.append((len(tasks), path, start, end, columns, str(output_dir)))
+            
+            logger.info(f"Ingesting {len(tasks)} ranges with {self.config.n_jobs} workers")
+            if self.config.n_jobs == 1:
+                results = [self._ingest_range(task) for task in tasks]
+            else:
+                with ProcessPoolExecutor(max_workers=self.config.n_jobs) as executor:
+                    results = list(executor.map(self._ingest_range, tasks))
+            
+            rows = sum(r['rows'] for r in results)
+            train_counts = np.sum([r['train'] for r in results], axis=0)
+            test_counts = np.sum([r['test'] for r in results], axis=0)
+            test_fraction = test_counts / np.maximum(train_counts + test_counts, 1)
+            logger.info(
+                f"Data rows: {rows}, test fraction by churn class: "
+                f"{dict(enumerate(np.round(test_fraction, 4).tolist()))}"
+            )
+            
+            logger.info("Sharded data ingestion completed successfully")
+            return str(output_dir / "train"), str(output_dir / "test")
+            
+        except Exception as e:
+            logger.error(f"Error in sharded data ingestion: {str(e)}")
+            raise e
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict
+from src.config.configuration import DataSamplingConfig
+from src.data.feature_schema import FeatureSchema, FEATURE_SCHEMA
+from src.utils.common import iter_data
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class DataSampling:
+    """Optional sampling stage between ingestion and transformation.
+
+    Strategies:
+        none        -- pass the splits through unchanged
+        reservoir   -- uniform sample of ``reservoir_size`` rows over streamed input
+        stratified  -- exactly ``fraction`` of each churn class
+        downsample  -- all churners and ``negative_fraction`` of non-churners; kept
+                       non-churners get weight ``1 / negative_fraction`` so a model
+                       fit with ``sample_weight`` stays calibrated
+    """
+
+    STRATEGIES = ("none", "reservoir", "stratified", "downsample")
+
+    def __init__(self, config: DataSamplingConfig, schema: FeatureSchema = FEATURE_SCHEMA):
+        if config.strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown sampling strategy: {config.strategy}")
+        for name in ("fraction", "negative_fraction"):
+            value = getattr(config, name)
+            if not 0 < value <= 1:
+                raise ValueError(f"Sampling {name} must be in (0, 1], got {value}")
+        self.config = config
+        self.schema = schema
+        self.stats = {}
+
+    def _chunks(self, path: str, **kwargs):
+        dtypes = self.schema.dtypes(include_target=True)
+        return iter_data(path, self.config.chunk_size, dtype=dtypes, **kwargs)
+
+    def _bottom_k(self, path: str, quotas: Dict, rng: np.random.Generator) -> pd.DataFrame:
+        """Uniform sample without replacement of ``quotas[c]`` rows of churn class ``c``.
+
+        Every streamed row gets a random key and the ``k`` smallest keys per class
+        are kept, so memory is bounded by the quota plus one chunk. A ``None``
+        class selects all rows.
+        """
+        target = self.schema.target_column
+        kept = {c: (None, np.empty(0)) for c in quotas}
+        for chunk in self._chunks(path):
+            keys = rng.random(len(chunk))
+            for c, k in quotas.items():
+                mask = np.ones(len(chunk), dtype=bool) if c is None else (chunk[target] == c).to_numpy()
+                frame, frame_keys = kept[c]
+                frame = chunk[mask] if frame is None else pd.concat([frame, chunk[mask]])
+                frame_keys = np.concatenate([frame_keys, keys[mask]])
+                if len(frame_keys) > k:
+                    keep = np.argpartition(frame_keys, k)[:k]
+                    frame, frame_keys = frame.iloc[keep], frame_keys[keep]
+                kept[c] = (frame, frame_keys)
+        frames = [frame for frame, _ in kept.values() if frame is not None]
+        return pd.concat(frames, ignore_index=True)
+
+    def reservoir_sample(self, path: str, rng: np.random.Generator) -> pd.DataFrame:
+        return self._bottom_k(path, {None: self.config.reservoir_size}, rng)
+
+    def stratified_sample(self, path: str, rng: np.random.Generator) -> pd.DataFrame:
+        target = self.schema.target_column
+        counts = {}
+        for chunk in self._chunks(path, usecols=[target]):
+            for c, n in chunk[target].value_counts().items():
+                counts[c] = counts.get(c, 0) + int(n)
+        quotas = {c: int(round(n * self.config.fraction)) for c, n in counts.items()}
+        return self._bottom_k(path, quotas, rng)
+
+    def downsample_negatives(self, path: str, rng: np.random.Generator) -> pd.DataFrame:
+        target = self.schema.target_column
+        frames = []
+        for chunk in self._chunks(path):
+            negative = (chunk[target] == 0).to_numpy()
+            keep = ~negative | (rng.random(len(chunk)) < self.config.negative_fraction)
+            frames.append(chunk[keep])
+        df = pd.concat(frames, ignore_index=True)
+        df['sample_weight'] = np.where(df[target] == 0, 1.0 / self.config.negative_fraction, 1.0)
+        return df
+
+    def _sample(self, path: str, rng: np.random.Generator, downsample: bool = True) -> pd.DataFrame:
+        if self.config.strategy == "reservoir":
+            df = self.reservoir_sample(path, rng)
+        elif self.config.strategy == "stratified":
+            df = self.stratified_sample(path, rng)
+        elif downsample:
+            df = self.downsample_negatives(path, rng)
+        else:
+            df = pd.concat(self._chunks(path), ignore_index=True)
+        if 'sample_weight' not in df.columns:
+            df['sample_weight'] = 1.0
+        return df
+
+    def get_params(self) -> Dict:
+        """Sampling choices and resulting sizes, for experiment tracking"""
+        return {
+            'sampling_strategy': self.config.strategy,
+            'sampling_fraction': self.config.fraction,
+            'sampling_reservoir_size': self.config.reservoir_size,
+            'sampling_negative_fraction': self.config.negative_fraction,
+            'sampling_random_state': self.config.random_state,
+            **self.stats
+        }
+
+    def initiate_data_sampling(self, train_path: str, test_path: str) -> tuple:
+        """Sample the train (and, except for downsampling, test) split"""
+        try:
+            if self.config.strategy == "none":
+                return train_path, test_path
+
+            logger.info(f"Sampling data with strategy '{self.config.strategy}'")
+            rng = np.random.default_rng(self.config.random_state)
+            output_dir = Path(train_path).parent / "sampled"
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+            train_df = self._sample(train_path, rng)
+            # Evaluation keeps the true class balance
+            test_df = self._sample(test_path, rng, downsample=False)
+
+            sampled_train_path = output_dir / "train.csv"
+            sampled_test_path = output_dir / "test.csv"
+            train_df.to_csv(sampled_train_path, index=False)
+            test_df.to_csv(sampled_test_path, index=False)
+
+            self.stats = {'sampled_train_rows': len(train_df), 'sampled_test_rows': len(test_df)}
+            logger.info(f"Sampled {len(train_df)} train and {len(test_df)} test rows")
+            return str(sampled_train_path), str(sampled_test_path)
+
+        except Exception as e:
+            logger.error(f"Error in data sampling: {str(e)}")
+            raise e
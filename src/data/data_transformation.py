@@ -1,5 +1,4 @@
 import pandas as pd
-import numpy as np
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OneHotEncoder
@@ -8,25 +7,38 @@ from sklearn.impute import SimpleImputer
 import joblib
 from pathlib import Path
 from src.utils.logger import setup_logger
+from src.utils.common import read_data
+from src.data.feature_schema import FeatureSchema, FEATURE_SCHEMA
 
 logger = setup_logger(__name__)
 
+def feature_owners(preprocessor: ColumnTransformer) -> list:
+    """Source feature of every column a fitted preprocessor outputs"""
+    owners = []
+    for name, _, columns in preprocessor.transformers_:
+        if name == "remainder":
+            continue
+        step = preprocessor.named_transformers_[name]
+        encoder = step.named_steps.get("onehot") if hasattr(step, "named_steps") else None
+        if encoder is None:
+            owners.extend(columns)
+        else:
+            for column, categories in zip(columns, encoder.categories_):
+                owners.extend([column] * len(categories))
+    return owners
+
 class DataTransformation:
-    def __init__(self):
+    def __init__(self, schema: FeatureSchema = FEATURE_SCHEMA):
+        self.schema = schema
         self.preprocessor = None
         self.label_encoders = {}
     
-    def get_data_transformer(self, df: pd.DataFrame):
-        """Create preprocessing pipeline"""
+    def get_data_transformer(self, df: pd.DataFrame = None):
+        """Create preprocessing pipeline from the declared feature schema"""
         try:
-            # Identify column types
-            numeric_features = df.select_dtypes(include=[np.number]).columns.tolist()
-            if 'churn' in numeric_features:
-                numeric_features.remove('churn')
-            if 'customer_id' in numeric_features:
-                numeric_features.remove('customer_id')
-                
-            categorical_features = df.select_dtypes(include=['object']).columns.tolist()
+            # Column types come from the schema, not from the frame's dtypes
+            numeric_features = self.schema.numeric_features
+            categorical_features = self.schema.categorical_features
             
             logger.info(f"Numeric features: {numeric_features}")
             logger.info(f"Categorical features: {categorical_features}")
@@ -39,7 +51,10 @@ class DataTransformation:
             
             categorical_transformer = Pipeline(steps=[
                 ('imputer', SimpleImputer(strategy='constant', fill_value='missing')),
-                ('onehot', OneHotEncoder(handle_unknown='ignore'))
+                ('onehot', OneHotEncoder(
+                    categories=[self.schema.vocabulary(col) for col in categorical_features],
+                    handle_unknown='ignore'
+                ))
             ])
             
             # Combine transformers
@@ -59,24 +74,21 @@ class DataTransformation:
     def initiate_data_transformation(self, train_path: str, test_path: str):
         """Transform training and test data"""
         try:
-            # Load data
-            train_df = pd.read_csv(train_path)
-            test_df = pd.read_csv(test_path)
+            # Load data with declared dtypes
+            dtypes = self.schema.dtypes(include_target=True)
+            columns = list(dtypes)
+            train_df = read_data(train_path, usecols=columns, dtype=dtypes)
+            test_df = read_data(test_path, usecols=columns, dtype=dtypes)
             
             logger.info("Data transformation started")
             
-            # Drop customer_id
-            if 'customer_id' in train_df.columns:
-                train_df = train_df.drop('customer_id', axis=1)
-                test_df = test_df.drop('customer_id', axis=1)
-            
             # Separate features and target
-            target_column = 'churn'
+            target_column = self.schema.target_column
             
-            X_train = train_df.drop(columns=[target_column])
+            X_train = train_df[self.schema.feature_names]
             y_train = train_df[target_column]
             
-            X_test = test_df.drop(columns=[target_column])
+            X_test = test_df[self.schema.feature_names]
             y_test = test_df[target_column]
             
             # Get and fit preprocessor
@@ -1,16 +1,56 @@
 import pandas as pd
+import numpy as np
+import shutil
+import tempfile
+import warnings
+from pathlib import Path
 from src.utils.logger import setup_logger
+from src.data.feature_schema import FeatureSchema, FEATURE_SCHEMA
 from typing import Dict, List
 
 logger = setup_logger(__name__)
 
+
+class _HashPartitions:
+    """Row hashes spilled to disk, partitioned by their high bits.
+    
+    Equal hashes always land in the same partition, so distinct hashes are
+    counted one partition at a time and memory holds a single partition.
+    """
+    
+    def __init__(self, partition_bits: int = 6):
+        self.shift = np.uint64(64 - partition_bits)
+        self.spill_dir = Path(tempfile.mkdtemp(prefix="row-hashes-"))
+        self.paths = [self.spill_dir / f"part-{i:04d}.bin" for i in range(1 << partition_bits)]
+        self.files = [open(path, "wb") for path in self.paths]
+    
+    def add(self, hashes: np.ndarray):
+        partitions = hashes >> self.shift
+        order = np.argsort(partitions, kind="stable")
+        hashes, partitions = hashes[order], partitions[order]
+        bounds = np.searchsorted(partitions, np.arange(len(self.files) + 1, dtype=np.uint64))
+        for f, lo, hi in zip(self.files, bounds[:-1], bounds[1:]):
+            if hi > lo:
+                f.write(hashes[lo:hi].tobytes())
+    
+    def count_distinct(self) -> int:
+        for f in self.files:
+            f.close()
+        return sum(len(np.unique(np.fromfile(path, dtype=np.uint64))) for path in self.paths)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        for f in self.files:
+            f.close()
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+
 class DataValidation:
-    def __init__(self):
-        self.required_columns = [
-            'age', 'tenure', 'monthly_charges', 'total_charges',
-            'contract_length', 'payment_method', 'internet_service',
-            'online_security', 'tech_support', 'churn'
-        ]
+    def __init__(self, schema: FeatureSchema = FEATURE_SCHEMA):
+        self.schema = schema
+        self.required_columns = schema.required_columns
     
     def validate_schema(self, df: pd.DataFrame) -> bool:
         """Validate if dataframe has required columns"""
@@ -25,27 +65,74 @@ class DataValidation:
             logger.error(f"Error in schema validation: {str(e)}")
             return False
     
+    def _numeric_columns(self, df: pd.DataFrame) -> List[str]:
+        return [col for col in self.schema.numeric_features if col in df.columns]
+    
+    def _read_dtypes(self) -> Dict[str, str]:
+        """Dtypes for reading raw files; numerics as float64 so missing values parse"""
+        return {
+            spec.name: 'object' if spec.is_categorical else 'float64'
+            for spec in self.schema.features
+        }
+    
+    @staticmethod
+    def _hash_rows(df: pd.DataFrame) -> np.ndarray:
+        """64-bit hash per row, used for duplicate detection"""
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+    
+    @staticmethod
+    def _quartiles(values: np.ndarray):
+        """First and third quartile of every column in one call"""
+        if values.shape[0] == 0:
+            nan = np.full(values.shape[1], np.nan)
+            return nan, nan
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN columns
+            q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+        return q1, q3
+    
+    @staticmethod
+    def _count_outliers(values: np.ndarray, q1: np.ndarray, q3: np.ndarray) -> np.ndarray:
+        """Count values outside the 1.5 * IQR fences, per column"""
+        iqr = q3 - q1
+        lower_bound = q1 - 1.5 * iqr
+        upper_bound = q3 + 1.5 * iqr
+        return ((values < lower_bound) | (values > upper_bound)).sum(axis=0)
+    
+    def _build_report(self, total_rows: int, missing: Dict, duplicate_rows: int,
+                      data_types: Dict, numeric_cols: List[str], q1, q3, outliers) -> Dict:
+        quality_report = {
+            'total_rows': int(total_rows),
+            'missing_values': {col: int(count) for col, count in missing.items()},
+            'duplicate_rows': int(duplicate_rows),
+            'data_types': {col: str(dtype) for col, dtype in data_types.items()},
+            'quartiles': {
+                col: {'q1': float(q1[i]), 'q3': float(q3[i])}
+                for i, col in enumerate(numeric_cols)
+            }
+        }
+        for col, count in zip(numeric_cols, outliers):
+            quality_report[f'{col}_outliers'] = int(count)
+        return quality_report
+    
     def validate_data_quality(self, df: pd.DataFrame) -> Dict:
-        """Validate data quality and return metrics"""
+        """Validate data quality and return JSON-serializable metrics"""
         try:
-            quality_report = {
-                'total_rows': len(df),
-                'missing_values': df.isnull().sum().to_dict(),
-                'duplicate_rows': df.duplicated().sum(),
-                'data_types': df.dtypes.to_dict()
-            }
+            numeric_cols = self._numeric_columns(df)
+            values = df[numeric_cols].to_numpy(dtype=np.float64)
+            
+            # All quartiles and outlier counts in one vectorized pass
+            q1, q3 = self._quartiles(values)
+            outliers = self._count_outliers(values, q1, q3)
             
-            # Check for anomalies
-            numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
-            for col in numeric_cols:
-                if col != 'churn':
-                    q1 = df[col].quantile(0.25)
-                    q3 = df[col].quantile(0.75)
-                    iqr = q3 - q1
-                    lower_bound = q1 - 1.5 * iqr
-                    upper_bound = q3 + 1.5 * iqr
-                    outliers = ((df[col] < lower_bound) | (df[col] > upper_bound)).sum()
-                    quality_report[f'{col}_outliers'] = outliers
+            missing = dict(zip(df.columns, df.isna().to_numpy().sum(axis=0)))
+            hashes = self._hash_rows(df)
+            duplicate_rows = len(hashes) - len(np.unique(hashes))
+            
+            quality_report = self._build_report(
+                len(df), missing, duplicate_rows, df.dtypes.to_dict(),
+                numeric_cols, q1, q3, outliers
+            )
             
             logger.info("Data quality validation completed")
             return quality_report
@@ -53,3 +140,75 @@ class DataValidation:
         except Exception as e:
             logger.error(f"Error in data quality validation: {str(e)}")
             return {}
+    
+    def validate_data_quality_chunked(self, data_path: str, chunksize: int = 1_000_000,
+                                      sample_size: int = 100_000, random_state: int = 42,
+                                      partition_bits: int = 6) -> Dict:
+        """Validate data quality of a CSV file with bounded memory.
+        
+        The file is streamed twice. The first pass counts rows and missing values,
+        spills row hashes to ``2 ** partition_bits`` temporary files for duplicate
+        detection and keeps a uniform sample of ``sample_size`` rows from which the
+        quartiles are estimated. The second pass counts outliers against the
+        resulting fences. Memory is bounded by one chunk, the sample, and one hash
+        partition (8 bytes per row over the number of partitions); the spill files
+        take 8 bytes per row on disk.
+        """
+        try:
+            rng = np.random.default_rng(random_state)
+            dtypes = self._read_dtypes()
+            
+            total_rows = 0
+            missing = {}
+            data_types = {}
+            numeric_cols = None
+            sample = None
+            sample_keys = None
+            
+            with _HashPartitions(partition_bits) as hash_partitions:
+                for chunk in pd.read_csv(data_path, chunksize=chunksize, dtype=dtypes):
+                    if numeric_cols is None:
+                        numeric_cols = self._numeric_columns(chunk)
+                        data_types = chunk.dtypes.to_dict()
+                        sample = np.empty((0, len(numeric_cols)))
+                        sample_keys = np.empty(0)
+                    
+                    total_rows += len(chunk)
+                    for col, count in zip(chunk.columns, chunk.isna().to_numpy().sum(axis=0)):
+                        missing[col] = missing.get(col, 0) + int(count)
+                    
+                    hash_partitions.add(self._hash_rows(chunk))
+                    
+                    # Bottom-k on random keys keeps a uniform sample across chunks
+                    keys = np.concatenate([sample_keys, rng.random(len(chunk))])
+                    sample = np.concatenate([sample, chunk[numeric_cols].to_numpy(dtype=np.float64)])
+                    if len(keys) > sample_size:
+                        keep = np.argpartition(keys, sample_size)[:sample_size]
+                        sample, sample_keys = sample[keep], keys[keep]
+                    else:
+                        sample_keys = keys
+                
+                duplicate_rows = total_rows - hash_partitions.count_distinct()
+            
+            if numeric_cols is None:
+                numeric_cols, sample = [], np.empty((0, 0))
+            q1, q3 = self._quartiles(sample)
+            
+            outliers = np.zeros(len(numeric_cols), dtype=np.int64)
+            if numeric_cols:
+                for chunk in pd.read_csv(data_path, chunksize=chunksize, usecols=numeric_cols,
+                                         dtype={col: 'float64' for col in numeric_cols}):
+                    values = chunk[numeric_cols].to_numpy(dtype=np.float64)
+                    outliers += self._count_outliers(values, q1, q3)
+            
+            quality_report = self._build_report(
+                total_rows, missing, duplicate_rows, data_types,
+                numeric_cols, q1, q3, outliers
+            )
+            
+            logger.info(f"Chunked data quality validation completed for {total_rows} rows")
+            return quality_report
+            
+        except Exception as e:
+            logger.error(f"Error in chunked data quality validation: {str(e)}")
+            return {}
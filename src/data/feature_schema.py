@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """A model input column.
+
+    ``categories`` is the vocabulary of a categorical feature. On a numeric
+    feature it lists the values seen in practice; other values remain valid.
+    """
+    name: str
+    dtype: str
+    categories: Optional[Tuple] = None
+
+    @property
+    def is_categorical(self) -> bool:
+        return self.dtype == "object"
+
+
+@dataclass(frozen=True)
+class FeatureSchema:
+    features: Tuple[FeatureSpec, ...]
+    target_column: str = "churn"
+    id_column: str = "customer_id"
+
+    @property
+    def feature_names(self) -> List[str]:
+        return [spec.name for spec in self.features]
+
+    @property
+    def numeric_features(self) -> List[str]:
+        return [spec.name for spec in self.features if not spec.is_categorical]
+
+    @property
+    def categorical_features(self) -> List[str]:
+        return [spec.name for spec in self.features if spec.is_categorical]
+
+    @property
+    def discrete_features(self) -> List[str]:
+        """Features with a declared set of values, categorical or numeric"""
+        return [spec.name for spec in self.features if spec.categories]
+
+    @property
+    def required_columns(self) -> List[str]:
+        return self.feature_names + [self.target_column]
+
+    def get(self, name: str) -> FeatureSpec:
+        """Return the spec for a feature by name"""
+        for spec in self.features:
+            if spec.name == name:
+                return spec
+        raise KeyError(name)
+
+    def vocabulary(self, name: str) -> List:
+        """Return the declared categories or values of a feature"""
+        return list(self.get(name).categories or ())
+
+    def dtypes(self, include_target: bool = False, include_id: bool = False) -> Dict[str, str]:
+        """Declared dtypes, usable as ``pd.read_csv(dtype=...)``"""
+        dtypes = {spec.name: spec.dtype for spec in self.features}
+        if include_target:
+            dtypes[self.target_column] = "int64"
+        if include_id:
+            dtypes[self.id_column] = "int64"
+        return dtypes
+
+    def to_frame(self, records: Union[Dict, List[Dict]]) -> pd.DataFrame:
+        """Build a typed feature frame from one record or a list of records"""
+        if isinstance(records, dict):
+            records = [records]
+        columns = {
+            spec.name: np.array([record.get(spec.name) for record in records], dtype=spec.dtype)
+            for spec in self.features
+        }
+        return pd.DataFrame(columns, copy=False)
+
+    def from_columns(self, columns: Dict[str, list]) -> pd.DataFrame:
+        """Build a typed feature frame from one array per feature"""
+        typed = {
+            spec.name: np.asarray(columns[spec.name], dtype=spec.dtype)
+            for spec in self.features
+        }
+        return pd.DataFrame(typed, copy=False)
+
+    def select(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return the feature columns of ``df`` in schema order and declared dtypes"""
+        return df[self.feature_names].astype(self.dtypes(), copy=False)
+
+
+FEATURE_SCHEMA = FeatureSchema(
+    features=(
+        FeatureSpec("age", "float64"),
+        FeatureSpec("tenure", "float64"),
+        FeatureSpec("monthly_charges", "float64"),
+        FeatureSpec("total_charges", "float64"),
+        FeatureSpec("contract_length", "int64", (1, 12, 24)),
+        FeatureSpec(
+            "payment_method", "object",
+            ("Credit Card", "Bank Transfer", "Electronic Check", "Mailed Check"),
+        ),
+        FeatureSpec("internet_service", "object", ("DSL", "Fiber Optic", "No")),
+        FeatureSpec("online_security", "object", ("Yes", "No")),
+        FeatureSpec("tech_support", "object", ("Yes", "No")),
+    )
+)
@@ -0,0 +1,124 @@
+import tempfile
+import numpy as np
+from pathlib import Path
+from typing import Dict, List
+from joblib import Parallel, delayed, parallel_config
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.metrics import (
+    accuracy_score,
+    f1_score,
+    precision_score,
+    recall_score,
+    roc_auc_score,
+)
+from sklearn.model_selection import StratifiedKFold
+from src.utils.concurrency import set_n_jobs
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SELECTION_METRICS = ("accuracy", "roc_auc", "precision", "recall", "f1_score")
+
+
+def score_model(model, X, y) -> Dict[str, float]:
+    """Holdout metrics for a fitted classifier"""
+    y_pred = model.predict(X)
+    y_pred_proba = model.predict_proba(X)[:, 1]
+    return {
+        "accuracy": accuracy_score(y, y_pred),
+        "roc_auc": roc_auc_score(y, y_pred_proba),
+        "precision": precision_score(y, y_pred, zero_division=0),
+        "recall": recall_score(y, y_pred, zero_division=0),
+        "f1_score": f1_score(y, y_pred, zero_division=0),
+    }
+
+
+def _load_fold(fold_dir: str, fold: int, part: str) -> np.ndarray:
+    return np.load(Path(fold_dir) / f"fold{fold}_{part}.npy", mmap_mode="r")
+
+
+def _fit_and_score(name: str, model, fold_dir: str, fold: int) -> tuple:
+    """Fit a fresh copy of ``model`` on one cached fold and score it on the held-out part"""
+    weights_path = Path(fold_dir) / f"fold{fold}_w_train.npy"
+    estimator = clone(model)
+    estimator.fit(
+        _load_fold(fold_dir, fold, "X_train"),
+        _load_fold(fold_dir, fold, "y_train"),
+        sample_weight=_load_fold(fold_dir, fold, "w_train") if weights_path.exists() else None,
+    )
+    return name, fold, score_model(
+        estimator, _load_fold(fold_dir, fold, "X_val"), _load_fold(fold_dir, fold, "y_val")
+    )
+
+
+class CrossValidator:
+    """Parallel stratified k-fold evaluation of several candidate models.
+
+    The fold splits and one preprocessor per fold are fitted once and the
+    transformed matrices are written to ``.npy`` files. Every (candidate, fold)
+    fit then runs on a process pool that opens those files memory-mapped, so
+    workers share the page cache instead of each receiving a pickled copy.
+    ``inner_threads`` caps each worker's estimator ``n_jobs`` and BLAS/OpenMP
+    pools so the pool does not oversubscribe the cores.
+    """
+
+    def __init__(self, n_splits: int = 5, n_jobs: int = -1, random_state: int = 42,
+                 inner_threads: int = None):
+        if n_splits < 2:
+            raise ValueError("Cross-validation needs at least 2 folds")
+        self.n_splits = n_splits
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.inner_threads = inner_threads
+
+    def prepare_folds(self, X, y, preprocessor, fold_dir: str, sample_weight=None) -> List[int]:
+        """Split, fit ``preprocessor`` per fold and cache the transformed folds"""
+        y = np.asarray(y)
+        splitter = StratifiedKFold(n_splits=self.n_splits, shuffle=True, random_state=self.random_state)
+        folds = []
+        for fold, (train_idx, val_idx) in enumerate(splitter.split(X, y)):
+            fold_preprocessor = clone(preprocessor)
+            X_train = fold_preprocessor.fit_transform(X.iloc[train_idx])
+            X_val = fold_preprocessor.transform(X.iloc[val_idx])
+            parts = {
+                "X_train": X_train.toarray() if sparse.issparse(X_train) else X_train,
+                "X_val": X_val.toarray() if sparse.issparse(X_val) else X_val,
+                "y_train": y[train_idx],
+                "y_val": y[val_idx],
+            }
+            if sample_weight is not None:
+                parts["w_train"] = np.asarray(sample_weight)[train_idx]
+            for part, values in parts.items():
+                np.save(Path(fold_dir) / f"fold{fold}_{part}.npy", np.ascontiguousarray(values, dtype=np.float64))
+            folds.append(fold)
+        return folds
+
+    def evaluate(self, models: Dict, X, y, preprocessor, sample_weight=None) -> Dict[str, Dict[str, float]]:
+        """Mean and standard deviation of every metric per candidate, as ``cv_<metric>_mean/std``"""
+        with tempfile.TemporaryDirectory(prefix="cv_folds_") as fold_dir:
+            folds = self.prepare_folds(X, y, preprocessor, fold_dir, sample_weight)
+            logger.info(
+                f"Cross-validating {len(models)} candidates on {len(folds)} folds with n_jobs={self.n_jobs}"
+                f"{f', {self.inner_threads} threads each' if self.inner_threads else ''}"
+            )
+            backend = {}
+            if self.inner_threads:
+                models = {name: set_n_jobs(clone(model), self.inner_threads, only_parallel=True) for name, model in models.items()}
+                backend = {'backend': "loky", 'inner_max_num_threads': self.inner_threads}
+            with parallel_config(**backend):
+                fold_scores = Parallel(n_jobs=self.n_jobs)(
+                    delayed(_fit_and_score)(name, model, fold_dir, fold)
+                    for name, model in models.items()
+                    for fold in folds
+                )
+
+        results = {}
+        for name in models:
+            scores = [metrics for model_name, _, metrics in fold_scores if model_name == name]
+            results[name] = {}
+            for metric in SELECTION_METRICS:
+                values = np.array([metrics[metric] for metrics in scores])
+                results[name][f"cv_{metric}_mean"] = float(values.mean())
+                results[name][f"cv_{metric}_std"] = float(values.std())
+        return results
@@ -0,0 +1,150 @@
+import queue
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+import mlflow
+import mlflow.sklearn
+from mlflow.entities import Metric, Param
+from mlflow.tracking import MlflowClient
+from mlflow.utils.time import get_current_time_millis
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# MLflow log_batch limits
+MAX_PARAMS_PER_BATCH = 100
+MAX_METRICS_PER_BATCH = 1000
+
+
+class BackgroundMlflowLogger:
+    """Logs to MLflow from a background thread.
+
+    Runs are created synchronously so their ids are available immediately;
+    params and metrics are queued and written with ``log_batch``, and model
+    artifacts are saved and uploaded on the writer thread. ``close`` blocks
+    until everything queued has been written, or ``close_timeout`` seconds.
+    Tracking errors are logged and never interrupt training: if the
+    experiment or a run cannot be created, the tracker (or that run) becomes
+    a no-op and ``start_run`` returns ``None``. A batch MLflow rejects is
+    dropped rather than resent.
+    """
+
+    _STOP = object()
+
+    def __init__(self, experiment_name: str, close_timeout: float = 300.0):
+        self.queue = queue.Queue()
+        self.close_timeout = close_timeout
+        self.errors = []
+        self.experiment_id = None
+        try:
+            self.client = MlflowClient()
+            experiment = self.client.get_experiment_by_name(experiment_name)
+            self.experiment_id = (
+                experiment.experiment_id if experiment is not None
+                else self.client.create_experiment(experiment_name)
+            )
+        except Exception as e:
+            self.errors.append(e)
+            logger.error(f"MLflow unavailable, experiment tracking disabled: {str(e)}")
+        self.thread = threading.Thread(target=self._worker, name="mlflow-logger", daemon=True)
+        self.thread.start()
+
+    def start_run(self, run_name: str) -> Optional[str]:
+        if self.experiment_id is None:
+            return None
+        try:
+            return self.client.create_run(self.experiment_id, run_name=run_name).info.run_id
+        except Exception as e:
+            self.errors.append(e)
+            logger.error(f"Could not create MLflow run {run_name}: {str(e)}")
+            return None
+
+    def _put(self, kind: str, run_id: Optional[str], payload):
+        # Runs that could not be created are not tracked
+        if run_id is not None:
+            self.queue.put((kind, run_id, payload))
+
+    def log_params(self, run_id: str, params: Dict):
+        self._put("params", run_id, [Param(k, str(v)) for k, v in params.items()])
+
+    def log_metrics(self, run_id: str, metrics: Dict, step: int = 0):
+        timestamp = get_current_time_millis()
+        self._put("metrics", run_id, [Metric(k, float(v), timestamp, step) for k, v in metrics.items()])
+
+    def log_model(self, run_id: str, model, artifact_path: str = "model"):
+        self._put("model", run_id, (model, artifact_path))
+
+    def log_text(self, run_id: str, text: str, artifact_file: str):
+        self._put("text", run_id, (text, artifact_file))
+
+    def end_run(self, run_id: str, status: str = "FINISHED"):
+        self._put("end", run_id, status)
+
+    def close(self):
+        """Flush everything queued and stop the writer thread"""
+        if self.thread.is_alive():
+            self.queue.put(self._STOP)
+            self.thread.join(self.close_timeout)
+            if self.thread.is_alive():
+                logger.error(f"MLflow logger still writing after {self.close_timeout}s; abandoning the rest")
+
+    def _error(self, e: Exception):
+        self.errors.append(e)
+        logger.error(f"Error logging to MLflow: {str(e)}")
+
+    def _flush(self, params: Dict, metrics: Dict):
+        # Cleared even if log_batch raises, so a rejected batch is not resent with every later item
+        try:
+            for run_id in set(params) | set(metrics):
+                run_params, run_metrics = params.get(run_id, []), metrics.get(run_id, [])
+                for i in range(0, len(run_params), MAX_PARAMS_PER_BATCH):
+                    self.client.log_batch(run_id, params=run_params[i:i + MAX_PARAMS_PER_BATCH])
+                for i in range(0, len(run_metrics), MAX_METRICS_PER_BATCH):
+                    self.client.log_batch(run_id, metrics=run_metrics[i:i + MAX_METRICS_PER_BATCH])
+        finally:
+            params.clear()
+            metrics.clear()
+
+    def _write(self, kind: str, run_id: str, payload):
+        if kind == "model":
+            model, artifact_path = payload
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                local_path = Path(tmp_dir) / artifact_path
+                mlflow.sklearn.save_model(model, str(local_path))
+                self.client.log_artifacts(run_id, str(local_path), artifact_path)
+        elif kind == "text":
+            text, artifact_file = payload
+            self.client.log_text(run_id, text, artifact_file)
+        elif kind == "end":
+            self.client.set_terminated(run_id, payload)
+
+    def _worker(self):
+        params, metrics = {}, {}
+        while True:
+            item = self.queue.get()
+            if item is self._STOP:
+                try:
+                    self._flush(params, metrics)
+                except Exception as e:
+                    self._error(e)
+                # Exit whatever happened, or close() would wait on a thread that never ends
+                return
+            try:
+                kind, run_id, payload = item
+                if kind == "params":
+                    params.setdefault(run_id, []).extend(payload)
+                elif kind == "metrics":
+                    metrics.setdefault(run_id, []).extend(payload)
+                else:
+                    # Params and metrics must land before artifacts or run end; a rejected
+                    # batch must not keep the run from being ended
+                    try:
+                        self._flush(params, metrics)
+                    except Exception as e:
+                        self._error(e)
+                    self._write(kind, run_id, payload)
+                if self.queue.empty():
+                    self._flush(params, metrics)
+            except Exception as e:
+                self._error(e)
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from typing import Dict, List
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from src.data.data_transformation import feature_owners
+from src.data.feature_schema import FeatureSchema, FEATURE_SCHEMA
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class ModelExplainer:
+    """Per-feature contributions for the forest and logistic-regression models.
+
+    RandomForest: tree-path contributions. Every edge of every tree adds the
+    change in the class-1 probability to the feature split on, so a row's
+    contributions plus the mean root value equal its ``predict_proba``. The
+    edge deltas of all trees are stacked into one sparse (nodes x columns)
+    matrix at construction, and a batch is explained with one
+    ``decision_path`` call and one sparse product.
+
+    LogisticRegression: exact linear contributions ``coef * (x - baseline)`` in
+    log-odds, where the baseline is the mean transformed training row stored
+    on the model (``explanation_baseline_``) or zero if absent.
+
+    Contributions of the scaled and one-hot columns are summed back onto the
+    original ``CustomerFeatures`` fields.
+    """
+
+    def __init__(self, model, preprocessor, schema: FeatureSchema = FEATURE_SCHEMA):
+        self.model = model
+        self.preprocessor = preprocessor
+        self.schema = schema
+        self.feature_map = self._feature_map()
+
+        if isinstance(model, RandomForestClassifier):
+            self.units = "probability"
+            self.edge_contributions, self.base_value = self._forest_edges()
+        elif isinstance(model, LogisticRegression):
+            self.units = "log_odds"
+            baseline = getattr(model, "explanation_baseline_", None)
+            self.baseline = np.zeros(model.coef_.shape[1]) if baseline is None else np.asarray(baseline)
+            self.base_value = float(model.intercept_[0] + model.coef_[0] @ self.baseline)
+        else:
+            raise ValueError(f"Explanations are not supported for {type(model).__name__}")
+
+    @staticmethod
+    def fit_baseline(model, X_transformed, sample_weight=None):
+        """Store the (weighted) mean transformed training row used as the linear baseline"""
+        if sample_weight is None:
+            baseline = X_transformed.mean(axis=0)
+        else:
+            weights = np.asarray(sample_weight, dtype=np.float64)
+            # Sparse-safe weighted average
+            baseline = (weights @ X_transformed) / weights.sum()
+        model.explanation_baseline_ = np.asarray(baseline).ravel()
+        return model
+
+    def _feature_map(self) -> sparse.csr_matrix:
+        """(transformed columns x schema features) 0/1 matrix"""
+        owners = feature_owners(self.preprocessor)
+        index = {name: i for i, name in enumerate(self.schema.feature_names)}
+        rows = np.arange(len(owners))
+        cols = np.array([index[owner] for owner in owners])
+        return sparse.csr_matrix(
+            (np.ones(len(owners)), (rows, cols)), shape=(len(owners), len(index))
+        )
+
+    def _forest_edges(self):
+        """Stacked (all nodes x transformed columns) matrix of per-edge probability changes"""
+        blocks, roots = [], []
+        n_columns = self.feature_map.shape[0]
+        for estimator in self.model.estimators_:
+            tree = estimator.tree_
+            value = tree.value[:, 0, :]
+            positive = value[:, 1] / value.sum(axis=1)
+
+            parent = np.full(tree.node_count, -1)
+            internal = np.flatnonzero(tree.children_left >= 0)
+            parent[tree.children_left[internal]] = internal
+            parent[tree.children_right[internal]] = internal
+
+            child = np.flatnonzero(parent >= 0)
+            blocks.append(sparse.csr_matrix(
+                (positive[child] - positive[parent[child]], (child, tree.feature[parent[child]])),
+                shape=(tree.node_count, n_columns)
+            ))
+            roots.append(positive[0])
+        return sparse.vstack(blocks, format="csr") / len(blocks), float(np.mean(roots))
+
+    def contributions(self, X) -> np.ndarray:
+        """(rows x schema features) contributions for preprocessed rows ``X``"""
+        if self.units == "probability":
+            indicator, _ = self.model.decision_path(X)
+            column_contributions = indicator @ self.edge_contributions
+        else:
+            X = X.toarray() if sparse.issparse(X) else X
+            column_contributions = (X - self.baseline) * self.model.coef_[0]
+        contributions = column_contributions @ self.feature_map
+        return contributions.toarray() if sparse.issparse(contributions) else np.asarray(contributions)
+
+    def explain(self, features: pd.DataFrame) -> List[Dict]:
+        """Probability and contributions per row, keyed by field name and sorted by magnitude"""
+        contributions = self.contributions(self.preprocessor.transform(features))
+        # Contributions sum exactly to the model output, so no second scoring pass
+        scores = self.base_value + contributions.sum(axis=1)
+        probabilities = scores if self.units == "probability" else 1 / (1 + np.exp(-scores))
+        names = self.schema.feature_names
+        order = np.argsort(-np.abs(contributions), axis=1)
+        return [
+            {
+                'churn_probability': float(np.clip(probability, 0, 1)),
+                'base_value': self.base_value,
+                'contributions': {names[j]: float(row[j]) for j in row_order},
+                'units': self.units,
+            }
+            for probability, row, row_order in zip(probabilities, contributions, order)
+        ]
@@ -1,66 +1,226 @@
+import json
+import subprocess
+import sys
 import joblib
 import pandas as pd
 import numpy as np
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score,
-    roc_auc_score, confusion_matrix, classification_report
-)
-import matplotlib.pyplot as plt
-import seaborn as sns
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+
+@dataclass
+class ThresholdCurves:
+    """Cumulative confusion counts at every distinct score, highest first.
+
+    Built from one sort of the scores; ``tp[i]`` and ``fp[i]`` count the
+    positives and negatives scoring ``>= thresholds[i]``. Every threshold
+    metric, the ROC and precision-recall curves and their areas derive from
+    these arrays without touching the labels again.
+    """
+    thresholds: np.ndarray
+    tp: np.ndarray
+    fp: np.ndarray
+    n_pos: int
+    n_neg: int
+
+    @classmethod
+    def from_scores(cls, y_true, y_score) -> "ThresholdCurves":
+        y_true = np.asarray(y_true).astype(bool)
+        y_score = np.asarray(y_score, dtype=np.float64)
+        order = np.argsort(y_score)[::-1]
+        y_score, y_true = y_score[order], y_true[order]
+
+        # Last index of each run of tied scores
+        ends = np.r_[np.flatnonzero(np.diff(y_score)), len(y_score) - 1]
+        tp = np.cumsum(y_true, dtype=np.int64)[ends]
+        fp = ends + 1 - tp
+        n_pos = int(tp[-1])
+        return cls(y_score[ends], tp, fp, n_pos, len(y_score) - n_pos)
+
+    @property
+    def fn(self) -> np.ndarray:
+        return self.n_pos - self.tp
+
+    @property
+    def tn(self) -> np.ndarray:
+        return self.n_neg - self.fp
+
+    @property
+    def tpr(self) -> np.ndarray:
+        return self.tp / self.n_pos if self.n_pos else np.zeros(len(self.tp))
+
+    @property
+    def fpr(self) -> np.ndarray:
+        return self.fp / self.n_neg if self.n_neg else np.zeros(len(self.fp))
+
+    @property
+    def precision(self) -> np.ndarray:
+        return self.tp / np.maximum(self.tp + self.fp, 1)
+
+    @property
+    def recall(self) -> np.ndarray:
+        return self.tpr
+
+    @property
+    def f1(self) -> np.ndarray:
+        return 2 * self.tp / np.maximum(2 * self.tp + self.fp + self.fn, 1)
+
+    @property
+    def accuracy(self) -> np.ndarray:
+        return (self.tp + self.tn) / max(self.n_pos + self.n_neg, 1)
+
+    def roc_auc(self) -> float:
+        """Trapezoidal area under the ROC curve (ties count half)"""
+        if not self.n_pos or not self.n_neg:
+            return float("nan")
+        tpr, fpr = np.r_[0.0, self.tpr], np.r_[0.0, self.fpr]
+        return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+    def average_precision(self) -> float:
+        """Step-wise area under the precision-recall curve"""
+        if not self.n_pos:
+            return float("nan")
+        return float(np.sum(np.diff(np.r_[0.0, self.recall]) * self.precision))
+
+    def confusion_at(self, threshold: float) -> Dict[str, int]:
+        """Counts for predicting churn when ``score >= threshold``"""
+        # thresholds are descending; count the distinct scores still at or above it
+        i = np.searchsorted(-self.thresholds, -threshold, side="right") - 1
+        tp = int(self.tp[i]) if i >= 0 else 0
+        fp = int(self.fp[i]) if i >= 0 else 0
+        return {'tn': self.n_neg - fp, 'fp': fp, 'fn': self.n_pos - tp, 'tp': tp}
+
+    def to_dict(self, max_points: int = 1001) -> Dict:
+        """JSON-serializable curves, thinned to at most ``max_points`` thresholds"""
+        index = np.arange(len(self.thresholds))
+        if len(index) > max_points:
+            index = np.unique(np.linspace(0, len(index) - 1, max_points).round().astype(int))
+        return {
+            'thresholds': self.thresholds[index].tolist(),
+            'fpr': self.fpr[index].tolist(),
+            'tpr': self.tpr[index].tolist(),
+            'precision': self.precision[index].tolist(),
+            'recall': self.recall[index].tolist(),
+        }
+
+
+def metrics_from_confusion(tn: int, fp: int, fn: int, tp: int) -> Dict:
+    """Threshold metrics and a per-class report from one set of confusion counts"""
+    total = tn + fp + fn + tp
+
+    def scores(correct: int, predicted: int, actual: int) -> Dict:
+        precision = correct / predicted if predicted else 0.0
+        recall = correct / actual if actual else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        return {'precision': precision, 'recall': recall, 'f1-score': f1, 'support': actual}
+
+    report = {'0': scores(tn, tn + fn, tn + fp), '1': scores(tp, tp + fp, tp + fn)}
+    report['accuracy'] = (tp + tn) / total if total else 0.0
+    report['macro avg'] = {
+        key: (report['0'][key] + report['1'][key]) / 2 for key in ('precision', 'recall', 'f1-score')
+    }
+    report['macro avg']['support'] = total
+    report['weighted avg'] = {
+        key: (report['0'][key] * (tn + fp) + report['1'][key] * (tp + fn)) / total if total else 0.0
+        for key in ('precision', 'recall', 'f1-score')
+    }
+    report['weighted avg']['support'] = total
+
+    metrics = {
+        'accuracy': report['accuracy'],
+        'precision': report['1']['precision'],
+        'recall': report['1']['recall'],
+        'f1_score': report['1']['f1-score'],
+        'specificity': report['0']['recall'],
+    }
+    return {'metrics': metrics, 'classification_report': report}
+
+
 class ModelEvaluation:
     def __init__(self, model_path: str, preprocessor_path: str):
         self.model = joblib.load(model_path)
         self.preprocessor = joblib.load(preprocessor_path)
-    
-    def evaluate_model(self, X_test, y_test):
-        """Comprehensive model evaluation"""
+
+    def evaluate_model(self, X_test, y_test, threshold: float = None):
+        """Comprehensive model evaluation.
+
+        The model is called once for probabilities and labels are
+        ``probability >= threshold`` (the model's tuned decision threshold by
+        default), so the confusion matrix, threshold metrics and curves all
+        come from a single sort of the scores.
+        """
         try:
+            if threshold is None:
+                threshold = getattr(self.model, "decision_policy_", {}).get("threshold", 0.5)
+
             # Transform test data
             X_test_transformed = self.preprocessor.transform(X_test)
-            
+
             # Make predictions
-            y_pred = self.model.predict(X_test_transformed)
             y_pred_proba = self.model.predict_proba(X_test_transformed)[:, 1]
-            
+            y_pred = (y_pred_proba >= threshold).astype(int)
+
             # Calculate metrics
-            metrics = {
-                'accuracy': accuracy_score(y_test, y_pred),
-                'precision': precision_score(y_test, y_pred),
-                'recall': recall_score(y_test, y_pred),
-                'f1_score': f1_score(y_test, y_pred),
-                'roc_auc': roc_auc_score(y_test, y_pred_proba)
-            }
-            
+            curves = ThresholdCurves.from_scores(y_test, y_pred_proba)
+            counts = curves.confusion_at(threshold)
+            summary = metrics_from_confusion(**counts)
+            metrics = summary['metrics']
+            metrics['roc_auc'] = curves.roc_auc()
+            metrics['average_precision'] = curves.average_precision()
+
             # Confusion matrix
-            cm = confusion_matrix(y_test, y_pred)
-            
-            # Classification report
-            class_report = classification_report(y_test, y_pred)
-            
+            cm = np.array([[counts['tn'], counts['fp']], [counts['fn'], counts['tp']]])
+
             logger.info("Model evaluation completed")
-            
+
             return {
                 'metrics': metrics,
                 'confusion_matrix': cm,
-                'classification_report': class_report,
+                'classification_report': summary['classification_report'],
+                'curves': curves,
+                'threshold': threshold,
                 'predictions': y_pred,
                 'probabilities': y_pred_proba
             }
-            
+
         except Exception as e:
             logger.error(f"Error in model evaluation: {str(e)}")
             raise e
-    
-    def plot_confusion_matrix(self, cm):
+
+    def save_report(self, evaluation: Dict, path: str = "artifacts/evaluation.json") -> str:
+        """Write metrics, confusion matrix and thinned curves as JSON"""
+        report = {
+            'metrics': evaluation['metrics'],
+            'threshold': evaluation['threshold'],
+            'confusion_matrix': np.asarray(evaluation['confusion_matrix']).tolist(),
+            'classification_report': evaluation['classification_report'],
+            'curves': evaluation['curves'].to_dict(),
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2))
+        return str(path)
+
+    def plot_report(self, report_path: str, output_dir: str = "artifacts", wait: bool = False):
+        """Render plots from a saved report in a separate process.
+
+        Plotting libraries are only imported by the child process, so
+        evaluation stays headless and is never blocked by rendering.
+        """
+        process = subprocess.Popen(
+            [sys.executable, "-m", "src.models.plot_evaluation", report_path, "--output-dir", output_dir]
+        )
+        if wait:
+            process.wait()
+        return process
+
+    def plot_confusion_matrix(self, cm, output_dir: str = "artifacts", wait: bool = False):
         """Plot confusion matrix"""
-        plt.figure(figsize=(8, 6))
-        sns.heatmap(cm, annot=True, fmt='d', cmap='Blues')
-        plt.title('Confusion Matrix')
-        plt.ylabel('Actual')
-        plt.xlabel('Predicted')
-        plt.savefig('artifacts/confusion_matrix.png')
-        plt.close()
+        report_path = Path(output_dir) / "confusion_matrix.json"
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps({'confusion_matrix': np.asarray(cm).tolist()}))
+        return self.plot_report(str(report_path), output_dir, wait=wait)
@@ -1,94 +1,137 @@
 import joblib
-import mlflow
-import mlflow.sklearn
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.svm import SVC
-from sklearn.metrics import (
-    accuracy_score,
-    classification_report,
-    roc_auc_score,
-    confusion_matrix,
-)
 from pathlib import Path
 from src.utils.logger import setup_logger
 from src.config.configuration import ModelTrainingConfig
+from src.models.cross_validation import CrossValidator, SELECTION_METRICS, score_model
+from src.models.experiment_tracker import BackgroundMlflowLogger
+from src.utils.concurrency import ThreadBudget, set_n_jobs
+from src.utils.memory import track_memory
 import numpy as np
 
 logger = setup_logger(__name__)
 
 
 class ModelTrainer:
-    def __init__(self, config: ModelTrainingConfig):
+    def __init__(self, config: ModelTrainingConfig, budget: ThreadBudget = None,
+                 experiment_name: str = "churn_prediction"):
+        if config.selection_metric not in SELECTION_METRICS:
+            raise ValueError(f"Unknown selection metric: {config.selection_metric}")
         self.config = config
+        self.budget = budget
+        self.experiment_name = experiment_name
         self.models = {
             "RandomForestClassifier": RandomForestClassifier(**config.hyperparameters),
             "LogisticRegression": LogisticRegression(random_state=42, max_iter=1000),
             "SVC": SVC(probability=True, random_state=42),
         }
+        if budget is not None:
+            # Candidates are fit one at a time, so the forest gets the whole training budget;
+            # the others do not parallelise a binary fit and run on the capped BLAS pools
+            set_n_jobs(self.models["RandomForestClassifier"], budget.threads)
 
     def evaluate_model(self, model, X_test, y_test):
         """Evaluate model performance"""
-        y_pred = model.predict(X_test)
-        y_pred_proba = model.predict_proba(X_test)[:, 1]
-
-        metrics = {
-            "accuracy": accuracy_score(y_test, y_pred),
-            "roc_auc": roc_auc_score(y_test, y_pred_proba),
-        }
-
-        return metrics
-
-    def initiate_model_trainer(self, X_train, y_train, X_test, y_test):
-        """Train and evaluate models"""
+        return score_model(model, X_test, y_test)
+
+    def cross_validate(self, X, y, preprocessor, sample_weight=None):
+        """k-fold scores per candidate; ``X`` is the untransformed feature frame"""
+        n_jobs = self.config.cv_n_jobs
+        inner_threads = None
+        if self.budget is not None:
+            # Fold processes split the budget between them
+            n_jobs = self.budget.n_jobs(n_jobs)
+            inner_threads = max(1, self.budget.threads // n_jobs)
+        validator = CrossValidator(
+            n_splits=self.config.cv_folds,
+            n_jobs=n_jobs,
+            random_state=self.config.hyperparameters.get("random_state", 42),
+            inner_threads=inner_threads,
+        )
+        return validator.evaluate(self.models, X, y, preprocessor, sample_weight)
+
+    def initiate_model_trainer(self, X_train, y_train, X_test, y_test,
+                               sample_weight=None, run_params: dict = None,
+                               cv_results: dict = None):
+        """Train and evaluate models.
+
+        Without ``cv_results`` every candidate is fit and ranked on the holdout
+        ``selection_metric``. With them, candidates are ranked on the
+        cross-validated mean and only the top ``log_top_k`` are refit on the
+        full training set.
+        """
         try:
             logger.info("Starting model training")
+            metric = self.config.selection_metric
 
             # Set MLflow experiment
-            mlflow.set_experiment(
-                self.config.experiment_name
-                if hasattr(self.config, "experiment_name")
-                else "churn_prediction"
-            )
-
-            best_model = None
-            best_score = 0
-            best_model_name = ""
-
-            for model_name, model in self.models.items():
-                with mlflow.start_run(run_name=f"{model_name}_training"):
+            tracker = BackgroundMlflowLogger(self.experiment_name)
+            run_ids = {}
+            status = "FAILED"
+            try:
+                for model_name, model in self.models.items():
+                    run_ids[model_name] = tracker.start_run(f"{model_name}_training")
+                    tracker.log_params(run_ids[model_name], model.get_params())
+                    if run_params:
+                        tracker.log_params(run_ids[model_name], run_params)
+                    if cv_results:
+                        tracker.log_metrics(run_ids[model_name], cv_results[model_name])
+
+                if cv_results:
+                    cv_key = f"cv_{metric}_mean"
+                    to_fit = sorted(self.models, key=lambda name: cv_results[name][cv_key], reverse=True)
+                    to_fit = to_fit[:max(self.config.log_top_k, 1)]
+                else:
+                    to_fit = list(self.models)
+
+                scores = {}
+                for model_name in to_fit:
+                    model = self.models[model_name]
                     logger.info(f"Training {model_name}")
 
-                    # Train model
-                    model.fit(X_train, y_train)
+                    # Train model; RSS only, tracing would slow the fit down
+                    with track_memory(trace=False) as fit_memory:
+                        model.fit(X_train, y_train, sample_weight=sample_weight)
 
                     # Evaluate model
                     metrics = self.evaluate_model(model, X_test, y_test)
 
-                    # Log metrics
-                    mlflow.log_metrics(metrics)
-                    mlflow.log_params(model.get_params())
-
-                    # Log model
-                    mlflow.sklearn.log_model(model, "model")
+                    # Queue metrics for the background writer
+                    tracker.log_metrics(run_ids[model_name], metrics)
+                    tracker.log_metrics(run_ids[model_name], {
+                        f"memory.fit.{key}": value for key, value in fit_memory.items() if value is not None
+                    })
 
                     logger.info(
                         f"{model_name} - Accuracy: {metrics['accuracy']:.4f}, AUC: {metrics['roc_auc']:.4f}"
                     )
-
-                    # Track best model
-                    if metrics["accuracy"] > best_score:
-                        best_score = metrics["accuracy"]
-                        best_model = model
-                        best_model_name = model_name
-
-            # Save best model
-            model_path = Path("artifacts/model.pkl")
-            model_path.parent.mkdir(parents=True, exist_ok=True)
-            joblib.dump(best_model, model_path)
+                    scores[model_name] = cv_results[model_name][cv_key] if cv_results else metrics[metric]
+
+                # Stable sort: ties keep the declaration order of the candidates
+                ranked = sorted(scores, key=scores.get, reverse=True)
+                best_model_name = ranked[0]
+                best_model = self.models[best_model_name]
+
+                # Log model artifacts only for the top-k candidates
+                for model_name in ranked[:self.config.log_top_k]:
+                    tracker.log_model(run_ids[model_name], self.models[model_name], "model")
+
+                # Save best model
+                model_path = Path("artifacts/model.pkl")
+                model_path.parent.mkdir(parents=True, exist_ok=True)
+                joblib.dump(best_model, model_path)
+                status = "FINISHED"
+            finally:
+                # Close the runs and flush the queue even when training fails
+                for run_id in run_ids.values():
+                    tracker.end_run(run_id, status=status)
+                tracker.close()
 
             logger.info(
-                f"Best model ({best_model_name}) saved with accuracy: {best_score:.4f}"
+                f"Best model ({best_model_name}) saved with "
+                f"{'cross-validated ' if cv_results else ''}{metric}: {scores[best_model_name]:.4f}"
             )
             return str(model_path)
 
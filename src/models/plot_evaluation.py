@@ -0,0 +1,59 @@
+"""Render evaluation plots from a saved report.
+
+Run as a separate process so plotting libraries never load in evaluation:
+
+    python -m src.models.plot_evaluation artifacts/evaluation.json --output-dir artifacts
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import List
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+
+def plot_confusion_matrix(cm, output_path: Path):
+    plt.figure(figsize=(8, 6))
+    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues')
+    plt.title('Confusion Matrix')
+    plt.ylabel('Actual')
+    plt.xlabel('Predicted')
+    plt.savefig(output_path)
+    plt.close()
+
+
+def plot_curve(x, y, xlabel: str, ylabel: str, title: str, output_path: Path):
+    plt.figure(figsize=(8, 6))
+    plt.plot(x, y)
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    plt.savefig(output_path)
+    plt.close()
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Plot a saved model evaluation report")
+    parser.add_argument("report", help="JSON report written by ModelEvaluation.save_report")
+    parser.add_argument("--output-dir", default="artifacts")
+    args = parser.parse_args(argv)
+
+    report = json.loads(Path(args.report).read_text())
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if 'confusion_matrix' in report:
+        plot_confusion_matrix(report['confusion_matrix'], output_dir / "confusion_matrix.png")
+    curves = report.get('curves')
+    if curves:
+        plot_curve(curves['fpr'], curves['tpr'], 'False Positive Rate', 'True Positive Rate',
+                   'ROC Curve', output_dir / "roc_curve.png")
+        plot_curve(curves['recall'], curves['precision'], 'Recall', 'Precision',
+                   'Precision-Recall Curve', output_dir / "pr_curve.png")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import itertools
+from abc import ABC, abstractmethod
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from src.data.data_transformation import feature_owners
+from src.data.feature_schema import FeatureSchema, FEATURE_SCHEMA
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class ScoreTable(ABC):
+    """Single-row scoring with the discrete part of the model precomputed.
+
+    Every combination of the schema's discrete features (the categoricals and
+    ``contract_length``) is transformed once at load time; a request then only
+    imputes and scales the continuous features and evaluates what depends on
+    them. Rows with an undeclared discrete value return ``None`` so callers
+    fall back to the regular pipeline.
+    """
+
+    def __init__(self, model, preprocessor, schema: FeatureSchema = FEATURE_SCHEMA):
+        self.model = model
+        self.schema = schema
+        self.discrete = schema.discrete_features
+        self.continuous = [name for name in schema.numeric_features if name not in self.discrete]
+
+        owners = feature_owners(preprocessor)
+        self.continuous_columns = np.array([owners.index(name) for name in self.continuous])
+        numeric = preprocessor.named_transformers_['num']
+        positions = [schema.numeric_features.index(name) for name in self.continuous]
+        self.medians = numeric.named_steps['imputer'].statistics_[positions]
+        self.means = numeric.named_steps['scaler'].mean_[positions]
+        self.scales = numeric.named_steps['scaler'].scale_[positions]
+
+        combinations = list(itertools.product(*(schema.vocabulary(name) for name in self.discrete)))
+        self.index = {combination: i for i, combination in enumerate(combinations)}
+        frame = pd.DataFrame(combinations, columns=self.discrete)
+        for name, median in zip(self.continuous, self.medians):
+            frame[name] = median
+        transformed = preprocessor.transform(schema.select(frame))
+        self.discrete_rows = transformed.toarray() if hasattr(transformed, "toarray") else np.asarray(transformed)
+        self._precompute()
+        logger.info(f"Score table built for {len(combinations)} discrete combinations")
+
+    @staticmethod
+    def build(model, preprocessor, schema: FeatureSchema = FEATURE_SCHEMA) -> Optional["ScoreTable"]:
+        """Score table for the model type, or ``None`` if it has none"""
+        if isinstance(model, LogisticRegression):
+            return LinearScoreTable(model, preprocessor, schema)
+        if isinstance(model, RandomForestClassifier):
+            return ForestScoreTable(model, preprocessor, schema)
+        logger.warning(f"No score table for {type(model).__name__}; using the standard pipeline")
+        return None
+
+    @abstractmethod
+    def _precompute(self):
+        """Tabulate what depends only on the discrete combination"""
+
+    @abstractmethod
+    def _score(self, combination: int, scaled: np.ndarray) -> float:
+        """Probability for a tabulated combination and the scaled continuous values"""
+
+    def score(self, features: Dict) -> Optional[float]:
+        """Churn probability for one feature dict, or ``None`` if not tabulated"""
+        combination = self.index.get(tuple(features[name] for name in self.discrete))
+        if combination is None:
+            return None
+        values = np.array([features[name] for name in self.continuous], dtype=np.float64)
+        values = np.where(np.isnan(values), self.medians, values)
+        return self._score(combination, (values - self.means) / self.scales)
+
+
+class LinearScoreTable(ScoreTable):
+    """Logit offset per discrete combination plus a dot product over the continuous features"""
+
+    def _precompute(self):
+        coef = self.model.coef_[0]
+        discrete_part = self.discrete_rows.copy()
+        discrete_part[:, self.continuous_columns] = 0.0
+        self.offsets = self.model.intercept_[0] + discrete_part @ coef
+        self.weights = coef[self.continuous_columns]
+
+    def _score(self, combination: int, scaled: np.ndarray) -> float:
+        logit = self.offsets[combination] + scaled @ self.weights
+        return float(1 / (1 + np.exp(-logit)))
+
+
+class ForestScoreTable(ScoreTable):
+    """The forest pruned per discrete combination down to its continuous splits.
+
+    All trees are concatenated into flat node arrays. For a combination, every
+    split on a discrete column has a known outcome, so chains of such nodes
+    are short-circuited by pointer doubling and only the nodes still reachable
+    are kept. A request walks all pruned trees at once, one level per step.
+    """
+
+    def _precompute(self):
+        trees = [estimator.tree_ for estimator in self.model.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        self.roots = offsets[:-1]
+        self.feature = np.concatenate([tree.feature for tree in trees])
+        self.threshold = np.concatenate([tree.threshold for tree in trees])
+        self.left = np.concatenate([
+            np.where(tree.children_left >= 0, tree.children_left + offset, -1)
+            for tree, offset in zip(trees, offsets)
+        ])
+        self.right = np.concatenate([
+            np.where(tree.children_right >= 0, tree.children_right + offset, -1)
+            for tree, offset in zip(trees, offsets)
+        ])
+        values = np.concatenate([tree.value[:, 0, :] for tree in trees])
+        self.value = values[:, 1] / values.sum(axis=1)
+
+        continuous_position = np.full(self.discrete_rows.shape[1], -1)
+        continuous_position[self.continuous_columns] = np.arange(len(self.continuous_columns))
+        self.continuous_position = continuous_position
+        self.tables = [self._prune(row) for row in self.discrete_rows]
+
+    def _prune(self, row: np.ndarray) -> Dict:
+        internal = self.left >= 0
+        feature = np.where(internal, self.feature, 0)
+        resolved = internal & (self.continuous_position[feature] < 0)
+
+        # Each resolved node jumps to its known child until an unresolved node or leaf
+        jump = np.arange(len(self.left))
+        # Trees are fit on float32 inputs
+        go_left = row[feature].astype(np.float32) <= self.threshold
+        jump[resolved] = np.where(go_left, self.left, self.right)[resolved]
+        while True:
+            next_jump = jump[jump]
+            if np.array_equal(next_jump, jump):
+                break
+            jump = next_jump
+
+        roots = jump[self.roots]
+        left = np.where(internal, jump[np.maximum(self.left, 0)], -1)
+        right = np.where(internal, jump[np.maximum(self.right, 0)], -1)
+
+        reachable = np.zeros(len(self.left), dtype=bool)
+        frontier = roots
+        while len(frontier):
+            reachable[frontier] = True
+            frontier = frontier[left[frontier] >= 0]
+            frontier = np.concatenate([left[frontier], right[frontier]])
+        kept = np.flatnonzero(reachable)
+        remap = np.full(len(self.left), -1)
+        remap[kept] = np.arange(len(kept))
+
+        is_leaf = left[kept] < 0
+        own = np.arange(len(kept))
+        return {
+            'roots': remap[roots].astype(np.int32),
+            'feature': np.where(is_leaf, 0, self.continuous_position[feature[kept]]).astype(np.int8),
+            'threshold': self.threshold[kept],
+            'left': np.where(is_leaf, own, remap[np.maximum(left[kept], 0)]).astype(np.int32),
+            'right': np.where(is_leaf, own, remap[np.maximum(right[kept], 0)]).astype(np.int32),
+            'is_leaf': is_leaf,
+            'value': self.value[kept],
+        }
+
+    def _score(self, combination: int, scaled: np.ndarray) -> float:
+        table = self.tables[combination]
+        scaled = scaled.astype(np.float32)
+        nodes = table['roots']
+        # Leaves point at themselves, so walking stops once every tree is at a leaf
+        while not table['is_leaf'][nodes].all():
+            go_left = scaled[table['feature'][nodes]] <= table['threshold'][nodes]
+            nodes = np.where(go_left, table['left'][nodes], table['right'][nodes])
+        return float(table['value'][nodes].mean())
@@ -0,0 +1,124 @@
+import bisect
+import numpy as np
+from dataclasses import asdict, dataclass
+from src.config.configuration import DecisionConfig
+from src.models.model_evaluation import ThresholdCurves
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+RISK_LEVELS = ("Low", "Medium", "High")
+
+
+@dataclass(frozen=True)
+class DecisionPolicy:
+    """Decision threshold and risk-band cutoffs applied to churn probabilities.
+
+    Stored on the fitted model as a plain ``decision_policy_`` dict so the
+    pickled artifact carries it; models without one fall back to the defaults.
+    """
+    threshold: float = 0.5
+    low_risk_cutoff: float = 0.3
+    high_risk_cutoff: float = 0.7
+
+    @classmethod
+    def from_model(cls, model) -> "DecisionPolicy":
+        policy = getattr(model, "decision_policy_", None)
+        return cls(**policy) if isinstance(policy, dict) else cls()
+
+    def apply(self, model):
+        """Attach this policy to a fitted model"""
+        model.decision_policy_ = asdict(self)
+        return model
+
+    def predict(self, probabilities) -> np.ndarray:
+        return (np.asarray(probabilities) >= self.threshold).astype(int)
+
+    def risk_level(self, probability: float) -> str:
+        """Low below the low cutoff, High at or above the high cutoff"""
+        return RISK_LEVELS[bisect.bisect_right((self.low_risk_cutoff, self.high_risk_cutoff), probability)]
+
+    def risk_levels(self, probabilities) -> np.ndarray:
+        cutoffs = [self.low_risk_cutoff, self.high_risk_cutoff]
+        return np.asarray(RISK_LEVELS)[np.searchsorted(cutoffs, probabilities, side="right")]
+
+
+class ThresholdOptimizer:
+    """Chooses the decision threshold and risk bands minimizing expected business cost.
+
+    Holdout probabilities are sorted once (``ThresholdCurves``); the cost of
+    acting on every customer scoring at or above each distinct threshold then
+    follows from the cumulative counts. A predicted churner receives the
+    retention action (``action_cost``, saves a churner with probability
+    ``action_success_rate``); a missed churner costs ``churn_cost``. The risk
+    bands use the same model with a cheaper Medium action and a costlier High
+    one.
+    """
+
+    def __init__(self, config: DecisionConfig):
+        self.config = config
+        self.report = {}
+
+    @staticmethod
+    def _candidates(curves: ThresholdCurves):
+        """Thresholds with cumulative (contacted, churners) counts, including contacting nobody"""
+        thresholds = np.r_[np.nextafter(curves.thresholds[0], np.inf), curves.thresholds]
+        contacted = np.r_[0, curves.tp + curves.fp]
+        churners = np.r_[0, curves.tp]
+        return thresholds, contacted, churners
+
+    def _action_cost(self, contacted, churners, cost: float, success_rate: float):
+        """Cost of one action on ``contacted`` customers relative to doing nothing"""
+        return cost * contacted - success_rate * self.config.churn_cost * churners
+
+    def expected_costs(self, curves: ThresholdCurves) -> np.ndarray:
+        """Total cost of the binary decision at every candidate threshold"""
+        _, contacted, churners = self._candidates(curves)
+        baseline = self.config.churn_cost * curves.n_pos
+        return baseline + self._action_cost(
+            contacted, churners, self.config.action_cost, self.config.action_success_rate
+        )
+
+    def optimize(self, y_true, y_score) -> DecisionPolicy:
+        curves = ThresholdCurves.from_scores(y_true, y_score)
+        thresholds, contacted, churners = self._candidates(curves)
+        n = max(curves.n_pos + curves.n_neg, 1)
+
+        costs = self.expected_costs(curves)
+        best = int(np.argmin(costs))
+
+        # Band cost splits into f(high index) + g(medium index) with high <= medium,
+        # so the best pair is a prefix minimum of f followed by one argmin
+        config = self.config
+        f = (
+            self._action_cost(contacted, churners, config.high_risk_action_cost, config.high_risk_action_success_rate)
+            - self._action_cost(contacted, churners, config.medium_risk_action_cost, config.medium_risk_action_success_rate)
+        )
+        g = self._action_cost(contacted, churners, config.medium_risk_action_cost, config.medium_risk_action_success_rate)
+        prefix_min = np.minimum.accumulate(f)
+        prefix_argmin = np.maximum.accumulate(np.where(f <= prefix_min, np.arange(len(f)), 0))
+        medium = int(np.argmin(prefix_min + g))
+        high = int(prefix_argmin[medium])
+
+        policy = DecisionPolicy(
+            threshold=float(thresholds[best]),
+            low_risk_cutoff=float(thresholds[medium]),
+            high_risk_cutoff=float(thresholds[high]),
+        )
+        default = DecisionPolicy()
+        default_index = max(int(np.searchsorted(-thresholds, -default.threshold, side="right")) - 1, 0)
+        self.report = {
+            **asdict(policy),
+            'expected_cost_per_customer': float(costs[best] / n),
+            'default_expected_cost_per_customer': float(costs[default_index] / n),
+            'band_expected_cost_per_customer': float(
+                (config.churn_cost * curves.n_pos + prefix_min[medium] + g[medium]) / n
+            ),
+        }
+        logger.info(
+            f"Decision threshold {policy.threshold:.4f} (cost/customer "
+            f"{self.report['expected_cost_per_customer']:.2f} vs "
+            f"{self.report['default_expected_cost_per_customer']:.2f} at 0.5); "
+            f"risk cutoffs {policy.low_risk_cutoff:.4f}/{policy.high_risk_cutoff:.4f}"
+        )
+        return policy
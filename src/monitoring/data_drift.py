@@ -1,30 +1,48 @@
 import pandas as pd
-import numpy as np
 from scipy.stats import ks_2samp, chi2_contingency
 from src.utils.logger import setup_logger
+from src.data.feature_schema import FeatureSchema, FEATURE_SCHEMA
+from src.monitoring.reference_profile import ReferenceProfile
 import warnings
 warnings.filterwarnings('ignore')
 
 logger = setup_logger(__name__)
 
 class DataDriftDetector:
-    def __init__(self, reference_data: pd.DataFrame, threshold: float = 0.05):
+    def __init__(self, reference_data: pd.DataFrame = None, threshold: float = 0.05,
+                 schema: FeatureSchema = FEATURE_SCHEMA,
+                 reference_profile: ReferenceProfile = None):
+        if reference_data is None and reference_profile is None:
+            raise ValueError("Either reference_data or reference_profile is required")
         self.reference_data = reference_data
+        self.reference_profile = reference_profile
         self.threshold = threshold
+        self.schema = schema
+    
+    def _has_reference(self, column: str) -> bool:
+        if self.reference_profile is not None:
+            return self.reference_profile.has_feature(column)
+        return column in self.reference_data.columns
         
     def detect_numerical_drift(self, current_data: pd.DataFrame, column: str):
         """Detect drift in numerical columns using KS test"""
         try:
-            if column not in self.reference_data.columns or column not in current_data.columns:
+            if not self._has_reference(column) or column not in current_data.columns:
                 return False, 1.0
             
-            ref_values = self.reference_data[column].dropna()
             curr_values = current_data[column].dropna()
-            
-            if len(ref_values) == 0 or len(curr_values) == 0:
+            if len(curr_values) == 0:
                 return False, 1.0
             
-            statistic, p_value = ks_2samp(ref_values, curr_values)
+            if self.reference_profile is not None:
+                if self.reference_profile.numeric[column]['count'] == 0:
+                    return False, 1.0
+                statistic, p_value = self.reference_profile.ks_test(column, curr_values.to_numpy())
+            else:
+                ref_values = self.reference_data[column].dropna()
+                if len(ref_values) == 0:
+                    return False, 1.0
+                statistic, p_value = ks_2samp(ref_values, curr_values)
             
             drift_detected = p_value < self.threshold
             return drift_detected, p_value
@@ -36,14 +54,19 @@ class DataDriftDetector:
     def detect_categorical_drift(self, current_data: pd.DataFrame, column: str):
         """Detect drift in categorical columns using chi-square test"""
         try:
-            if column not in self.reference_data.columns or column not in current_data.columns:
+            if not self._has_reference(column) or column not in current_data.columns:
                 return False, 1.0
             
-            ref_counts = self.reference_data[column].value_counts()
+            if self.reference_profile is not None:
+                ref_counts = pd.Series(self.reference_profile.category_counts(column))
+            else:
+                ref_counts = self.reference_data[column].value_counts()
             curr_counts = current_data[column].value_counts()
             
-            # Align categories
-            all_categories = set(ref_counts.index) | set(curr_counts.index)
+            # Align categories on the declared vocabulary, then any unseen values
+            vocabulary = self.schema.vocabulary(column)
+            extra = sorted((set(ref_counts.index) | set(curr_counts.index)) - set(vocabulary))
+            all_categories = vocabulary + extra
             ref_aligned = [ref_counts.get(cat, 0) for cat in all_categories]
             curr_aligned = [curr_counts.get(cat, 0) for cat in all_categories]
             
@@ -69,14 +92,15 @@ class DataDriftDetector:
         """Detect drift across all columns"""
         drift_report = {}
         
-        for column in self.reference_data.columns:
-            if column == 'churn':  # Skip target column
+        for spec in self.schema.features:
+            column = spec.name
+            if not self._has_reference(column):
                 continue
                 
-            if self.reference_data[column].dtype in ['int64', 'float64']:
-                drift_detected, p_value = self.detect_numerical_drift(current_data, column)
-            else:
+            if spec.is_categorical:
                 drift_detected, p_value = self.detect_categorical_drift(current_data, column)
+            else:
+                drift_detected, p_value = self.detect_numerical_drift(current_data, column)
             
             drift_report[column] = {
                 'drift_detected': drift_detected,
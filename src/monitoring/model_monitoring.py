@@ -1,19 +1,20 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import joblib
 from src.utils.logger import setup_logger
 from src.monitoring.data_drift import DataDriftDetector
+from src.monitoring.reference_profile import ReferenceProfile
 import json
 
 logger = setup_logger(__name__)
 
 class ModelMonitor:
-    def __init__(self, model_path: str, preprocessor_path: str, reference_data: pd.DataFrame):
-        self.model = joblib.load(model_path)
-        self.preprocessor = joblib.load(preprocessor_path)
-        self.reference_data = reference_data
-        self.drift_detector = DataDriftDetector(reference_data)
+    def __init__(self, reference_profile_path: str = "artifacts/reference_profile.json",
+                 drift_threshold: float = 0.05):
+        self.reference_profile = ReferenceProfile.load(reference_profile_path)
+        self.drift_detector = DataDriftDetector(
+            reference_profile=self.reference_profile, threshold=drift_threshold
+        )
         self.monitoring_data = []
     
     def monitor_prediction_quality(self, predictions: np.array, probabilities: np.array):
@@ -36,6 +37,26 @@ class ModelMonitor:
             logger.error(f"Error in prediction quality monitoring: {str(e)}")
             return {}
     
+    def monitor_score_drift(self, probabilities: np.array):
+        """Compare live churn probabilities with the reference score distribution"""
+        try:
+            if not self.reference_profile.scores or len(probabilities) == 0:
+                return {}
+            
+            statistic, p_value = self.reference_profile.score_ks_test(probabilities)
+            result = {
+                'ks_statistic': float(statistic),
+                'p_value': float(p_value),
+                'drift_detected': bool(p_value < self.drift_detector.threshold)
+            }
+            
+            logger.info(f"Score drift monitoring: {result}")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error in score drift monitoring: {str(e)}")
+            return {}
+    
     def monitor_data_drift(self, current_data: pd.DataFrame):
         """Monitor for data drift"""
         try:
@@ -0,0 +1,205 @@
+import threading
+import numpy as np
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from src.config.configuration import MonitoringConfig
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Metrics ``check_alerts`` can watch, and whether a higher value is better
+MONITORED_METRICS = {
+    'accuracy': True,
+    'precision': True,
+    'recall': True,
+    'f1_score': True,
+    'roc_auc': True,
+    'expected_calibration_error': False,
+}
+
+
+class PerformanceMonitor:
+    """Online model-quality monitor over a sliding window of labelled predictions.
+
+    Predictions are held by customer id until their delayed churn label arrives.
+    Each joined event updates confusion counts, calibration bins and the score
+    histograms behind the AUC estimate in O(1); the event that falls out of the
+    window is subtracted the same way.
+
+    Customer ids are compared as strings, so ``42`` and ``"42"`` match. One
+    instance is shared by request handlers and batch scoring threads; every
+    method holds a lock.
+
+    An alert is raised when the metric crosses the threshold, not on every
+    check while it stays there; the last ``max_alerts`` are kept.
+    """
+
+    def __init__(self, performance_threshold: float = 0.85, window_size: int = 1000,
+                 metric: str = "accuracy", n_bins: int = 100, n_calibration_bins: int = 10,
+                 min_samples: int = 100, max_pending: int = 100000, max_alerts: int = 100,
+                 on_alert: Optional[Callable[[Dict], None]] = None):
+        if metric not in MONITORED_METRICS:
+            raise ValueError(f"Unknown performance metric {metric!r}; expected one of {sorted(MONITORED_METRICS)}")
+        self.performance_threshold = performance_threshold
+        self.window_size = window_size
+        self.metric = metric
+        self.n_bins = n_bins
+        self.n_calibration_bins = n_calibration_bins
+        self.min_samples = min_samples
+        self.max_pending = max_pending
+        self.on_alert = on_alert
+
+        self.pending = OrderedDict()
+        self.window = deque()
+        self.confusion = np.zeros((2, 2), dtype=np.int64)  # [actual, predicted]
+        self.positive_hist = np.zeros(n_bins, dtype=np.int64)
+        self.negative_hist = np.zeros(n_bins, dtype=np.int64)
+        self.calibration_count = np.zeros(n_calibration_bins, dtype=np.int64)
+        self.calibration_prob = np.zeros(n_calibration_bins, dtype=np.float64)
+        self.calibration_pos = np.zeros(n_calibration_bins, dtype=np.int64)
+        self.alerts = deque(maxlen=max_alerts)
+        self.degraded = False
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_config(cls, config: MonitoringConfig, **kwargs) -> "PerformanceMonitor":
+        return cls(
+            performance_threshold=config.performance_threshold,
+            window_size=config.performance_window,
+            metric=config.performance_metric,
+            **kwargs
+        )
+
+    def record_prediction(self, customer_id, probability: float, prediction: int = None):
+        """Hold a served prediction until its label arrives"""
+        if prediction is None:
+            prediction = int(probability >= 0.5)
+        key = str(customer_id)
+        with self._lock:
+            self.pending[key] = (float(probability), int(prediction))
+            self.pending.move_to_end(key)
+            if len(self.pending) > self.max_pending:
+                self.pending.popitem(last=False)
+
+    def record_predictions(self, customer_ids: Iterable, probabilities: Iterable, predictions: Iterable):
+        """Hold a batch of served predictions; rows without a customer id are skipped"""
+        with self._lock:
+            for customer_id, probability, prediction in zip(customer_ids, probabilities, predictions):
+                if customer_id is not None:
+                    self.record_prediction(customer_id, probability, prediction)
+
+    def record_label(self, customer_id, label: int) -> bool:
+        """Join a ground-truth label to its prediction; returns False if unmatched"""
+        with self._lock:
+            entry = self.pending.pop(str(customer_id), None)
+            if entry is None:
+                return False
+            probability, prediction = entry
+            self._update(probability, prediction, int(label), 1)
+            self.window.append((probability, prediction, int(label)))
+            if len(self.window) > self.window_size:
+                self._update(*self.window.popleft(), -1)
+            return True
+
+    def record_labels(self, labels: Iterable[Tuple]) -> int:
+        """Join ``(customer_id, label)`` pairs; returns how many matched a prediction"""
+        with self._lock:
+            return sum(self.record_label(customer_id, label) for customer_id, label in labels)
+
+    def _update(self, probability: float, prediction: int, label: int, sign: int):
+        self.confusion[label, prediction] += sign
+        score_bin = min(int(probability * self.n_bins), self.n_bins - 1)
+        if label:
+            self.positive_hist[score_bin] += sign
+        else:
+            self.negative_hist[score_bin] += sign
+        calibration_bin = min(int(probability * self.n_calibration_bins), self.n_calibration_bins - 1)
+        self.calibration_count[calibration_bin] += sign
+        self.calibration_prob[calibration_bin] += sign * probability
+        self.calibration_pos[calibration_bin] += sign * label
+
+    def _auc(self) -> Optional[float]:
+        """AUC from binned score histograms; ties within a bin count half"""
+        positives = self.positive_hist.sum()
+        negatives = self.negative_hist.sum()
+        if positives == 0 or negatives == 0:
+            return None
+        positives_above = np.cumsum(self.positive_hist[::-1])[::-1] - self.positive_hist
+        pairs = self.negative_hist * (positives_above + 0.5 * self.positive_hist)
+        return float(pairs.sum() / (positives * negatives))
+
+    def metrics(self) -> Dict:
+        """Current window metrics"""
+        with self._lock:
+            return self._metrics()
+
+    def _metrics(self) -> Dict:
+        (tn, fp), (fn, tp) = self.confusion
+        total = int(self.confusion.sum())
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+
+        filled = self.calibration_count > 0
+        mean_prob = self.calibration_prob[filled] / self.calibration_count[filled]
+        churn_rate = self.calibration_pos[filled] / self.calibration_count[filled]
+        ece = float(np.sum(self.calibration_count[filled] * np.abs(mean_prob - churn_rate)) / total) if total else 0.0
+
+        return {
+            'samples': total,
+            'pending': len(self.pending),
+            'accuracy': float((tp + tn) / total) if total else 0.0,
+            'precision': float(precision),
+            'recall': float(recall),
+            'f1_score': float(2 * precision * recall / (precision + recall)) if precision + recall else 0.0,
+            'roc_auc': self._auc(),
+            'expected_calibration_error': ece,
+            'confusion_matrix': {'tn': int(tn), 'fp': int(fp), 'fn': int(fn), 'tp': int(tp)},
+            'calibration': {
+                'mean_probability': mean_prob.tolist(),
+                'churn_rate': churn_rate.tolist(),
+                'count': self.calibration_count[filled].tolist()
+            }
+        }
+
+    def recent_alerts(self, limit: int = 20) -> List[Dict]:
+        """Last ``limit`` alerts, oldest first"""
+        with self._lock:
+            return list(self.alerts)[-limit:]
+
+    def check_alerts(self) -> List[Dict]:
+        """Raise an alert when the monitored metric crosses to the wrong side of the threshold"""
+        higher_is_better = MONITORED_METRICS[self.metric]
+        with self._lock:
+            metrics = self._metrics()
+            value = metrics[self.metric]
+            if metrics['samples'] < self.min_samples or value is None:
+                return []
+            if higher_is_better:
+                breached = value < self.performance_threshold
+            else:
+                breached = value > self.performance_threshold
+            if not breached:
+                if self.degraded:
+                    self.degraded = False
+                    logger.info(f"Model performance recovered: {self.metric}={value:.4f}")
+                return []
+            if self.degraded:
+                return []
+
+            self.degraded = True
+            alert = {
+                'timestamp': datetime.now().isoformat(),
+                'metric': self.metric,
+                'value': value,
+                'threshold': self.performance_threshold,
+                'samples': metrics['samples']
+            }
+            self.alerts.append(alert)
+        logger.warning(
+            f"Model performance alert: {self.metric}={value:.4f} {'below' if higher_is_better else 'above'} "
+            f"threshold {self.performance_threshold}"
+        )
+        if self.on_alert is not None:
+            self.on_alert(alert)
+        return [alert]
@@ -0,0 +1,221 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional
+from src.config.configuration import AnalyticsConfig
+from src.data.feature_schema import FeatureSchema, FEATURE_SCHEMA
+from src.models.threshold_optimizer import RISK_LEVELS
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SEGMENT_FEATURES = ("contract_length", "payment_method", "internet_service")
+
+
+class PredictionAnalytics:
+    """Serving-side prediction aggregates in a ring of fixed-size time buckets.
+
+    Every served prediction adds to its bucket's counters: volume, predicted
+    churners, probability sum, risk-level counts, a probability histogram and
+    per-segment volume/churners/probability sums. The ring holds ``n_buckets``
+    buckets of ``bucket_seconds``; a slot is zeroed when time wraps back onto
+    it. Queries sum at most ``n_buckets`` rows, so their cost does not grow
+    with traffic.
+    """
+
+    def __init__(self, bucket_seconds: int = 3600, n_buckets: int = 168, n_bins: int = 20,
+                 schema: FeatureSchema = FEATURE_SCHEMA, segments=SEGMENT_FEATURES):
+        self.bucket_seconds = bucket_seconds
+        self.n_buckets = n_buckets
+        self.n_bins = n_bins
+        self.segments = list(segments)
+        # Declared values first; anything else lands in a trailing "other" slot
+        self.segment_values = {name: schema.vocabulary(name) for name in self.segments}
+        self.segment_index = {
+            name: {value: i for i, value in enumerate(values)} for name, values in self.segment_values.items()
+        }
+        self.segment_offsets = np.cumsum([0] + [len(values) + 1 for values in self.segment_values.values()])
+        self._lock = threading.Lock()
+
+        n_slots = int(self.segment_offsets[-1])
+        self.bucket_id = np.full(n_buckets, -1, dtype=np.int64)
+        self.count = np.zeros(n_buckets, dtype=np.int64)
+        self.churners = np.zeros(n_buckets, dtype=np.int64)
+        self.probability_sum = np.zeros(n_buckets, dtype=np.float64)
+        self.risk = np.zeros((n_buckets, len(RISK_LEVELS)), dtype=np.int64)
+        self.histogram = np.zeros((n_buckets, n_bins), dtype=np.int64)
+        self.segment_count = np.zeros((n_buckets, n_slots), dtype=np.int64)
+        self.segment_churners = np.zeros((n_buckets, n_slots), dtype=np.int64)
+        self.segment_probability = np.zeros((n_buckets, n_slots), dtype=np.float64)
+
+    @classmethod
+    def from_config(cls, config: AnalyticsConfig, **kwargs) -> "PredictionAnalytics":
+        analytics = cls(bucket_seconds=config.bucket_seconds, n_buckets=config.n_buckets,
+                        n_bins=config.n_bins, **kwargs)
+        if config.state_path and Path(config.state_path).exists():
+            analytics.load(config.state_path)
+        return analytics
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            'bucket_id': self.bucket_id, 'count': self.count, 'churners': self.churners,
+            'probability_sum': self.probability_sum, 'risk': self.risk, 'histogram': self.histogram,
+            'segment_count': self.segment_count, 'segment_churners': self.segment_churners,
+            'segment_probability': self.segment_probability,
+        }
+
+    def _slot(self, timestamp: Optional[float]) -> int:
+        """Ring slot for ``timestamp``, reset first if it still holds an older bucket"""
+        bucket = int((time.time() if timestamp is None else timestamp) // self.bucket_seconds)
+        slot = bucket % self.n_buckets
+        if self.bucket_id[slot] != bucket:
+            for array in self._arrays().values():
+                array[slot] = 0
+            self.bucket_id[slot] = bucket
+        return slot
+
+    def _segment_slots(self, name: str, values) -> np.ndarray:
+        index = self.segment_index[name]
+        other = len(index)
+        return self.segment_offsets[self.segments.index(name)] + np.fromiter(
+            (index.get(value, other) for value in values), dtype=np.int64, count=len(values)
+        )
+
+    def record(self, features: Dict, probability: float, prediction: int, risk_level: str,
+               timestamp: float = None):
+        """Add one served prediction"""
+        risk = RISK_LEVELS.index(risk_level)
+        score_bin = min(int(probability * self.n_bins), self.n_bins - 1)
+        slots = [
+            self.segment_offsets[i] + self.segment_index[name].get(features[name], len(self.segment_index[name]))
+            for i, name in enumerate(self.segments)
+        ]
+        with self._lock:
+            slot = self._slot(timestamp)
+            self.count[slot] += 1
+            self.churners[slot] += int(prediction)
+            self.probability_sum[slot] += probability
+            self.risk[slot, risk] += 1
+            self.histogram[slot, score_bin] += 1
+            self.segment_count[slot, slots] += 1
+            self.segment_churners[slot, slots] += int(prediction)
+            self.segment_probability[slot, slots] += probability
+
+    def record_batch(self, features: pd.DataFrame, probabilities, predictions, risk_levels,
+                     timestamp: float = None):
+        """Add a batch of served predictions with a few vectorized updates"""
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        predictions = np.asarray(predictions, dtype=np.int64)
+        risk = pd.Categorical(risk_levels, categories=RISK_LEVELS).codes.astype(np.int64)
+        bins = np.minimum((probabilities * self.n_bins).astype(np.int64), self.n_bins - 1)
+        slots = np.concatenate([self._segment_slots(name, features[name].tolist()) for name in self.segments])
+        repeated = len(self.segments)
+        with self._lock:
+            slot = self._slot(timestamp)
+            self.count[slot] += len(probabilities)
+            self.churners[slot] += int(predictions.sum())
+            self.probability_sum[slot] += float(probabilities.sum())
+            self.risk[slot] += np.bincount(risk, minlength=len(RISK_LEVELS))
+            self.histogram[slot] += np.bincount(bins, minlength=self.n_bins)
+            n_slots = self.segment_count.shape[1]
+            self.segment_count[slot] += np.bincount(slots, minlength=n_slots)
+            self.segment_churners[slot] += np.bincount(slots, weights=np.tile(predictions, repeated),
+                                                       minlength=n_slots).astype(np.int64)
+            self.segment_probability[slot] += np.bincount(slots, weights=np.tile(probabilities, repeated),
+                                                          minlength=n_slots)
+
+    def _live(self, window: int = None, now: float = None) -> np.ndarray:
+        """Slots holding the latest ``window`` buckets (all retained buckets by default)"""
+        current = int((time.time() if now is None else now) // self.bucket_seconds)
+        window = self.n_buckets if window is None else min(window, self.n_buckets)
+        return (self.bucket_id > current - window) & (self.bucket_id <= current)
+
+    def summary(self, window: int = None) -> Dict:
+        with self._lock:
+            live = self._live(window)
+            total = int(self.count[live].sum())
+            churners = int(self.churners[live].sum())
+            probability_sum = float(self.probability_sum[live].sum())
+            high = int(self.risk[live, RISK_LEVELS.index("High")].sum())
+        return {
+            'total_predictions': total,
+            'predicted_churners': churners,
+            'predicted_churn_rate': churners / total if total else 0.0,
+            'mean_churn_probability': probability_sum / total if total else 0.0,
+            'high_risk_predictions': high,
+            'window_seconds': min(window or self.n_buckets, self.n_buckets) * self.bucket_seconds,
+        }
+
+    def risk_distribution(self, window: int = None) -> Dict:
+        with self._lock:
+            counts = self.risk[self._live(window)].sum(axis=0)
+        total = int(counts.sum())
+        return {
+            level: {'count': int(count), 'share': count / total if total else 0.0}
+            for level, count in zip(RISK_LEVELS, counts)
+        }
+
+    def probability_histogram(self, window: int = None) -> Dict:
+        with self._lock:
+            counts = self.histogram[self._live(window)].sum(axis=0)
+        return {'bin_edges': np.linspace(0, 1, self.n_bins + 1).tolist(), 'counts': counts.tolist()}
+
+    def segment_rates(self, window: int = None) -> Dict:
+        """Volume, predicted churn rate and mean probability per segment value"""
+        with self._lock:
+            live = self._live(window)
+            count = self.segment_count[live].sum(axis=0)
+            churners = self.segment_churners[live].sum(axis=0)
+            probability = self.segment_probability[live].sum(axis=0)
+        result = {}
+        for i, name in enumerate(self.segments):
+            start, stop = self.segment_offsets[i], self.segment_offsets[i + 1]
+            values = [str(value) for value in self.segment_values[name]] + ["other"]
+            result[name] = {
+                value: {
+                    'count': int(n),
+                    'predicted_churn_rate': float(c / n) if n else 0.0,
+                    'mean_churn_probability': float(p / n) if n else 0.0,
+                }
+                for value, n, c, p in zip(values, count[start:stop], churners[start:stop], probability[start:stop])
+                if n or value != "other"
+            }
+        return result
+
+    def volume(self, window: int = None) -> List[Dict]:
+        """Predictions per bucket, oldest first, including empty buckets"""
+        current = int(time.time() // self.bucket_seconds)
+        window = self.n_buckets if window is None else min(window, self.n_buckets)
+        buckets = np.arange(current - window + 1, current + 1)
+        with self._lock:
+            slots = buckets % self.n_buckets
+            present = self.bucket_id[slots] == buckets
+            count = np.where(present, self.count[slots], 0)
+            churners = np.where(present, self.churners[slots], 0)
+        return [
+            {'bucket_start': int(bucket * self.bucket_seconds), 'predictions': int(n), 'predicted_churners': int(c)}
+            for bucket, n, c in zip(buckets, count, churners)
+        ]
+
+    def save(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            with open(path, "wb") as f:
+                np.savez(f, bucket_seconds=self.bucket_seconds, **self._arrays())
+        logger.info(f"Prediction analytics saved to {path}")
+
+    def load(self, path: str):
+        """Restore saved buckets; ignored if the bucket layout has changed"""
+        with np.load(path) as state:
+            arrays = self._arrays()
+            if int(state['bucket_seconds']) != self.bucket_seconds or any(
+                state[name].shape != array.shape for name, array in arrays.items()
+            ):
+                logger.warning(f"Ignoring analytics state at {path}: bucket layout changed")
+                return
+            with self._lock:
+                for name, array in arrays.items():
+                    array[...] = state[name]
+        logger.info(f"Prediction analytics restored from {path}")
@@ -0,0 +1,199 @@
+"""Serving-side profiling: a sampling profiler and per-request phase traces.
+
+``SamplingProfiler`` samples every thread's Python stack from a background
+thread (``sys._current_frames``) for a fixed time and returns the collapsed
+stacks flamegraph tools read (``flamegraph.pl``, speedscope).
+
+``RequestTrace`` splits one request into consecutive phases (``receive``,
+``validation``, ``dataframe``, ``transform``, ``predict_proba``,
+``postprocess``, ``serialization``). Code on the hot path calls ``phase`` to
+close the running phase and open the next. That is a context-variable lookup
+and a clock read, and nothing at all outside a traced request. Finished
+traces are offered to a ``TraceBuffer``, which keeps the slow ones (tail
+sampling) in a ring buffer.
+
+Each trace also records the net number of memory blocks the request left
+allocated (``sys.getallocatedblocks``, a counter read). While ``tracemalloc``
+is running it also records the request's peak and retained Python
+allocations. The tracemalloc peak is process-wide, so concurrent requests
+blur each other's numbers.
+"""
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from src.config.configuration import ProfilingConfig
+
+current_trace: ContextVar[Optional["RequestTrace"]] = ContextVar("current_trace", default=None)
+
+# Leaf frames of threads parked waiting for work
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("socket.py", "accept"),
+}
+
+
+class RequestTrace:
+    """Wall time of one request, split into named consecutive phases"""
+
+    __slots__ = ("method", "path", "status", "started_at", "duration_ms", "phases", "allocations",
+                 "_start", "_phase", "_phase_start", "_blocks", "_traced")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.status = None
+        self.started_at = time.time()
+        self.duration_ms = None
+        self.phases: Dict[str, float] = {}
+        self.allocations: Dict[str, float] = {}
+        self._blocks = sys.getallocatedblocks()
+        self._traced = None
+        if tracemalloc.is_tracing():
+            self._traced = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._start = self._phase_start = time.perf_counter()
+        self._phase = "receive"
+
+    def phase(self, name: Optional[str]):
+        """Close the running phase and start ``name``; repeated phases accumulate"""
+        now = time.perf_counter()
+        self.phases[self._phase] = self.phases.get(self._phase, 0.0) + (now - self._phase_start) * 1000
+        self._phase, self._phase_start = name, now
+
+    def finish(self, status: int):
+        self.phase(None)
+        self.status = status
+        self.duration_ms = (self._phase_start - self._start) * 1000
+        self.allocations['retained_blocks'] = sys.getallocatedblocks() - self._blocks
+        if self._traced is not None and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            self.allocations['peak_kb'] = round((peak - self._traced) / 1024, 1)
+            self.allocations['retained_kb'] = round((current - self._traced) / 1024, 1)
+
+    def to_dict(self) -> Dict:
+        return {
+            'method': self.method,
+            'path': self.path,
+            'status': self.status,
+            'started_at': self.started_at,
+            'duration_ms': round(self.duration_ms, 3),
+            'phases': {name: round(ms, 3) for name, ms in self.phases.items()},
+            'allocations': self.allocations,
+        }
+
+
+def phase(name: str):
+    """Start phase ``name`` of the current request's trace, if it is being traced"""
+    trace = current_trace.get()
+    if trace is not None:
+        trace.phase(name)
+
+
+class TraceBuffer:
+    """Ring buffer of finished traces, kept if slow or by random sampling"""
+
+    def __init__(self, capacity: int = 200, slow_request_ms: float = 250.0, sample_rate: float = 0.0):
+        self.slow_request_ms = slow_request_ms
+        self.sample_rate = sample_rate
+        self.traces = deque(maxlen=capacity)
+        self.seen = 0
+        self.kept = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: ProfilingConfig) -> "TraceBuffer":
+        return cls(capacity=config.trace_capacity, slow_request_ms=config.slow_request_ms,
+                   sample_rate=config.trace_sample_rate)
+
+    def offer(self, trace: RequestTrace) -> bool:
+        """Keep ``trace`` if it was slow (or sampled); the decision is made once it has finished"""
+        keep = trace.duration_ms >= self.slow_request_ms or (
+            self.sample_rate > 0 and random.random() < self.sample_rate
+        )
+        with self._lock:
+            self.seen += 1
+            if keep:
+                self.kept += 1
+                self.traces.append(trace)
+        return keep
+
+    def recent(self, limit: int = None) -> List[Dict]:
+        """Kept traces, newest first"""
+        with self._lock:
+            traces = list(self.traces)
+        traces.reverse()
+        return [trace.to_dict() for trace in traces[:limit]]
+
+    def stats(self) -> Dict:
+        return {
+            'seen': self.seen,
+            'kept': self.kept,
+            'buffered': len(self.traces),
+            'slow_request_ms': self.slow_request_ms,
+            'sample_rate': self.sample_rate,
+        }
+
+
+class SamplingProfiler:
+    """Statistical profiler over all threads, producing collapsed stacks.
+
+    Each sample walks every other thread's current frame chain, so the cost
+    is paid by the sampling thread while the profile runs and is zero
+    otherwise. Threads parked in ``IDLE_FRAMES`` are skipped unless
+    ``include_idle`` is set.
+    """
+
+    def __init__(self, interval: float = 0.005, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.stacks = Counter()
+        self.samples = 0
+        self._labels = {}
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename.replace("\\", "/")
+            # Last two path components: enough to tell package modules apart
+            short = "/".join(filename.rsplit("/", 2)[-2:])
+            label = self._labels[code] = f"{code.co_name} ({short}:{code.co_firstlineno})"
+        return label
+
+    def _is_idle(self, frame) -> bool:
+        filename = frame.f_code.co_filename.replace("\\", "/").rsplit("/", 1)[-1]
+        return (filename, frame.f_code.co_name) in IDLE_FRAMES
+
+    def sample(self, skip: int = None):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == skip or (not self.include_idle and self._is_idle(frame)):
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(self._label(frame.f_code))
+                frame = frame.f_back
+            labels.append(names.get(ident, str(ident)))
+            labels.reverse()
+            self.stacks[";".join(labels)] += 1
+        self.samples += 1
+
+    def run(self, seconds: float) -> "SamplingProfiler":
+        """Sample every ``interval`` for ``seconds``, from the calling thread"""
+        own = threading.get_ident()
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            self.sample(skip=own)
+            time.sleep(self.interval)
+        return self
+
+    def collapsed(self) -> str:
+        """One ``frame;frame;... count`` line per distinct stack, root first"""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import kstwo
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from src.data.feature_schema import FeatureSchema, FEATURE_SCHEMA
+from src.utils.common import save_json, load_json
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def _weighted_quantiles(values: np.ndarray, weights: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Quantiles of weighted values; equal weights give ``np.quantile``'s linear interpolation"""
+    order = np.argsort(values, kind='stable')
+    values, weights = values[order], weights[order]
+    cumulative = np.cumsum(weights) - weights[0]
+    if cumulative[-1] <= 0:
+        return np.full(len(q), values[-1])
+    return np.interp(q, cumulative / cumulative[-1], values)
+
+
+def _numeric_summary(values: np.ndarray, n_quantiles: int, n_bins: int,
+                     weights: np.ndarray = None) -> Dict:
+    """Quantile sketch, histogram and moments of a numeric array.
+
+    With ``weights`` (e.g. inverse sampling rates) counts and statistics describe
+    the reweighted population rather than the rows present.
+    """
+    weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=np.float64)
+    present = ~np.isnan(values)
+    missing = int(round(weights[~present].sum()))
+    values, weights = values[present], weights[present]
+    if len(values) == 0:
+        return {'count': 0, 'missing': missing, 'quantiles': [], 'histogram': {'edges': [], 'counts': []}}
+
+    quantile_levels = np.linspace(0, 1, n_quantiles)
+    counts, edges = np.histogram(values, bins=n_bins, weights=weights)
+    mean = np.average(values, weights=weights)
+    return {
+        'count': int(round(weights.sum())),
+        'missing': missing,
+        'mean': float(mean),
+        'std': float(np.sqrt(np.average((values - mean) ** 2, weights=weights))),
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'quantiles': _weighted_quantiles(values, weights, quantile_levels).tolist(),
+        'histogram': {'edges': edges.tolist(), 'counts': np.round(counts).astype(np.int64).tolist()}
+    }
+
+
+def _category_counts(values: pd.Series, weights: np.ndarray) -> Dict[str, int]:
+    """Weighted count per category, most frequent first"""
+    counts = pd.Series(weights, index=values.index).groupby(values).sum().sort_values(ascending=False)
+    return {str(k): int(round(v)) for k, v in counts.items()}
+
+
+def _sketch_cdf(quantiles: list) -> Callable:
+    """Right-continuous CDF interpolated from an evenly spaced quantile sketch.
+
+    Repeated quantiles (discrete features) become jumps, so ties are handled the
+    same way as an empirical CDF.
+    """
+    xp = np.asarray(quantiles, dtype=np.float64)
+    fp = np.linspace(0, 1, len(xp))
+
+    def cdf(x):
+        x = np.asarray(x, dtype=np.float64)
+        idx = np.clip(np.searchsorted(xp, x, side='right') - 1, 0, len(xp) - 1)
+        nxt = np.minimum(idx + 1, len(xp) - 1)
+        span = xp[nxt] - xp[idx]
+        frac = np.where(span > 0, (x - xp[idx]) / np.where(span > 0, span, 1), 0.0)
+        values = fp[idx] + frac * (fp[nxt] - fp[idx])
+        return np.where(x < xp[0], 0.0, np.where(x >= xp[-1], 1.0, values))
+
+    return cdf
+
+
+def _ks_against_summary(summary: Dict, values: np.ndarray):
+    """Two-sample KS test of ``values`` against a profiled distribution.
+
+    The statistic is evaluated on the pooled support as in ``ks_2samp`` and the
+    p-value uses the asymptotic distribution with the reference row count.
+    """
+    values = np.sort(np.asarray(values, dtype=np.float64))
+    values = values[~np.isnan(values)]
+    n, m = len(values), summary.get('count', 0)
+    if n == 0 or m == 0:
+        return 0.0, 1.0
+
+    support = np.concatenate([values, np.asarray(summary['quantiles'], dtype=np.float64)])
+    current_cdf = np.searchsorted(values, support, side='right') / n
+    statistic = float(np.max(np.abs(_sketch_cdf(summary['quantiles'])(support) - current_cdf)))
+    p_value = float(kstwo.sf(statistic, np.round(m * n / (m + n))))
+    return statistic, p_value
+
+
+class ReferenceProfile:
+    """Compact summary of the training data used as the monitoring baseline"""
+
+    def __init__(self, numeric: Dict, categorical: Dict, scores: Optional[Dict] = None,
+                 n_rows: int = 0):
+        self.numeric = numeric
+        self.categorical = categorical
+        self.scores = scores
+        self.n_rows = n_rows
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, scores: np.ndarray = None,
+                   schema: FeatureSchema = FEATURE_SCHEMA,
+                   n_quantiles: int = 101, n_bins: int = 20,
+                   sample_weight: np.ndarray = None) -> "ReferenceProfile":
+        """Build a profile from a training frame and optional holdout scores.
+
+        ``sample_weight`` undoes sampling of the training frame (e.g. negative
+        downsampling), so the profile matches the population served in production.
+        """
+        weights = np.ones(len(df)) if sample_weight is None else np.asarray(sample_weight, dtype=np.float64)
+        numeric = {
+            col: _numeric_summary(df[col].to_numpy(dtype=np.float64), n_quantiles, n_bins, weights)
+            for col in schema.numeric_features if col in df.columns
+        }
+        categorical = {
+            col: _category_counts(df[col], weights)
+            for col in schema.categorical_features if col in df.columns
+        }
+        score_summary = None
+        if scores is not None:
+            score_summary = _numeric_summary(np.asarray(scores, dtype=np.float64), n_quantiles, n_bins)
+        return cls(numeric, categorical, score_summary, n_rows=int(round(weights.sum())))
+
+    def has_feature(self, column: str) -> bool:
+        return column in self.numeric or column in self.categorical
+
+    def numeric_cdf(self, column: str) -> Callable:
+        """Reference CDF of a numeric feature"""
+        return _sketch_cdf(self.numeric[column]['quantiles'])
+
+    def ks_test(self, column: str, values: np.ndarray):
+        """KS statistic and p-value of ``values`` against a numeric feature"""
+        return _ks_against_summary(self.numeric[column], values)
+
+    def score_ks_test(self, probabilities: np.ndarray):
+        """KS statistic and p-value of live scores against the holdout scores"""
+        return _ks_against_summary(self.scores, probabilities)
+
+    def category_counts(self, column: str) -> Dict[str, int]:
+        return self.categorical[column]
+
+    def to_dict(self) -> Dict:
+        return {
+            'n_rows': self.n_rows,
+            'numeric': self.numeric,
+            'categorical': self.categorical,
+            'scores': self.scores
+        }
+
+    def save(self, path: str = "artifacts/reference_profile.json") -> str:
+        """Save profile as JSON"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        save_json(path, self.to_dict())
+        logger.info(f"Reference profile saved to {path}")
+        return path
+
+    @classmethod
+    def load(cls, path: str = "artifacts/reference_profile.json") -> "ReferenceProfile":
+        """Load profile from JSON"""
+        data = load_json(path)
+        return cls(data['numeric'], data['categorical'], data.get('scores'), data.get('n_rows', 0))
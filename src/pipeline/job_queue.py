@@ -0,0 +1,437 @@
+"""Asynchronous batch scoring jobs backed by SQLite.
+
+A job scores a CSV/Parquet file (or directory of shards) in chunks. Each
+scored chunk is written atomically as ``part-XXXXX`` under the job directory
+and checkpointed in the ``chunks`` table, so a worker that dies mid-job is
+replaced by one that skips the finished chunks. A worker heartbeats from a
+background thread for as long as it holds a job, so slow row counts and slow
+chunks keep it; a running job whose heartbeat is older than
+``heartbeat_timeout`` is claimable again. Updates are guarded by the owning
+worker id, so a worker whose job was reclaimed stops instead of finishing it.
+When every chunk is done the parts are combined into one result file.
+
+Workers run as threads inside the API process or standalone:
+
+    python -m src.pipeline.job_queue --workers 2
+"""
+import argparse
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config.configuration import ConfigurationManager, JobsConfig
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.utils.common import iter_data, list_data_files
+from src.utils.concurrency import ThreadBudget
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+OUTPUT_FORMATS = ("parquet", "csv")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    input_path TEXT NOT NULL,
+    output_format TEXT NOT NULL,
+    total_rows INTEGER,
+    rows_done INTEGER NOT NULL DEFAULT 0,
+    chunks_done INTEGER NOT NULL DEFAULT 0,
+    result_path TEXT,
+    error TEXT,
+    worker_id TEXT,
+    heartbeat_at REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    job_id TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    row_start INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    PRIMARY KEY (job_id, chunk_index)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+"""
+
+
+def count_rows(path: str) -> int:
+    """Row count from Parquet metadata or by counting CSV newlines"""
+    total = 0
+    for file in list_data_files(path):
+        if file.endswith(".parquet"):
+            total += pq.ParquetFile(file).metadata.num_rows
+        else:
+            with open(file, "rb") as f:
+                newlines, last = 0, b"\n"
+                while block := f.read(1 << 24):
+                    newlines += block.count(b"\n")
+                    last = block[-1:]
+            # One header line; the last row may lack a trailing newline
+            total += max(newlines - (last == b"\n"), 0)
+    return total
+
+
+class JobStore:
+    """Job records and chunk checkpoints in a SQLite database"""
+
+    def __init__(self, config: JobsConfig):
+        self.config = config
+        self.jobs_dir = Path(config.jobs_dir)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.jobs_dir / "jobs.db"
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def job_dir(self, job_id: str) -> Path:
+        return self.jobs_dir / job_id
+
+    def resolve_input(self, input_path: str) -> str:
+        """Absolute input path, which must exist inside one of ``allowed_input_dirs``"""
+        path = Path(input_path).resolve()
+        allowed = [Path(root).resolve() for root in self.config.allowed_input_dirs]
+        allowed.append((self.jobs_dir / "uploads").resolve())
+        if not any(path.is_relative_to(root) for root in allowed):
+            raise ValueError(f"Input path must be inside one of: {', '.join(self.config.allowed_input_dirs)}")
+        if not path.exists():
+            raise ValueError(f"Input path does not exist: {input_path}")
+        return str(path)
+
+    def create(self, input_path: str, output_format: str = "parquet", job_id: str = None) -> Dict:
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        input_path = self.resolve_input(input_path)
+        job_id = job_id or uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, input_path, output_format, created_at, updated_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, input_path, output_format, now, now)
+            )
+        logger.info(f"Queued scoring job {job_id} for {input_path}")
+        return self.get(job_id)
+
+    def upload_path(self, job_id: str, suffix: str) -> Path:
+        path = self.jobs_dir / "uploads" / f"{job_id}{suffix}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['progress'] = job['rows_done'] / job['total_rows'] if job['total_rows'] else 0.0
+        return job
+
+    def list_jobs(self, limit: int = 100) -> List[Dict]:
+        with self._connect() as conn:
+            ids = [row['id'] for row in conn.execute(
+                "SELECT id FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            )]
+        return [self.get(job_id) for job_id in ids]
+
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        """Take the oldest queued job, or a running one whose worker stopped heartbeating"""
+        now = time.time()
+        stale = now - self.config.heartbeat_timeout
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' OR (status = 'running' AND heartbeat_at < ?) "
+                "ORDER BY created_at LIMIT 1", (stale,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker_id = ?, heartbeat_at = ?, updated_at = ? WHERE id = ?",
+                (worker_id, now, now, row['id'])
+            )
+            conn.execute("COMMIT")
+        return self.get(row['id'])
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Keep a running job claimed; False once another worker owns it"""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET heartbeat_at = ?, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = 'running'",
+                (now, now, job_id, worker_id)
+            )
+        return cursor.rowcount > 0
+
+    def set_total_rows(self, job_id: str, worker_id: str, total_rows: int) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET total_rows = ? WHERE id = ? AND worker_id = ?", (total_rows, job_id, worker_id)
+            )
+        return cursor.rowcount > 0
+
+    def chunks(self, job_id: str) -> List[Dict]:
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(
+                "SELECT chunk_index, row_start, rows FROM chunks WHERE job_id = ? ORDER BY chunk_index", (job_id,)
+            )]
+
+    def checkpoint(self, job_id: str, worker_id: str, chunk_index: int, row_start: int, rows: int):
+        """Record a finished chunk and advance progress"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR IGNORE INTO chunks (job_id, chunk_index, row_start, rows) VALUES (?, ?, ?, ?)",
+                (job_id, chunk_index, row_start, rows)
+            )
+            conn.execute(
+                "UPDATE jobs SET rows_done = (SELECT COALESCE(SUM(rows), 0) FROM chunks WHERE job_id = ?), "
+                "chunks_done = (SELECT COUNT(*) FROM chunks WHERE job_id = ?), "
+                "heartbeat_at = ?, updated_at = ? WHERE id = ? AND worker_id = ?",
+                (job_id, job_id, now, now, job_id, worker_id)
+            )
+            conn.execute("COMMIT")
+
+    def release(self, job_id: str, worker_id: str):
+        """Hand a running job back to the queue; its checkpoints are kept"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', worker_id = NULL, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = 'running'",
+                (time.time(), job_id, worker_id)
+            )
+
+    def finish(self, job_id: str, worker_id: str, status: str, result_path: str = None, error: str = None) -> bool:
+        """Mark a running job completed or failed; False (and no change) if ``worker_id`` no longer owns it"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result_path = ?, error = ?, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = 'running'",
+                (status, result_path, error, time.time(), job_id, worker_id)
+            )
+        return cursor.rowcount > 0
+
+    def read_results(self, job_id: str, offset: int = 0, limit: int = 1000) -> pd.DataFrame:
+        """Rows ``[offset, offset + limit)`` of the scored output, read from the chunk parts"""
+        job = self.get(job_id)
+        frames = []
+        for chunk in self.chunks(job_id):
+            start, stop = chunk['row_start'], chunk['row_start'] + chunk['rows']
+            if stop <= offset or start >= offset + limit:
+                continue
+            part = self.job_dir(job_id) / f"part-{chunk['chunk_index']:05d}.{job['output_format']}"
+            df = pd.read_parquet(part) if job['output_format'] == "parquet" else pd.read_csv(part)
+            frames.append(df.iloc[max(offset - start, 0):offset + limit - start])
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+class BatchScoringWorker:
+    """Claims jobs from a ``JobStore`` and scores them chunk by chunk"""
+
+    def __init__(self, store: JobStore, prediction_pipeline, worker_id: str = None, monitor=None):
+        self.store = store
+        self.prediction_pipeline = prediction_pipeline
+        # Optional PerformanceMonitor holding scored customers for their delayed labels
+        self.monitor = monitor
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.stop_event = threading.Event()
+
+    def score_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        features = FEATURE_SCHEMA.select(chunk)
+        predictions, probabilities = self.prediction_pipeline.predict(features)
+        scored = pd.DataFrame({
+            'churn_prediction': np.asarray(predictions, dtype=np.int64),
+            'churn_probability': probabilities,
+            'risk_level': self.prediction_pipeline.decision_policy.risk_levels(probabilities),
+        })
+        if FEATURE_SCHEMA.id_column in chunk.columns:
+            scored.insert(0, FEATURE_SCHEMA.id_column, chunk[FEATURE_SCHEMA.id_column].to_numpy())
+            if self.monitor is not None:
+                self.monitor.record_predictions(
+                    scored[FEATURE_SCHEMA.id_column], scored['churn_probability'], scored['churn_prediction']
+                )
+        return scored
+
+    def _write_part(self, df: pd.DataFrame, path: Path, output_format: str):
+        # Write then rename so a crash never leaves a partial part behind
+        tmp_path = path.with_name(path.name + ".tmp")
+        if output_format == "parquet":
+            df.to_parquet(tmp_path, index=False)
+        else:
+            df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def _combine(self, job: Dict) -> str:
+        """Concatenate the parts into ``result.<format>`` without loading them all at once"""
+        job_dir = self.store.job_dir(job['id'])
+        output_format = job['output_format']
+        parts = [job_dir / f"part-{chunk['chunk_index']:05d}.{output_format}" for chunk in self.store.chunks(job['id'])]
+        result_path = job_dir / f"result.{output_format}"
+        tmp_path = result_path.with_name(result_path.name + ".tmp")
+        if output_format == "parquet":
+            writer = None
+            for part in parts:
+                table = pq.read_table(part)
+                writer = writer or pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+            if writer is None:
+                pq.write_table(pa.table({}), tmp_path)
+            else:
+                writer.close()
+        else:
+            with open(tmp_path, "wb") as out:
+                for i, part in enumerate(parts):
+                    with open(part, "rb") as f:
+                        if i:
+                            f.readline()  # header
+                        while block := f.read(1 << 24):
+                            out.write(block)
+        os.replace(tmp_path, result_path)
+        return str(result_path)
+
+    def _heartbeat(self, job_id: str, done: threading.Event, lost: threading.Event):
+        # A third of the timeout leaves room for two missed beats before the job looks stale
+        interval = max(self.store.config.heartbeat_timeout / 3, 0.01)
+        while not done.wait(interval):
+            if not self.store.heartbeat(job_id, self.worker_id):
+                lost.set()
+                return
+
+    def process(self, job: Dict):
+        job_id = job['id']
+        done, lost = threading.Event(), threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job_id, done, lost), name=f"heartbeat-{job_id[:8]}", daemon=True
+        )
+        heartbeat.start()
+        try:
+            self._process(job, lost)
+        finally:
+            done.set()
+            heartbeat.join()
+
+    def _process(self, job: Dict, lost: threading.Event):
+        job_id = job['id']
+        job_dir = self.store.job_dir(job_id)
+        job_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            if job['total_rows'] is None:
+                self.store.set_total_rows(job_id, self.worker_id, count_rows(job['input_path']))
+            done = {chunk['chunk_index'] for chunk in self.store.chunks(job_id)}
+            if done:
+                logger.info(f"Resuming job {job_id} with {len(done)} chunks already scored")
+
+            dtypes = FEATURE_SCHEMA.dtypes()
+            row_start = 0
+            chunks = iter_data(job['input_path'], self.store.config.chunk_size, dtype=dtypes)
+            for chunk_index, chunk in enumerate(chunks):
+                if lost.is_set():
+                    logger.warning(f"Job {job_id} was reclaimed by another worker; stopping")
+                    return
+                if self.stop_event.is_set():
+                    # Stopped between chunks: requeue so another worker resumes right away
+                    self.store.release(job_id, self.worker_id)
+                    logger.info(f"Released job {job_id} after {chunk_index} chunks")
+                    return
+                if chunk_index not in done:
+                    part = job_dir / f"part-{chunk_index:05d}.{job['output_format']}"
+                    self._write_part(self.score_chunk(chunk), part, job['output_format'])
+                    self.store.checkpoint(job_id, self.worker_id, chunk_index, row_start, len(chunk))
+                row_start += len(chunk)
+
+            if lost.is_set():
+                logger.warning(f"Job {job_id} was reclaimed by another worker; stopping")
+                return
+            result_path = self._combine(job)
+            if self.store.finish(job_id, self.worker_id, "completed", result_path=result_path):
+                logger.info(f"Job {job_id} completed: {row_start} rows scored")
+            else:
+                logger.warning(f"Job {job_id} was reclaimed by another worker before it completed")
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            if not self.store.finish(job_id, self.worker_id, "failed", error=str(e)):
+                logger.warning(f"Job {job_id} is owned by another worker; not marking it failed")
+
+    def run_once(self) -> bool:
+        """Process one job if any is claimable; returns whether one was processed"""
+        job = self.store.claim(self.worker_id)
+        if job is None:
+            return False
+        self.process(job)
+        return True
+
+    def run(self):
+        while not self.stop_event.is_set():
+            if not self.run_once():
+                self.stop_event.wait(self.store.config.poll_interval)
+
+    def stop(self):
+        self.stop_event.set()
+
+
+class JobWorkerPool:
+    """Worker threads sharing one prediction pipeline"""
+
+    def __init__(self, store: JobStore, prediction_pipeline, n_workers: int = 1, monitor=None):
+        self.workers = [BatchScoringWorker(store, prediction_pipeline, monitor=monitor) for _ in range(n_workers)]
+        self.threads = []
+
+    def start(self):
+        for i, worker in enumerate(self.workers):
+            thread = threading.Thread(target=worker.run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        logger.info(f"Started {len(self.workers)} batch scoring worker(s)")
+
+    def stop(self, timeout: float = None):
+        for worker in self.workers:
+            worker.stop()
+        for thread in self.threads:
+            thread.join(timeout)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Run batch scoring job workers")
+    parser.add_argument("--workers", type=int, help="Worker threads (defaults to jobs.n_workers)")
+    args = parser.parse_args(argv)
+
+    from src.pipeline.prediction_pipeline import PredictionPipeline
+
+    config_manager = ConfigurationManager()
+    config = config_manager.get_jobs_config()
+    logger.info(f"Job queue config: {asdict(config)}")
+    n_workers = args.workers or config.n_workers
+    budget = ThreadBudget.for_scoring(config_manager.get_concurrency_config(), n_workers).apply()
+    prediction_pipeline = PredictionPipeline(n_jobs=budget.threads)
+    budget.report(prediction_pipeline.model)
+    pool = JobWorkerPool(JobStore(config), prediction_pipeline, n_workers)
+    pool.start()
+    try:
+        while any(thread.is_alive() for thread in pool.threads):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,33 @@
+import hashlib
 import joblib
 import pandas as pd
 from src.utils.logger import setup_logger
+from src.utils.concurrency import set_n_jobs
+from src.utils.memory import track_memory
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.models.explainer import ModelExplainer
+from src.monitoring.profiling import phase
+from src.models.score_table import ScoreTable
+from src.models.threshold_optimizer import DecisionPolicy
 from pathlib import Path
 
 logger = setup_logger(__name__)
 
 class PredictionPipeline:
+    decision_policy = DecisionPolicy()
+    explainer = None
+    score_table = None
+    artifact_memory = None
+    _model_version = None
+
     def __init__(self, model_path: str = "artifacts/model.pkl", 
-                 preprocessor_path: str = "artifacts/preprocessor.pkl"):
+                 preprocessor_path: str = "artifacts/preprocessor.pkl",
+                 score_table: bool = False, n_jobs: int = None):
         self.model_path = model_path
         self.preprocessor_path = preprocessor_path
+        self.use_score_table = score_table
+        # Threads the model may use per prediction; None keeps what it was trained with
+        self.n_jobs = n_jobs
         self.model = None
         self.preprocessor = None
         self._load_artifacts()
@@ -18,9 +36,23 @@ class PredictionPipeline:
         """Load model and preprocessor"""
         try:
             if Path(self.model_path).exists() and Path(self.preprocessor_path).exists():
-                self.model = joblib.load(self.model_path)
-                self.preprocessor = joblib.load(self.preprocessor_path)
-                logger.info("Model and preprocessor loaded successfully")
+                # Memory still held after each load is the artifact's in-memory size
+                with track_memory() as model_memory:
+                    self.model = joblib.load(self.model_path)
+                with track_memory() as preprocessor_memory:
+                    self.preprocessor = joblib.load(self.preprocessor_path)
+                self.artifact_memory = {
+                    'model_mb': model_memory['retained_mb'],
+                    'preprocessor_mb': preprocessor_memory['retained_mb'],
+                }
+                self.decision_policy = DecisionPolicy.from_model(self.model)
+                if self.n_jobs is not None:
+                    set_n_jobs(self.model, self.n_jobs, only_parallel=True)
+                if self.use_score_table:
+                    with track_memory() as table_memory:
+                        self.score_table = ScoreTable.build(self.model, self.preprocessor)
+                    self.artifact_memory['score_table_mb'] = table_memory['retained_mb']
+                logger.info(f"Model and preprocessor loaded successfully: {self.artifact_memory}")
             else:
                 logger.warning("Model artifacts not found. Please train the model first.")
                 raise FileNotFoundError("Model artifacts not found")
@@ -28,15 +60,28 @@ class PredictionPipeline:
             logger.error(f"Error loading artifacts: {str(e)}")
             raise e
     
+    @property
+    def model_version(self) -> str:
+        """Short content hash of the model artifact, identifying the model that scored a row"""
+        if self._model_version is None:
+            digest = hashlib.sha256()
+            with open(self.model_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+            self._model_version = digest.hexdigest()[:12]
+        return self._model_version
+    
     def predict(self, features: pd.DataFrame):
         """Make predictions on new data"""
         try:
             # Transform features
+            phase("transform")
             features_transformed = self.preprocessor.transform(features)
             
-            # Make predictions
-            predictions = self.model.predict(features_transformed)
+            # Make predictions; labels use the tuned decision threshold
+            phase("predict_proba")
             probabilities = self.model.predict_proba(features_transformed)[:, 1]
+            predictions = self.decision_policy.predict(probabilities)
             
             return predictions, probabilities
             
@@ -44,10 +89,29 @@ class PredictionPipeline:
             logger.error(f"Error in prediction: {str(e)}")
             raise e
     
+    def explain(self, features: pd.DataFrame):
+        """Probability and per-feature contributions for each row"""
+        try:
+            # Built on first use; raises ValueError for unsupported model types
+            if self.explainer is None:
+                self.explainer = ModelExplainer(self.model, self.preprocessor)
+            return self.explainer.explain(features)
+            
+        except Exception as e:
+            logger.error(f"Error in explanation: {str(e)}")
+            raise e
+    
     def predict_single(self, features_dict: dict):
         """Make prediction for a single instance"""
         try:
-            df = pd.DataFrame([features_dict])
+            if self.score_table is not None:
+                phase("score_table")
+                probability = self.score_table.score(features_dict)
+                if probability is not None:
+                    return int(self.decision_policy.predict(probability)), probability
+            
+            phase("dataframe")
+            df = FEATURE_SCHEMA.to_frame(features_dict)
             predictions, probabilities = self.predict(df)
             return int(predictions[0]), float(probabilities[0])
             
@@ -0,0 +1,193 @@
+"""Precomputed churn scores for the whole customer base, keyed by ``customer_id``.
+
+Scores live in SQLite with ``customer_id`` as the ``INTEGER PRIMARY KEY``, so
+a lookup is a single rowid B-tree probe. Each row also stores a hash of the
+customer's features and the model version that scored it. A refresh hashes
+the input, compares it with the store chunk by chunk and only re-scores
+customers that are new, whose features changed, or that were scored by a
+different model. Customers missing from the input are removed.
+
+Run nightly, e.g. from cron:
+
+    python -m src.pipeline.score_store --input data/raw/customer_data.csv
+"""
+import argparse
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config.configuration import ConfigurationManager, ScoreStoreConfig
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.utils.common import iter_data
+from src.utils.concurrency import ThreadBudget
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    customer_id INTEGER PRIMARY KEY,
+    churn_prediction INTEGER NOT NULL,
+    churn_probability REAL NOT NULL,
+    risk_level TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    feature_hash INTEGER NOT NULL,
+    scored_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def feature_hashes(features: pd.DataFrame) -> np.ndarray:
+    """Per-row 64-bit hash of the feature values, as signed integers for SQLite"""
+    return pd.util.hash_pandas_object(FEATURE_SCHEMA.select(features), index=False).to_numpy().view(np.int64)
+
+
+class ScoreStore:
+    """SQLite table of the latest score per customer"""
+
+    def __init__(self, config: ScoreStoreConfig):
+        self.config = config
+        self.db_path = Path(config.db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @property
+    def _reader(self) -> sqlite3.Connection:
+        # One long-lived connection per thread keeps lookups to a single query
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            conn.row_factory = sqlite3.Row
+        return conn
+
+    def get(self, customer_id: int) -> Optional[Dict]:
+        row = self._reader.execute(
+            "SELECT customer_id, churn_prediction, churn_probability, risk_level, model_version, scored_at "
+            "FROM scores WHERE customer_id = ?", (customer_id,)
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def stats(self) -> Dict:
+        conn = self._reader
+        meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        meta['customers'] = conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        return meta
+
+    def _stale(self, conn: sqlite3.Connection, ids: np.ndarray, hashes: np.ndarray,
+               model_version: str) -> np.ndarray:
+        """Mask of rows that are new, changed, or scored by another model"""
+        conn.execute("DELETE FROM batch")
+        conn.executemany("INSERT OR REPLACE INTO batch (customer_id) VALUES (?)", ((int(i),) for i in ids))
+        stored = np.array(
+            conn.execute(
+                "SELECT s.customer_id, s.feature_hash FROM scores s JOIN batch USING (customer_id) "
+                "WHERE s.model_version = ?", (model_version,)
+            ).fetchall(),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        position = pd.Index(stored[:, 0]).get_indexer(ids)
+        stale = position < 0
+        stale[~stale] = stored[position[~stale], 1] != hashes[~stale]
+        return stale
+
+    def refresh(self, input_path: str, prediction_pipeline, full: bool = False) -> Dict:
+        """Bring the store up to date with the customers in ``input_path``"""
+        id_column = FEATURE_SCHEMA.id_column
+        model_version = prediction_pipeline.model_version
+        policy = prediction_pipeline.decision_policy
+        started = time.time()
+        seen, scored = 0, 0
+
+        conn = self._connect()
+        try:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen (customer_id INTEGER PRIMARY KEY)")
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS batch (customer_id INTEGER PRIMARY KEY)")
+            conn.execute("DELETE FROM seen")
+            dtypes = FEATURE_SCHEMA.dtypes(include_id=True)
+            for chunk in iter_data(input_path, self.config.chunk_size, dtype=dtypes):
+                if id_column not in chunk.columns:
+                    raise ValueError(f"Input has no {id_column} column")
+                ids = chunk[id_column].to_numpy(dtype=np.int64)
+                hashes = feature_hashes(chunk)
+                conn.execute("BEGIN")
+                conn.executemany("INSERT OR IGNORE INTO seen (customer_id) VALUES (?)", ((int(i),) for i in ids))
+                stale = np.ones(len(ids), dtype=bool) if full else self._stale(conn, ids, hashes, model_version)
+                if stale.any():
+                    _, probabilities = prediction_pipeline.predict(FEATURE_SCHEMA.select(chunk[stale]))
+                    probabilities = np.asarray(probabilities, dtype=np.float64)
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        zip(
+                            ids[stale].tolist(),
+                            policy.predict(probabilities).tolist(),
+                            probabilities.tolist(),
+                            policy.risk_levels(probabilities).tolist(),
+                            [model_version] * int(stale.sum()),
+                            hashes[stale].tolist(),
+                            [started] * int(stale.sum()),
+                        )
+                    )
+                conn.execute("COMMIT")
+                seen += len(ids)
+                scored += int(stale.sum())
+
+            conn.execute("BEGIN")
+            removed = conn.execute("DELETE FROM scores WHERE customer_id NOT IN (SELECT customer_id FROM seen)").rowcount
+            conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [
+                ("model_version", model_version),
+                ("refreshed_at", str(started)),
+                ("input_path", str(input_path)),
+            ])
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        summary = {
+            'customers': seen,
+            'scored': scored,
+            'unchanged': seen - scored,
+            'removed': removed,
+            'seconds': time.time() - started,
+        }
+        logger.info(f"Score store refreshed: {summary}")
+        return summary
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Refresh the precomputed customer score store")
+    parser.add_argument("--input", help="Customer base to score (defaults to score_store.input_path)")
+    parser.add_argument("--full", action="store_true", help="Re-score every customer")
+    args = parser.parse_args(argv)
+
+    from src.pipeline.prediction_pipeline import PredictionPipeline
+
+    config_manager = ConfigurationManager()
+    config = config_manager.get_score_store_config()
+    budget = ThreadBudget.for_scoring(config_manager.get_concurrency_config(), workers=1).apply()
+    prediction_pipeline = PredictionPipeline(n_jobs=budget.threads)
+    budget.report(prediction_pipeline.model)
+    ScoreStore(config).refresh(args.input or config.input_path, prediction_pipeline, full=args.full)
+
+
+if __name__ == "__main__":
+    main()
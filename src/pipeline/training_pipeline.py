@@ -1,9 +1,18 @@
 from src.config.configuration import ConfigurationManager
 from src.data.data_ingestion import DataIngestion
+from src.data.data_sampling import DataSampling
 from src.data.data_validation import DataValidation
 from src.data.data_transformation import DataTransformation
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.models.experiment_tracker import BackgroundMlflowLogger
+from src.models.explainer import ModelExplainer
 from src.models.model_trainer import ModelTrainer
+from src.models.threshold_optimizer import ThresholdOptimizer
+from src.monitoring.reference_profile import ReferenceProfile
 from src.utils.logger import setup_logger
+from src.utils.common import read_data
+from src.utils.concurrency import ThreadBudget
+from src.utils.memory import MemoryProfiler
 import sys
 
 logger = setup_logger(__name__)
@@ -17,39 +26,97 @@ class TrainingPipeline:
         """Execute the complete training pipeline"""
         try:
             logger.info("Starting training pipeline")
+            profiling_config = self.config_manager.get_profiling_config()
+            memory = MemoryProfiler(trace=profiling_config.stage_tracemalloc, top=profiling_config.top_allocators)
+            budget = ThreadBudget.for_training(self.config_manager.get_concurrency_config()).apply()
+            budget.report()
+            experiment_name = self.config_manager.get_training_config().experiment_name
 
             # Data Ingestion
             logger.info("Step 1: Data Ingestion")
-            data_ingestion_config = self.config_manager.get_data_ingestion_config()
-            data_ingestion = DataIngestion(config=data_ingestion_config)
-            train_data_path, test_data_path = data_ingestion.initiate_data_ingestion()
+            with memory.stage("data_ingestion"):
+                data_ingestion_config = self.config_manager.get_data_ingestion_config()
+                data_ingestion_config.n_jobs = budget.n_jobs(data_ingestion_config.n_jobs)
+                data_ingestion = DataIngestion(config=data_ingestion_config)
+                if data_ingestion_config.sharded:
+                    train_data_path, test_data_path = data_ingestion.initiate_sharded_ingestion()
+                else:
+                    train_data_path, test_data_path = data_ingestion.initiate_data_ingestion()
 
-            # Data Validation
-            logger.info("Step 2: Data Validation")
-            data_validation = DataValidation()
-            import pandas as pd
+            # Data Sampling
+            logger.info("Step 2: Data Sampling")
+            with memory.stage("data_sampling"):
+                data_sampling_config = self.config_manager.get_data_sampling_config()
+                data_sampling = DataSampling(config=data_sampling_config)
+                train_data_path, test_data_path = data_sampling.initiate_data_sampling(
+                    train_data_path, test_data_path
+                )
 
-            train_df = pd.read_csv(train_data_path)
-            if not data_validation.validate_schema(train_df):
-                raise Exception("Data validation failed")
+            # Data Validation
+            logger.info("Step 3: Data Validation")
+            with memory.stage("data_validation"):
+                data_validation = DataValidation()
+                train_df = read_data(train_data_path)
+                if not data_validation.validate_schema(train_df):
+                    raise Exception("Data validation failed")
 
             # Data Transformation
-            logger.info("Step 3: Data Transformation")
-            data_transformation = DataTransformation()
-            X_train, y_train, X_test, y_test, preprocessor_path = (
-                data_transformation.initiate_data_transformation(
-                    train_data_path, test_data_path
+            logger.info("Step 4: Data Transformation")
+            with memory.stage("data_transformation"):
+                data_transformation = DataTransformation()
+                X_train, y_train, X_test, y_test, preprocessor_path = (
+                    data_transformation.initiate_data_transformation(
+                        train_data_path, test_data_path
+                    )
                 )
-            )
 
             # Model Training
-            logger.info("Step 4: Model Training")
-            model_training_config = self.config_manager.get_model_training_config()
-            model_trainer = ModelTrainer(config=model_training_config)
-            model_path = model_trainer.initiate_model_trainer(
-                X_train, y_train, X_test, y_test
-            )
+            logger.info("Step 5: Model Training")
+            with memory.stage("model_training"):
+                sample_weight = None
+                if "sample_weight" in train_df.columns:
+                    sample_weight = train_df["sample_weight"].to_numpy()
+                model_training_config = self.config_manager.get_model_training_config()
+                model_trainer = ModelTrainer(
+                    config=model_training_config, budget=budget, experiment_name=experiment_name
+                )
+                cv_results = None
+                if model_training_config.cv_folds > 1:
+                    # Folds are preprocessed from the raw features to avoid leakage
+                    cv_results = model_trainer.cross_validate(
+                        FEATURE_SCHEMA.select(train_df),
+                        train_df[FEATURE_SCHEMA.target_column],
+                        data_transformation.get_data_transformer(),
+                        sample_weight=sample_weight,
+                    )
+                model_path = model_trainer.initiate_model_trainer(
+                    X_train, y_train, X_test, y_test,
+                    sample_weight=sample_weight,
+                    run_params=data_sampling.get_params(),
+                    cv_results=cv_results,
+                )
 
+            # Decision Threshold
+            logger.info("Step 6: Decision Threshold")
+            with memory.stage("decision_threshold"):
+                import joblib
+
+                model = joblib.load(model_path)
+                holdout_scores = model.predict_proba(X_test)[:, 1]
+                threshold_optimizer = ThresholdOptimizer(self.config_manager.get_decision_config())
+                decision_policy = threshold_optimizer.optimize(y_test, holdout_scores)
+                ModelExplainer.fit_baseline(model, X_train, sample_weight=sample_weight)
+                joblib.dump(decision_policy.apply(model), model_path)
+
+            # Reference Profile
+            logger.info("Step 7: Reference Profile")
+            with memory.stage("reference_profile"):
+                reference_profile = ReferenceProfile.from_frame(
+                    train_df, scores=holdout_scores, sample_weight=sample_weight
+                )
+                reference_profile.save("artifacts/reference_profile.json")
+
+            self.log_memory(memory, experiment_name)
             logger.info("Training pipeline completed successfully")
             return model_path, preprocessor_path
 
@@ -57,6 +124,19 @@ class TrainingPipeline:
             logger.error(f"Error in training pipeline: {str(e)}")
             raise e
 
+    def log_memory(self, memory: MemoryProfiler, experiment_name: str):
+        """Record per-stage memory in a ``training_pipeline`` MLflow run; tracking errors never fail training"""
+        logger.info(f"Memory by stage:\n{memory.report()}")
+        try:
+            tracker = BackgroundMlflowLogger(experiment_name)
+            run_id = tracker.start_run("training_pipeline")
+            tracker.log_metrics(run_id, memory.metrics())
+            tracker.log_text(run_id, memory.report(), "memory_report.txt")
+            tracker.end_run(run_id)
+            tracker.close()
+        except Exception as e:
+            logger.error(f"Failed to log memory to MLflow: {str(e)}")
+
 
 if __name__ == "__main__":
     try:
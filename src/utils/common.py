@@ -2,6 +2,7 @@ import os
 import json
 import pickle
 import numpy as np
+import pandas as pd
 from pathlib import Path
 from typing import Any, Dict
 
@@ -29,3 +30,32 @@ def create_directories(paths: list):
     """Create multiple directories"""
     for path in paths:
         Path(path).mkdir(parents=True, exist_ok=True)
+
+def list_data_files(path: str) -> list:
+    """Return ``path`` itself, or the sorted CSV/Parquet shards in a directory"""
+    path = Path(path)
+    if path.is_dir():
+        return sorted(str(p) for p in path.iterdir() if p.suffix in (".csv", ".parquet"))
+    return [str(path)]
+
+def read_data(path: str, **kwargs) -> pd.DataFrame:
+    """Read a CSV/Parquet file or a directory of shards into one frame"""
+    frames = []
+    for file in list_data_files(path):
+        if file.endswith(".parquet"):
+            columns = kwargs.get("usecols")
+            df = pd.read_parquet(file, columns=columns)
+            frames.append(df.astype(kwargs["dtype"]) if "dtype" in kwargs else df)
+        else:
+            frames.append(pd.read_csv(file, **kwargs))
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+def iter_data(path: str, chunksize: int, **kwargs):
+    """Yield frames of up to ``chunksize`` rows from a file or a directory of shards"""
+    for file in list_data_files(path):
+        if file.endswith(".parquet"):
+            df = pd.read_parquet(file, columns=kwargs.get("usecols"))
+            for start in range(0, len(df), chunksize):
+                yield df.iloc[start:start + chunksize]
+        else:
+            yield from pd.read_csv(file, chunksize=chunksize, **kwargs)
@@ -0,0 +1,146 @@
+"""Thread budgets: how many cores each process gets and how they are split.
+
+Left alone, every layer picks its own parallelism. Uvicorn workers, batch
+scoring threads, ``n_jobs=-1`` estimators and the BLAS/OpenMP pools under
+NumPy and scikit-learn each assume the whole machine is theirs. Multiply them
+on a pod and the cores are oversubscribed many times over. A
+``ThreadBudget`` gives each process an explicit share of the
+``concurrency`` config:
+
+- ``for_serving``: each uvicorn worker gets ``cpus / serving_workers`` cores,
+  and every lane runs with ``serving_threads`` native threads. A lane is a
+  request or an in-process batch scoring thread.
+- ``for_scoring``: a ``src.pipeline.job_queue`` process splits its cores
+  between its worker threads.
+- ``for_training``: the training pipeline uses ``training_threads`` cores.
+  Cross-validation processes share them.
+
+``apply`` caps the native pools with threadpoolctl and exports the matching
+``*_NUM_THREADS`` variables for child processes. ``set_n_jobs`` gives
+estimators the same limit.
+"""
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict
+
+from threadpoolctl import threadpool_info, threadpool_limits
+
+from src.config.configuration import ConcurrencyConfig
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "BLIS_NUM_THREADS")
+
+
+def _cgroup_cpu_quota():
+    """CPU limit from the cgroup (v2, then v1), or None if unlimited"""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus() -> int:
+    """Cores this process may run on: CPU affinity, capped by the container's CPU quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS and Windows
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return cpus
+
+
+def set_n_jobs(estimator, n_jobs: int, only_parallel: bool = False):
+    """Set ``n_jobs`` on an estimator and every nested estimator that has one.
+
+    With ``only_parallel``, ``n_jobs=None`` (sequential) is left alone. Some
+    estimators, like ``LogisticRegression``, warn when it is set at all.
+    """
+    if not hasattr(estimator, "get_params"):
+        return estimator
+    params = {
+        name: n_jobs for name, value in estimator.get_params(deep=True).items()
+        if (name == "n_jobs" or name.endswith("__n_jobs")) and not (only_parallel and value is None)
+    }
+    if params:
+        estimator.set_params(**params)
+    return estimator
+
+
+@dataclass
+class ThreadBudget:
+    """Cores granted to one process and the native threads each of its lanes may use"""
+    role: str
+    cpus: int
+    lanes: int = 1
+    threads: int = 1
+
+    @classmethod
+    def for_serving(cls, config: ConcurrencyConfig, job_workers: int = 0) -> "ThreadBudget":
+        cpus = max(1, (config.cpus or available_cpus()) // max(config.serving_workers, 1))
+        return cls("serving", cpus, lanes=1 + job_workers, threads=max(1, config.serving_threads))
+
+    @classmethod
+    def for_scoring(cls, config: ConcurrencyConfig, workers: int) -> "ThreadBudget":
+        cpus = config.cpus or available_cpus()
+        workers = max(workers, 1)
+        return cls("scoring", cpus, lanes=workers, threads=config.scoring_threads or max(1, cpus // workers))
+
+    @classmethod
+    def for_training(cls, config: ConcurrencyConfig) -> "ThreadBudget":
+        cpus = config.cpus or available_cpus()
+        return cls("training", cpus, threads=min(config.training_threads or cpus, cpus))
+
+    def n_jobs(self, requested: int) -> int:
+        """Resolve a joblib-style ``n_jobs`` (``-1`` = all cores) against this budget's cores"""
+        if requested is None or requested == 0:
+            return 1
+        if requested < 0:
+            return max(1, self.cpus + 1 + requested)
+        return min(requested, self.cpus)
+
+    def apply(self) -> "ThreadBudget":
+        """Cap the BLAS/OpenMP pools of this process and of processes it starts"""
+        for name in THREAD_ENV_VARS:
+            os.environ[name] = str(self.threads)
+        threadpool_limits(limits=self.threads)
+        return self
+
+    def layout(self, model=None) -> Dict:
+        layout = {
+            'role': self.role,
+            'cpus_detected': available_cpus(),
+            'cpus': self.cpus,
+            'lanes': self.lanes,
+            'threads_per_lane': self.threads,
+            'native_pools': [
+                {'library': pool['internal_api'], 'num_threads': pool['num_threads']} for pool in threadpool_info()
+            ],
+        }
+        if model is not None and hasattr(model, "get_params"):
+            layout['model_n_jobs'] = model.get_params().get("n_jobs")
+        return layout
+
+    def report(self, model=None) -> Dict:
+        """Log the effective thread layout, warning when it oversubscribes the cores"""
+        layout = self.layout(model)
+        logger.info(f"Thread layout: {layout}")
+        if self.lanes * self.threads > self.cpus:
+            logger.warning(
+                f"{self.role}: {self.lanes} lanes x {self.threads} threads exceeds the {self.cpus} cores budgeted"
+            )
+        return layout
@@ -0,0 +1,176 @@
+"""Process memory accounting: RSS, per-stage peaks and ``tracemalloc`` allocators.
+
+RSS comes from ``/proc/self`` on Linux. Elsewhere it falls back to
+``resource.getrusage``, which only reports the peak for the whole life of the
+process. On Linux the peak is reset at the start of each tracked block, so
+``peak_rss_mb`` is the high-water mark of that block alone.
+"""
+import os
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MB = 1024 * 1024
+
+# Allocations made by the measuring machinery itself
+_IGNORED_TRACES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+# Running peaks of the open ``track_memory`` blocks, innermost last. A nested
+# block resets the kernel and tracemalloc peaks, so the peaks reached so far
+# are folded into the enclosing blocks first.
+_open_blocks: List[Dict[str, int]] = []
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size since the last ``reset_peak_rss`` (or process start)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS counter (Linux 4.0+); False where that is not possible"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def to_mb(n_bytes: Optional[int]) -> Optional[float]:
+    """Bytes as megabytes, rounded for reporting"""
+    return None if n_bytes is None else round(n_bytes / MB, 3)
+
+
+def top_allocators(snapshot: tracemalloc.Snapshot, baseline: tracemalloc.Snapshot = None,
+                   limit: int = 10) -> List[Dict]:
+    """Source lines holding the most traced memory (growth since ``baseline`` if given)"""
+    snapshot = snapshot.filter_traces(_IGNORED_TRACES)
+    if baseline is not None:
+        stats = snapshot.compare_to(baseline.filter_traces(_IGNORED_TRACES), "lineno")
+        stats = [(stat.traceback, stat.size_diff, stat.count_diff) for stat in stats]
+    else:
+        stats = [(stat.traceback, stat.size, stat.count) for stat in snapshot.statistics("lineno")]
+    stats.sort(key=lambda stat: stat[1], reverse=True)
+    return [
+        {'location': f"{traceback[0].filename}:{traceback[0].lineno}", 'size_mb': to_mb(size), 'count': count}
+        for traceback, size, count in stats[:limit]
+        if size > 0
+    ]
+
+
+def _fold_peaks():
+    rss = peak_rss_bytes() or 0
+    traced = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+    for block in _open_blocks:
+        block['rss'] = max(block['rss'], rss)
+        block['traced'] = max(block['traced'], traced)
+
+
+@contextmanager
+def track_memory(trace: bool = True, top: int = 0):
+    """Measure the block's memory; the yielded dict is filled in when it exits.
+
+    Keys: ``rss_mb``, ``rss_delta_mb`` and ``peak_rss_mb`` always. With
+    ``trace``, also ``traced_peak_mb`` (peak Python allocations made in the
+    block), ``retained_mb`` (those still alive at the end) and, with
+    ``top > 0``, ``top_allocators``. Tracing slows allocation-heavy code down,
+    so it is started only for the block unless it is already running.
+    """
+    stats = {}
+    started = trace and not tracemalloc.is_tracing()
+    baseline = None
+    if started:
+        tracemalloc.start()
+    elif trace and top > 0:
+        baseline = tracemalloc.take_snapshot()
+    _fold_peaks()
+    if trace:
+        traced_before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    reset_peak_rss()
+    rss_before = rss_bytes()
+    block = {'rss': 0, 'traced': 0}
+    _open_blocks.append(block)
+    try:
+        yield stats
+    finally:
+        _fold_peaks()
+        _open_blocks.remove(block)
+        rss_after = rss_bytes()
+        stats['rss_mb'] = to_mb(rss_after)
+        stats['rss_delta_mb'] = to_mb(rss_after - rss_before) if rss_before is not None else None
+        stats['peak_rss_mb'] = to_mb(block['rss']) if block['rss'] else None
+        if trace:
+            current = tracemalloc.get_traced_memory()[0]
+            stats['traced_peak_mb'] = to_mb(block['traced'] - traced_before)
+            stats['retained_mb'] = to_mb(current - traced_before)
+            if top > 0:
+                stats['top_allocators'] = top_allocators(tracemalloc.take_snapshot(), baseline, top)
+            if started:
+                tracemalloc.stop()
+
+
+class MemoryProfiler:
+    """Memory per named stage of a pipeline run"""
+
+    def __init__(self, trace: bool = True, top: int = 10):
+        self.trace = trace
+        self.top = top
+        self.stages: Dict[str, Dict] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        with track_memory(self.trace, self.top) as stats:
+            yield stats
+        self.stages[name] = stats
+
+    def metrics(self) -> Dict[str, float]:
+        """Flat ``memory.<stage>.<measure>`` metrics for the experiment tracker"""
+        return {
+            f"memory.{stage}.{key}": value
+            for stage, stats in self.stages.items()
+            for key, value in stats.items()
+            if isinstance(value, float)
+        }
+
+    def report(self) -> str:
+        """Readable per-stage summary with the top allocators"""
+        lines = []
+        for stage, stats in self.stages.items():
+            measures = ", ".join(f"{key}={value}" for key, value in stats.items() if key != 'top_allocators')
+            lines.append(f"{stage}: {measures}")
+            for allocator in stats.get('top_allocators', []):
+                lines.append(f"    {allocator['size_mb']:>10.3f} MB {allocator['count']:>9} blocks  "
+                             f"{allocator['location']}")
+        return "\n".join(lines) + "\n"
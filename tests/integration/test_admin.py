@@ -0,0 +1,66 @@
+import tracemalloc
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import api.main
+from src.config.configuration import ProfilingConfig
+from src.monitoring.profiling import TraceBuffer
+
+client = TestClient(api.main.app)
+
+
+class TestAdmin:
+
+    def test_disabled_by_default(self):
+        """Test the admin endpoints are hidden unless profiling is enabled"""
+        with patch('api.admin.config', ProfilingConfig()):
+            assert client.get("/admin/traces").status_code == 404
+            assert client.get("/admin/profile", params={"seconds": 0.1}).status_code == 404
+
+    @patch('api.admin.traces', TraceBuffer(slow_request_ms=0.0))
+    @patch('api.admin.config', ProfilingConfig(enabled=True))
+    @patch('api.main.prediction_pipeline')
+    def test_slow_request_traces(self, mock_pipeline, sample_features):
+        """Test served requests are traced phase by phase"""
+        mock_pipeline.predict_single.return_value = (0, 0.2)
+        assert client.post("/predict", json=sample_features).status_code == 200
+        client.get("/livez")
+
+        data = client.get("/admin/traces").json()
+        assert data["kept"] == 1
+        trace = data["traces"][0]
+        assert (trace["method"], trace["path"], trace["status"]) == ("POST", "/predict", 200)
+        assert list(trace["phases"]) == ["receive", "validation", "postprocess", "serialization"]
+
+    @patch('api.admin.config', ProfilingConfig(enabled=True, max_seconds=1.0))
+    def test_profile(self):
+        """Test a time-boxed profile returns collapsed stacks"""
+        response = client.get("/admin/profile", params={"seconds": 0.2, "interval_ms": 1, "include_idle": True})
+        assert response.status_code == 200
+        assert response.headers["content-disposition"].startswith("attachment")
+        assert int(response.headers["x-profile-samples"]) > 0
+        assert response.text.strip()
+
+        assert client.get("/admin/profile", params={"seconds": 5}).status_code == 400
+
+    @patch('api.admin.config', ProfilingConfig(enabled=True))
+    def test_memory(self):
+        """Test the memory report, with top allocators only while tracing"""
+        report = client.get("/admin/memory").json()
+        assert report["rss_mb"] > 0
+        assert report["tracemalloc"] is False
+        assert "top_allocators" not in report
+
+        tracemalloc.start()
+        try:
+            report = client.get("/admin/memory", params={"top": 3}).json()
+        finally:
+            tracemalloc.stop()
+        assert report["tracemalloc"] is True
+        assert len(report["top_allocators"]) <= 3
@@ -8,6 +8,10 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from api.main import app
+from api import analytics
+from src.config.configuration import ConcurrencyConfig, ConfigurationManager
+from src.monitoring.performance_monitor import PerformanceMonitor
+from src.monitoring.prediction_analytics import PredictionAnalytics
 
 client = TestClient(app)
 
@@ -25,7 +29,7 @@ class TestAPI:
         """Test root endpoint"""
         response = client.get("/")
         assert response.status_code == 200
-        assert "Churn Prediction API" in response.text
+        assert "Customer Churn Prediction Dashboard" in response.text
         
     @patch('api.main.prediction_pipeline')  
     def test_predict_endpoint(self, mock_pipeline):
@@ -53,6 +57,107 @@ class TestAPI:
         assert "churn_probability" in data
         assert "risk_level" in data
         
+    @patch('api.main.prediction_pipeline')
+    def test_explain_endpoint(self, mock_pipeline):
+        """Test explanation endpoint"""
+        mock_pipeline.explain.return_value = [{
+            "churn_probability": 0.75,
+            "base_value": 0.3,
+            "contributions": {"tenure": 0.3, "age": 0.15},
+            "units": "probability"
+        }]
+        
+        sample_data = {
+            "age": 35.0,
+            "tenure": 12.0,
+            "monthly_charges": 75.5,
+            "total_charges": 1200.0,
+            "contract_length": 12,
+            "payment_method": "Credit Card",
+            "internet_service": "Fiber Optic",
+            "online_security": "Yes",
+            "tech_support": "Yes"
+        }
+        
+        response = client.post("/explain", json=sample_data)
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["risk_level"] == "High"
+        assert data["contributions"]["tenure"] == 0.3
+        
+    @patch('api.main.score_store')
+    def test_customer_score_endpoint(self, mock_store):
+        """Test precomputed score lookup by customer id"""
+        mock_store.get.side_effect = lambda customer_id: {
+            "customer_id": 42,
+            "churn_prediction": 1,
+            "churn_probability": 0.81,
+            "risk_level": "High",
+            "model_version": "3f2a9c1b7d10",
+            "scored_at": 1700000000.0
+        } if customer_id == 42 else None
+        
+        response = client.get("/customers/42/score")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["customer_id"] == "42"
+        assert data["risk_level"] == "High"
+        assert data["model_version"] == "3f2a9c1b7d10"
+        
+        assert client.get("/customers/7/score").status_code == 404
+        
+    @patch('api.analytics.tracker', PredictionAnalytics())
+    @patch('api.main.prediction_pipeline')
+    def test_analytics_endpoints(self, mock_pipeline, sample_features):
+        """Test served predictions show up in the analytics aggregates"""
+        mock_pipeline.predict_single.return_value = (1, 0.75)
+        for _ in range(3):
+            assert client.post("/predict", json=sample_features).status_code == 200
+        
+        summary = client.get("/analytics/summary").json()
+        assert summary["total_predictions"] == 3
+        assert summary["high_risk_predictions"] == 3
+        assert client.get("/analytics/risk_distribution").json()["High"]["share"] == 1.0
+        assert client.get("/analytics/segments").json()["internet_service"]["Fiber Optic"]["count"] == 3
+        assert client.get("/analytics/volume", params={"buckets": 2}).json()["buckets"][-1]["predictions"] == 3
+        assert sum(client.get("/analytics/probability_histogram").json()["counts"]) == 3
+        
+    @patch('api.analytics.state_path', None)
+    @patch('api.analytics.tracker', None)
+    def test_analytics_not_persisted_with_several_workers(self):
+        """Test per-worker analytics neither load nor overwrite the shared state file"""
+        with patch.object(ConfigurationManager, 'get_concurrency_config',
+                          return_value=ConcurrencyConfig(serving_workers=2)), \
+                patch.object(PredictionAnalytics, 'save') as mock_save:
+            analytics.get_tracker()
+            analytics.save_state()
+        assert analytics.state_path == ""
+        mock_save.assert_not_called()
+        
+    @patch('api.monitoring.monitor', PerformanceMonitor(performance_threshold=0.85, min_samples=4))
+    @patch('api.analytics.tracker', PredictionAnalytics())
+    @patch('api.main.prediction_pipeline')
+    def test_monitoring_labels_endpoint(self, mock_pipeline, sample_features):
+        """Test delayed labels join served predictions and raise a performance alert"""
+        mock_pipeline.predict_single.return_value = (1, 0.75)
+        for customer_id in range(4):
+            response = client.post("/predict", json={**sample_features, "customer_id": customer_id})
+            assert response.json()["customer_id"] == str(customer_id)
+        assert client.post("/predict", json=sample_features).status_code == 200
+        
+        labels = [{"customer_id": str(i), "churn": i % 2} for i in range(4)] + [{"customer_id": 99, "churn": 1}]
+        data = client.post("/monitoring/labels", json={"labels": labels}).json()
+        assert data["received"] == 5
+        assert data["matched"] == 4
+        assert data["metrics"]["accuracy"] == 0.5
+        assert data["alerts"][0]["metric"] == "accuracy"
+        
+        performance = client.get("/monitoring/performance").json()
+        assert performance["threshold"] == 0.85
+        assert len(performance["alerts"]) == 1
+        assert client.post("/monitoring/labels", json={"labels": [{"customer_id": 1, "churn": 2}]}).status_code == 422
+        
     def test_predict_endpoint_validation_error(self):
         """Test prediction endpoint with invalid data"""
         invalid_data = {
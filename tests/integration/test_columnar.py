@@ -0,0 +1,112 @@
+import pytest
+import numpy as np
+import pyarrow as pa
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from api.main import app
+from api.columnar import ARROW_STREAM, MAX_BODY_BYTES, ColumnarValidationError, validate_columns
+
+client = TestClient(app)
+
+def make_columns(n: int = 3):
+    return {
+        "age": [35.0, 52.0, 41.0][:n],
+        "tenure": [12.0, 3.0, 30.0][:n],
+        "monthly_charges": [75.5, 20.0, 99.9][:n],
+        "total_charges": [1200.0, 60.0, 2900.0][:n],
+        "contract_length": [12, 1, 24][:n],
+        "payment_method": ["Credit Card", "Mailed Check", "Bank Transfer"][:n],
+        "internet_service": ["Fiber Optic", "DSL", "No"][:n],
+        "online_security": ["Yes", "No", "No"][:n],
+        "tech_support": ["Yes", "No", "Yes"][:n],
+    }
+
+class TestColumnarBatch:
+    
+    def test_validation_reports_bad_rows(self):
+        """Test Field constraints are checked per column and report row indices"""
+        columns = make_columns()
+        columns["age"] = [35.0, 12.0, None]
+        columns["monthly_charges"] = [-1.0, 20.0, 99.9]
+        columns["contract_length"] = [12, 1.5, 24]
+        
+        with pytest.raises(ColumnarValidationError) as excinfo:
+            validate_columns(columns)
+        rows = {error["loc"][-1]: error["rows"] for error in excinfo.value.errors}
+        assert rows == {"age": [1, 2], "monthly_charges": [0], "contract_length": [1]}
+        
+    def test_validation_builds_typed_frame(self):
+        """Test valid columns become a frame in schema dtypes"""
+        df = validate_columns(make_columns())
+        assert len(df) == 3
+        assert df["contract_length"].dtype == np.int64
+        
+    @patch('api.main.prediction_pipeline')
+    def test_json_columns(self, mock_pipeline):
+        """Test JSON arrays in, JSON arrays out"""
+        mock_pipeline.predict.return_value = (np.array([1, 0, 0]), np.array([0.81234, 0.1, 0.5]))
+        
+        response = client.post("/batch_predict/columnar", json=make_columns())
+        assert response.status_code == 200
+        data = response.json()
+        assert data["churn_prediction"] == [1, 0, 0]
+        assert data["churn_probability"] == [0.8123, 0.1, 0.5]
+        assert data["risk_level"] == ["High", "Low", "Medium"]
+        
+    @patch('api.main.prediction_pipeline')
+    def test_arrow_columns(self, mock_pipeline):
+        """Test Arrow IPC request and response bodies"""
+        mock_pipeline.predict.return_value = (np.array([1, 0]), np.array([0.9, 0.2]))
+        table = pa.table(make_columns(2))
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        
+        response = client.post(
+            "/batch_predict/columnar", content=sink.getvalue().to_pybytes(),
+            headers={"content-type": ARROW_STREAM, "accept": ARROW_STREAM}
+        )
+        assert response.status_code == 200
+        result = pa.ipc.open_stream(response.content).read_all()
+        assert result.column("churn_prediction").to_pylist() == [1, 0]
+        
+    @patch('api.main.prediction_pipeline')
+    def test_invalid_rows_rejected(self, mock_pipeline):
+        """Test a batch with bad rows returns 422 with their indices"""
+        columns = make_columns()
+        columns["tenure"] = [1.0, -2.0, 3.0]
+        
+        response = client.post("/batch_predict/columnar", json=columns)
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["rows"] == [1]
+        mock_pipeline.predict.assert_not_called()
+        
+    @patch('api.main.validate_columns')
+    @patch('api.main.prediction_pipeline')
+    def test_oversized_batches_rejected_before_validation(self, mock_pipeline, mock_validate):
+        """Test too many rows or too many bytes are refused before columns are validated"""
+        columns = {name: values * 334 for name, values in make_columns().items()}
+        response = client.post("/batch_predict/columnar", json=columns)
+        assert response.status_code == 400
+        assert "Maximum 1000" in response.json()["detail"]
+        
+        table = pa.table(make_columns())
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            for _ in range(334):
+                writer.write_table(table)
+        response = client.post(
+            "/batch_predict/columnar", content=sink.getvalue().to_pybytes(), headers={"content-type": ARROW_STREAM}
+        )
+        assert response.status_code == 400
+        
+        response = client.post("/batch_predict/columnar", content=b" " * (MAX_BODY_BYTES + 1))
+        assert response.status_code == 413
+        mock_validate.assert_not_called()
+        mock_pipeline.predict.assert_not_called()
@@ -0,0 +1,73 @@
+import pytest
+import io
+import pandas as pd
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from api.main import app
+from src.config.configuration import JobsConfig
+import api.jobs
+from src.models.threshold_optimizer import DecisionPolicy
+from src.pipeline.job_queue import BatchScoringWorker, JobStore
+
+client = TestClient(app)
+
+class FakePipeline:
+    decision_policy = DecisionPolicy()
+
+    def predict(self, features):
+        probabilities = features['age'].to_numpy() / 100
+        return self.decision_policy.predict(probabilities), probabilities
+
+class TestJobsEndpoints:
+
+    @pytest.fixture
+    def store(self, temp_dir):
+        store = JobStore(JobsConfig(jobs_dir=f"{temp_dir}/jobs", chunk_size=40, allowed_input_dirs=[temp_dir]))
+        with patch('api.jobs.store', store):
+            yield store
+
+    def test_upload_score_and_download(self, store, sample_data):
+        """Test an uploaded CSV is queued, scored, paged and downloaded"""
+        response = client.post("/jobs/upload?output_format=csv", content=sample_data.to_csv(index=False))
+        assert response.status_code == 202
+        job = response.json()
+        assert job['status'] == "queued"
+
+        response = client.get(f"/jobs/{job['id']}/download")
+        assert response.status_code == 409
+
+        BatchScoringWorker(store, FakePipeline()).run_once()
+        job = client.get(f"/jobs/{job['id']}").json()
+        assert job['status'] == "completed"
+        assert job['progress'] == 1.0
+
+        page = client.get(f"/jobs/{job['id']}/results", params={"offset": 95, "limit": 10}).json()
+        assert [row['customer_id'] for row in page['results']] == [96, 97, 98, 99, 100]
+
+        response = client.get(f"/jobs/{job['id']}/download")
+        assert response.status_code == 200
+        assert len(pd.read_csv(io.BytesIO(response.content))) == len(sample_data)
+
+    def test_submit_validation(self, store):
+        """Test unknown jobs, disallowed paths and formats are rejected"""
+        assert client.get("/jobs/missing").status_code == 404
+        assert client.post("/jobs", json={"input_path": "/etc/passwd"}).status_code == 400
+        response = client.post("/jobs", json={"input_path": store.config.allowed_input_dirs[0], "output_format": "xlsx"})
+        assert response.status_code == 400
+
+    def test_in_process_workers_only_with_one_serving_worker(self, store):
+        """Test several uvicorn workers do not each start a job worker pool"""
+        with patch('api.jobs.JobWorkerPool') as mock_pool, patch('api.jobs.worker_pool', None):
+            assert api.jobs.worker_threads(serving_workers=4) == 0
+            api.jobs.start_workers(FakePipeline(), serving_workers=4)
+            mock_pool.assert_not_called()
+            
+            assert api.jobs.worker_threads() == store.config.n_workers
+            api.jobs.start_workers(FakePipeline())
+            assert mock_pool.call_args.args[2] == store.config.n_workers
@@ -0,0 +1,71 @@
+import signal
+import threading
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import Mock, patch
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import api.main
+from api.lifecycle import RequestTracker, install_drain_handler
+
+client = TestClient(api.main.app)
+
+
+@pytest.fixture
+def restore_sigterm():
+    previous = signal.getsignal(signal.SIGTERM)
+    yield
+    signal.signal(signal.SIGTERM, previous)
+
+
+class TestLifecycle:
+
+    def test_middleware_counts_requests(self):
+        """Test served requests are counted and probes are not"""
+        tracker = api.main.lifecycle.tracker
+        served = tracker.served
+        client.get("/api")
+        client.get("/livez")
+        assert tracker.served == served + 1
+        assert tracker.in_flight == 0
+
+    def test_drain_waits_for_in_flight_requests(self, restore_sigterm):
+        """Test SIGTERM flips readiness, waits for in-flight work, then forwards the signal"""
+        tracker = RequestTracker()
+        forwarded = threading.Event()
+        stop_workers = Mock()
+        signal.signal(signal.SIGTERM, lambda signum, frame: forwarded.set())
+        assert install_drain_handler(0.0, 5.0, on_drain=[stop_workers], request_tracker=tracker)
+
+        tracker.start()
+        with patch.object(api.main.lifecycle, "tracker", tracker), \
+             patch.object(api.main, "prediction_pipeline", Mock()), \
+             patch.object(api.main, "ready", True):
+            signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+            response = client.get("/readyz")
+            assert response.status_code == 503
+            assert response.json() == {"status": "not ready", "reason": "draining", "in_flight": 1}
+            assert client.get("/health").json()["status"] == "draining"
+
+        assert not forwarded.wait(0.2)
+        tracker.finish()
+        assert forwarded.wait(5)
+        stop_workers.assert_called_once()
+
+    def test_second_sigterm_forwards_immediately(self, restore_sigterm):
+        """Test a second SIGTERM does not wait for the drain to finish"""
+        tracker = RequestTracker()
+        previous = Mock()
+        signal.signal(signal.SIGTERM, previous)
+        install_drain_handler(60.0, 60.0, request_tracker=tracker)
+
+        handler = signal.getsignal(signal.SIGTERM)
+        handler(signal.SIGTERM, None)
+        assert tracker.draining
+        previous.assert_not_called()
+        handler(signal.SIGTERM, None)
+        previous.assert_called_once_with(signal.SIGTERM, None)
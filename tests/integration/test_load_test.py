@@ -0,0 +1,24 @@
+import pytest
+import asyncio
+import httpx
+from unittest.mock import patch
+from api.main import app
+from benchmarks.load_test import RequestMix, run_load_test, synthesize_payloads
+
+class TestLoadTest:
+    
+    @patch('api.main.prediction_pipeline')
+    def test_closed_loop_report(self, mock_pipeline):
+        """Test a short closed-loop run reports per-endpoint latencies"""
+        mock_pipeline.predict_single.return_value = (1, 0.75)
+        mix = RequestMix(synthesize_payloads(20), batch_ratio=0.5, batch_size=5)
+        
+        report = asyncio.run(run_load_test(
+            "http://test", mix, duration=0.5, concurrency=4,
+            transport=httpx.ASGITransport(app=app)
+        ))
+        
+        assert report['overall']['requests'] > 0
+        assert report['overall']['error_rate'] == 0
+        assert set(report['endpoints']) == {'/predict', '/batch_predict'}
+        assert 'p999' in report['overall']['latency_ms']
@@ -0,0 +1,53 @@
+import gzip
+from fastapi.testclient import TestClient
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from api.main import app
+from api.page_cache import CachedBody
+
+client = TestClient(app)
+
+class TestPageCache:
+
+    def test_compressed_page_and_revalidation(self):
+        """Test pages are served pre-compressed with an ETag and revalidate to 304"""
+        response = client.get("/api", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["cache-control"] == "no-cache"
+        assert "Customer Churn Prediction API" in response.text
+        etag = response.headers["etag"]
+
+        response = client.get("/api", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        response = client.get("/api", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.headers["etag"] != etag
+
+    def test_static_assets_are_cached(self):
+        """Test static assets carry Cache-Control and honour If-None-Match"""
+        response = client.get("/static/js/app.js", headers={"Accept-Encoding": "gzip, br;q=0"})
+        assert response.status_code == 200
+        assert response.headers["cache-control"].startswith("public, max-age=")
+        assert response.headers["content-encoding"] == "gzip"
+        assert "ChurnPredictionApp" in response.text
+
+        response = client.get("/static/js/app.js", headers={"If-None-Match": f'W/{response.headers["etag"]}'})
+        assert response.status_code == 304
+        assert client.get("/static/js/missing.js").status_code == 404
+
+    def test_encoding_negotiation(self):
+        """Test q-values and small bodies"""
+        body = CachedBody.build(b"x" * 1000, "text/html")
+        assert gzip.decompress(body.bodies["gzip"]) == b"x" * 1000
+        assert body._encoding("gzip;q=0, identity") == "identity"
+        assert body._encoding("*") == ("br" if "br" in body.bodies else "gzip")
+        assert body._encoding("") == "identity"
+        assert set(CachedBody.build(b"tiny", "text/html").bodies) == {"identity"}
+        assert set(CachedBody.build(b"x" * 1000, "image/png").bodies) == {"identity"}
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import Mock, patch
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import api.main
+from api.columnar import validate_columns
+from api.warmup import synthetic_features, warm_up
+
+client = TestClient(api.main.app)
+
+class TestWarmup:
+
+    def test_synthetic_features_are_valid(self):
+        """Test synthetic rows pass the CustomerFeatures constraints"""
+        features = synthetic_features(500)
+        assert len(features) == 500
+        validate_columns({name: features[name].tolist() for name in features.columns})
+        assert features['contract_length'].nunique() > 1
+
+    def test_warm_up_exercises_every_path(self):
+        """Test each batch size is scored every round, plus single-row and explain"""
+        pipeline = Mock()
+        pipeline.explain.side_effect = ValueError("unsupported")
+        timings = warm_up(pipeline, [1, 50], rounds=3)
+
+        sizes = [len(call.args[0]) for call in pipeline.predict.call_args_list]
+        assert sizes == [1, 50] * 3
+        assert pipeline.predict_single.call_count == 3
+        assert set(timings) == {"predict_1", "predict_50", "predict_single"}
+        assert warm_up(pipeline, [], rounds=3) == {}
+
+    def test_probes(self):
+        """Test liveness is unconditional and readiness waits for the warmed-up model"""
+        assert client.get("/livez").json() == {"status": "alive"}
+        with patch('api.main.prediction_pipeline', None):
+            response = client.get("/readyz")
+            assert response.status_code == 503
+            assert response.json()["reason"] == "model not loaded"
+        with patch('api.main.prediction_pipeline', Mock()), patch('api.main.ready', False):
+            assert client.get("/readyz").json()["reason"] == "warming up"
+        with patch('api.main.prediction_pipeline', Mock()), patch('api.main.ready', True):
+            assert client.get("/readyz").status_code == 200
+
+    @patch('api.main.ready', False)
+    @patch('api.main.prediction_pipeline', None)
+    @patch('src.pipeline.training_pipeline.TrainingPipeline')
+    @patch('pathlib.Path.exists', return_value=False)
+    def test_startup_without_artifacts_does_not_train(self, mock_exists, mock_training):
+        """Test missing artifacts leave the API unready instead of training in-process"""
+        asyncio.run(api.main.startup_event())
+        mock_training.assert_not_called()
+        assert api.main.prediction_pipeline is None
+        assert client.get("/readyz").status_code == 503
+
+    @patch('api.main.ready', False)
+    @patch('api.main.prediction_pipeline', None)
+    @patch('api.main.decision_policy', api.main.decision_policy)
+    @patch('api.analytics.save_state')
+    @patch('api.main.lifecycle.install_drain_handler')
+    @patch('api.main.jobs')
+    @patch('api.main.ThreadBudget')
+    @patch('api.main.PredictionPipeline')
+    @patch('pathlib.Path.exists', return_value=True)
+    def test_live_while_warming_up(self, *mocks):
+        """Test startup returns before warm-up, so /livez answers while /readyz reports warming up"""
+        release = threading.Event()
+        with patch('api.warmup.warm_up', side_effect=lambda *args: release.wait(10)):
+            with TestClient(api.main.app) as live_client:
+                assert live_client.get("/livez").status_code == 200
+                response = live_client.get("/readyz")
+                assert response.status_code == 503
+                assert response.json()["reason"] == "warming up"
+                
+                release.set()
+                deadline = time.monotonic() + 5
+                while live_client.get("/readyz").status_code != 200:
+                    assert time.monotonic() < deadline
+                    time.sleep(0.01)
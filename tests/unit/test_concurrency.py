@@ -0,0 +1,69 @@
+import os
+import pytest
+from unittest.mock import patch
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from src.config.configuration import ConcurrencyConfig, ModelTrainingConfig
+from src.models.model_trainer import ModelTrainer
+from src.utils.concurrency import ThreadBudget, available_cpus, set_n_jobs
+
+
+class TestConcurrency:
+
+    def test_budgets_split_the_cores(self):
+        """Test each role gets an explicit share of the configured cores"""
+        config = ConcurrencyConfig(cpus=8, serving_workers=4, serving_threads=1)
+        serving = ThreadBudget.for_serving(config, job_workers=1)
+        assert (serving.cpus, serving.lanes, serving.threads) == (2, 2, 1)
+
+        scoring = ThreadBudget.for_scoring(config, workers=3)
+        assert (scoring.cpus, scoring.lanes, scoring.threads) == (8, 3, 2)
+        assert ThreadBudget.for_scoring(ConcurrencyConfig(cpus=8, scoring_threads=1), 3).threads == 1
+
+        assert ThreadBudget.for_training(config).threads == 8
+        assert ThreadBudget.for_training(ConcurrencyConfig(cpus=8, training_threads=16)).threads == 8
+
+    def test_n_jobs_resolved_against_budget(self):
+        """Test joblib-style n_jobs resolve to the budgeted cores, not the machine's"""
+        budget = ThreadBudget("training", cpus=4, threads=4)
+        assert budget.n_jobs(-1) == 4
+        assert budget.n_jobs(-2) == 3
+        assert budget.n_jobs(16) == 4
+        assert budget.n_jobs(2) == 2
+        assert budget.n_jobs(0) == 1
+
+    def test_available_cpus_respects_cgroup_quota(self):
+        """Test a container CPU quota caps the cores seen through affinity"""
+        with patch('src.utils.concurrency._cgroup_cpu_quota', return_value=1.5), \
+             patch('os.sched_getaffinity', return_value=set(range(16)), create=True):
+            assert available_cpus() == 2
+        with patch('src.utils.concurrency._cgroup_cpu_quota', return_value=None), \
+             patch('os.sched_getaffinity', return_value={0, 1, 2}, create=True):
+            assert available_cpus() == 3
+
+    def test_set_n_jobs_reaches_nested_estimators(self):
+        """Test n_jobs is set on the estimator and inside pipelines"""
+        model = make_pipeline(StandardScaler(), RandomForestClassifier(n_jobs=-1))
+        set_n_jobs(model, 2)
+        assert model.get_params()['randomforestclassifier__n_jobs'] == 2
+        assert set_n_jobs(StandardScaler(), 2).get_params() == StandardScaler().get_params()
+        assert set_n_jobs(RandomForestClassifier(), 2, only_parallel=True).n_jobs is None
+
+    def test_apply_caps_native_pools(self):
+        """Test apply limits threadpools and exports the limit to child processes"""
+        with patch('src.utils.concurrency.threadpool_limits') as mock_limits, patch.dict(os.environ):
+            ThreadBudget("scoring", cpus=4, lanes=2, threads=2).apply()
+            mock_limits.assert_called_once_with(limits=2)
+            assert os.environ["OMP_NUM_THREADS"] == "2"
+            assert os.environ["OPENBLAS_NUM_THREADS"] == "2"
+
+    def test_model_trainer_uses_training_budget(self):
+        """Test the forest gets the training budget as n_jobs"""
+        config = ModelTrainingConfig(
+            model_name="RandomForestClassifier", hyperparameters={"n_jobs": -1}, target_column="churn"
+        )
+        trainer = ModelTrainer(config, budget=ThreadBudget("training", cpus=3, threads=3))
+        assert trainer.models["RandomForestClassifier"].n_jobs == 3
+        assert trainer.models["LogisticRegression"].n_jobs is None
+        assert ModelTrainer(config).models["RandomForestClassifier"].n_jobs == -1
@@ -0,0 +1,72 @@
+import pytest
+import numpy as np
+from pathlib import Path
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+from src.config.configuration import ModelTrainingConfig
+from src.data.data_transformation import DataTransformation
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.models.cross_validation import CrossValidator, SELECTION_METRICS
+from src.models.model_trainer import ModelTrainer
+
+class TestCrossValidation:
+    
+    @pytest.fixture
+    def models(self):
+        return {
+            "LogisticRegression": LogisticRegression(max_iter=1000),
+            "DecisionTreeClassifier": DecisionTreeClassifier(max_depth=3, random_state=0),
+        }
+    
+    def test_prepare_folds_caches_transformed_matrices(self, sample_data, temp_dir):
+        """Test each fold is preprocessed once and stored as a memory-mappable array"""
+        X = FEATURE_SCHEMA.select(sample_data)
+        preprocessor = DataTransformation().get_data_transformer()
+        folds = CrossValidator(n_splits=4).prepare_folds(X, sample_data['churn'], preprocessor, temp_dir)
+        
+        assert folds == [0, 1, 2, 3]
+        val_rows = 0
+        for fold in folds:
+            X_val = np.load(Path(temp_dir) / f"fold{fold}_X_val.npy", mmap_mode="r")
+            assert isinstance(X_val, np.memmap)
+            val_rows += len(X_val)
+        assert val_rows == len(sample_data)
+        
+    def test_evaluate_reports_every_candidate(self, sample_data, models):
+        """Test parallel evaluation returns mean and spread of each metric per candidate"""
+        X = FEATURE_SCHEMA.select(sample_data)
+        preprocessor = DataTransformation().get_data_transformer()
+        weights = np.ones(len(sample_data))
+        results = CrossValidator(n_splits=3, n_jobs=2).evaluate(
+            models, X, sample_data['churn'], preprocessor, sample_weight=weights
+        )
+        
+        assert set(results) == set(models)
+        for scores in results.values():
+            for metric in SELECTION_METRICS:
+                assert 0.0 <= scores[f"cv_{metric}_mean"] <= 1.0
+                assert scores[f"cv_{metric}_std"] >= 0.0
+        
+    def test_inner_threads_cap_fold_workers(self, sample_data, models):
+        """Test candidates are fit with the per-worker thread cap without touching the originals"""
+        X = FEATURE_SCHEMA.select(sample_data)
+        preprocessor = DataTransformation().get_data_transformer()
+        models["RandomForestClassifier"] = RandomForestClassifier(n_estimators=5, n_jobs=-1, random_state=0)
+        results = CrossValidator(n_splits=3, n_jobs=2, inner_threads=1).evaluate(
+            models, X, sample_data['churn'], preprocessor
+        )
+        
+        assert set(results) == set(models)
+        assert models["RandomForestClassifier"].n_jobs == -1
+        
+    def test_invalid_configuration(self):
+        """Test unknown selection metrics and single folds are rejected"""
+        with pytest.raises(ValueError):
+            CrossValidator(n_splits=1)
+        config = ModelTrainingConfig(
+            model_name="RandomForestClassifier", hyperparameters={},
+            target_column="churn", selection_metric="log_loss"
+        )
+        with pytest.raises(ValueError):
+            ModelTrainer(config)
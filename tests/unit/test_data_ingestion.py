@@ -26,6 +26,32 @@ class TestDataIngestion:
         assert 'customer_id' in df.columns
         assert df['churn'].nunique() == 2  # Binary target
         
+    def test_sample_data_is_independent_of_chunking(self, temp_dir):
+        """Test chunked and sharded generation reproduce the same rows"""
+        config = DataIngestionConfig(
+            raw_data_path="test_data.csv",
+            processed_data_path="processed/",
+            test_size=0.2,
+            random_state=42
+        )
+        
+        data_ingestion = DataIngestion(config)
+        df = data_ingestion.generate_sample_data(n_samples=250000)
+        chunked = pd.concat(data_ingestion.iter_sample_data(n_samples=250000, chunk_size=70000), ignore_index=True)
+        paths = data_ingestion.write_sample_data(temp_dir, n_samples=250000, rows_per_shard=90000, file_format="csv")
+        sharded = pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+        
+        assert len(df) == 250000
+        pd.testing.assert_frame_equal(df, chunked)
+        pd.testing.assert_frame_equal(df[['customer_id', 'contract_length', 'churn']], sharded[['customer_id', 'contract_length', 'churn']])
+        
+        # Small ranges and small chunks are slices of the same rows
+        pd.testing.assert_frame_equal(data_ingestion.generate_rows(99990, 100010), df.iloc[99990:100010].reset_index(drop=True))
+        small_chunks = pd.concat(data_ingestion.iter_sample_data(n_samples=5000, chunk_size=333), ignore_index=True)
+        pd.testing.assert_frame_equal(small_chunks, df.iloc[:5000])
+        assert len(data_ingestion.generate_sample_data(n_samples=1)) == 1
+        assert len(data_ingestion.generate_sample_data(n_samples=0)) == 0
+        
     def test_data_ingestion_pipeline(self, temp_dir):
         """Test complete data ingestion pipeline"""
         config = DataIngestionConfig(
@@ -48,3 +74,48 @@ class TestDataIngestion:
         
         total_samples = len(train_df) + len(test_df)
         assert abs(len(test_df) / total_samples - 0.2) < 0.01  # Approximately 20% test
+        
+    def test_sharded_ingestion_pipeline(self, temp_dir):
+        """Test sharded ingestion splits by customer_id hash across byte ranges"""
+        config = DataIngestionConfig(
+            raw_data_path=f"{temp_dir}/raw_data.csv",
+            processed_data_path=f"{temp_dir}/processed/",
+            test_size=0.2,
+            random_state=42,
+            chunk_bytes=50000
+        )
+        
+        data_ingestion = DataIngestion(config)
+        train_path, test_path = data_ingestion.initiate_sharded_ingestion()
+        
+        raw_df = pd.read_csv(config.raw_data_path)
+        train_df = pd.concat([pd.read_csv(p) for p in sorted(Path(train_path).glob("*.csv"))])
+        test_df = pd.concat([pd.read_csv(p) for p in sorted(Path(test_path).glob("*.csv"))])
+        
+        ids = pd.concat([train_df['customer_id'], test_df['customer_id']])
+        assert len(ids) == len(raw_df) and ids.is_unique
+        assert abs(len(test_df) / len(raw_df) - 0.2) < 0.02
+        assert abs(test_df['churn'].mean() - train_df['churn'].mean()) < 0.03
+        
+    def test_sharded_ingestion_skips_empty_ranges(self, temp_dir):
+        """Test a range starting inside the last line, a header-only CSV and an empty shard yield no rows"""
+        raw_dir = Path(temp_dir) / "raw"
+        raw_dir.mkdir()
+        df = pd.DataFrame({'customer_id': range(1, 11), 'age': range(30, 40), 'churn': [0, 1] * 5})
+        df.to_csv(raw_dir / "customers.csv", index=False)
+        df.head(0).to_csv(raw_dir / "header_only.csv", index=False)
+        df.head(0).to_parquet(raw_dir / "empty.parquet", index=False)
+        config = DataIngestionConfig(
+            raw_data_path=str(raw_dir),
+            processed_data_path=f"{temp_dir}/processed/",
+            test_size=0.2,
+            random_state=42,
+            chunk_bytes=(raw_dir / "customers.csv").stat().st_size - 5,
+            n_jobs=1
+        )
+        
+        train_path, test_path = DataIngestion(config).initiate_sharded_ingestion()
+        
+        parts = sorted(Path(train_path).glob("*.csv")) + sorted(Path(test_path).glob("*.csv"))
+        ingested = pd.concat([pd.read_csv(p) for p in parts])
+        assert sorted(ingested['customer_id']) == list(range(1, 11))
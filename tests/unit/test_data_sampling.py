@@ -0,0 +1,54 @@
+import pytest
+import pandas as pd
+from pathlib import Path
+from src.config.configuration import DataSamplingConfig
+from src.data.data_sampling import DataSampling
+
+class TestDataSampling:
+    
+    @pytest.fixture
+    def split_paths(self, sample_data, temp_dir):
+        train_path = Path(temp_dir) / "train.csv"
+        test_path = Path(temp_dir) / "test.csv"
+        sample_data.to_csv(train_path, index=False)
+        sample_data.to_csv(test_path, index=False)
+        return str(train_path), str(test_path)
+    
+    def test_reservoir_sample_size(self, split_paths):
+        """Test reservoir sampling keeps a fixed number of rows across chunks"""
+        config = DataSamplingConfig(strategy="reservoir", reservoir_size=30, chunk_size=7)
+        train_path, _ = DataSampling(config).initiate_data_sampling(*split_paths)
+        
+        df = pd.read_csv(train_path)
+        assert len(df) == 30
+        assert df['customer_id'].is_unique
+        
+    def test_stratified_sample_keeps_class_ratio(self, sample_data, split_paths):
+        """Test stratified sampling keeps the requested share of each class"""
+        config = DataSamplingConfig(strategy="stratified", fraction=0.5, chunk_size=9)
+        train_path, _ = DataSampling(config).initiate_data_sampling(*split_paths)
+        
+        counts = pd.read_csv(train_path)['churn'].value_counts()
+        expected = sample_data['churn'].value_counts()
+        for c in expected.index:
+            assert counts[c] == round(expected[c] * 0.5)
+        
+    def test_downsample_weights_restore_class_totals(self, sample_data, split_paths):
+        """Test negative downsampling weights and leaves the test split intact"""
+        config = DataSamplingConfig(strategy="downsample", negative_fraction=0.25)
+        sampling = DataSampling(config)
+        train_path, test_path = sampling.initiate_data_sampling(*split_paths)
+        
+        df = pd.read_csv(train_path)
+        assert (df['churn'] == 1).sum() == (sample_data['churn'] == 1).sum()
+        assert set(df.loc[df['churn'] == 0, 'sample_weight']) == {4.0}
+        assert len(pd.read_csv(test_path)) == len(sample_data)
+        assert sampling.get_params()['sampling_strategy'] == "downsample"
+        
+    @pytest.mark.parametrize("fractions", [
+        {"negative_fraction": 0}, {"negative_fraction": 1.5}, {"fraction": 0}, {"fraction": -0.1}
+    ])
+    def test_rejects_fractions_outside_unit_interval(self, fractions):
+        """Test zero, negative and above-one fractions fail when the sampler is built"""
+        with pytest.raises(ValueError, match="must be in \\(0, 1\\]"):
+            DataSampling(DataSamplingConfig(strategy="downsample", **fractions))
@@ -0,0 +1,32 @@
+import pytest
+import json
+import pandas as pd
+from pathlib import Path
+from src.data.data_validation import DataValidation
+
+class TestDataValidation:
+    
+    def test_validate_data_quality_is_json_serializable(self, sample_data):
+        """Test quality report counts duplicates and serializes to JSON"""
+        df = pd.concat([sample_data, sample_data.iloc[:3]])
+        report = DataValidation().validate_data_quality(df)
+        
+        assert report['total_rows'] == 103
+        assert report['duplicate_rows'] == 3
+        assert 'customer_id_outliers' not in report
+        json.dumps(report)
+        
+    def test_chunked_matches_in_memory(self, sample_data, temp_dir):
+        """Test chunked validation agrees with the in-memory report"""
+        data_path = Path(temp_dir) / "data.csv"
+        pd.concat([sample_data, sample_data.iloc[:7]]).to_csv(data_path, index=False)
+        
+        validation = DataValidation()
+        expected = validation.validate_data_quality(pd.read_csv(data_path))
+        report = validation.validate_data_quality_chunked(str(data_path), chunksize=17, partition_bits=3)
+        
+        assert report['total_rows'] == expected['total_rows']
+        assert report['duplicate_rows'] == expected['duplicate_rows'] == 7
+        assert report['missing_values'] == expected['missing_values']
+        for col in validation.schema.numeric_features:
+            assert report[f'{col}_outliers'] == expected[f'{col}_outliers']
@@ -0,0 +1,87 @@
+import pytest
+import mlflow
+import numpy as np
+from pathlib import Path
+from unittest.mock import patch
+from sklearn.linear_model import LogisticRegression
+from src.config.configuration import ModelTrainingConfig
+from src.models.experiment_tracker import BackgroundMlflowLogger
+from src.models.model_trainer import ModelTrainer
+
+class TestBackgroundMlflowLogger:
+    
+    def test_queued_logs_are_written_on_close(self, temp_dir):
+        """Test params, metrics and a model artifact land after close"""
+        mlflow.set_tracking_uri(Path(temp_dir).as_uri())
+        try:
+            tracker = BackgroundMlflowLogger("test_experiment")
+            run_id = tracker.start_run("candidate")
+            tracker.log_params(run_id, {f"param_{i}": i for i in range(150)})
+            tracker.log_metrics(run_id, {"accuracy": 0.9})
+            tracker.log_model(run_id, LogisticRegression().fit([[0], [1]], [0, 1]))
+            tracker.log_text(run_id, "data_ingestion: rss_mb=100.0\n", "memory_report.txt")
+            tracker.end_run(run_id)
+            tracker.close()
+            
+            run = tracker.client.get_run(run_id)
+            assert not tracker.errors
+            assert run.data.metrics["accuracy"] == 0.9
+            assert len(run.data.params) == 150
+            assert run.info.status == "FINISHED"
+            assert sorted(a.path for a in tracker.client.list_artifacts(run_id)) == ["memory_report.txt", "model"]
+        finally:
+            mlflow.set_tracking_uri(None)
+
+    def test_unavailable_tracking_store_is_a_no_op(self):
+        """Test a tracking outage disables logging instead of raising"""
+        with patch("src.models.experiment_tracker.MlflowClient", side_effect=ConnectionError("down")):
+            tracker = BackgroundMlflowLogger("test_experiment")
+        run_id = tracker.start_run("candidate")
+        tracker.log_metrics(run_id, {"accuracy": 0.9})
+        tracker.end_run(run_id)
+        tracker.close()
+        
+        assert run_id is None
+        assert len(tracker.errors) == 1
+        
+    def test_failed_training_ends_runs(self, temp_dir):
+        """Test runs are marked FAILED and the queue is flushed when training raises"""
+        mlflow.set_tracking_uri(Path(temp_dir).as_uri())
+        try:
+            config = ModelTrainingConfig(
+                model_name="RandomForestClassifier", hyperparameters={"n_estimators": 5},
+                target_column="churn"
+            )
+            trainer = ModelTrainer(config, experiment_name="test_experiment")
+            X, y = np.random.RandomState(0).rand(40, 3), np.arange(40) % 2
+            with patch.object(trainer, "evaluate_model", side_effect=RuntimeError("boom")):
+                with pytest.raises(RuntimeError):
+                    trainer.initiate_model_trainer(X, y, X, y)
+            
+            client = mlflow.tracking.MlflowClient()
+            experiment = client.get_experiment_by_name("test_experiment")
+            runs = client.search_runs([experiment.experiment_id])
+            assert len(runs) == len(trainer.models)
+            assert {run.info.status for run in runs} == {"FAILED"}
+            assert all(run.data.params for run in runs)
+        finally:
+            mlflow.set_tracking_uri(None)
+
+    def test_rejected_batches_are_dropped_and_close_returns(self, temp_dir):
+        """Test a failing log_batch is not resent and the final flush error still stops the thread"""
+        mlflow.set_tracking_uri(Path(temp_dir).as_uri())
+        try:
+            tracker = BackgroundMlflowLogger("test_experiment", close_timeout=10)
+            run_id = tracker.start_run("candidate")
+            with patch.object(tracker.client, "log_batch", side_effect=RuntimeError("rejected")) as log_batch:
+                tracker.log_params(run_id, {"n_estimators": 5})
+                tracker.end_run(run_id)
+                tracker.log_metrics(run_id, {"accuracy": 0.9})
+                tracker.close()
+            
+            assert not tracker.thread.is_alive()
+            assert log_batch.call_count == 2
+            assert len(tracker.errors) == 2
+            assert tracker.client.get_run(run_id).info.status == "FINISHED"
+        finally:
+            mlflow.set_tracking_uri(None)
@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import SVC
+from src.data.data_transformation import DataTransformation
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.models.explainer import ModelExplainer
+
+class TestModelExplainer:
+
+    @pytest.fixture
+    def fitted(self, sample_data):
+        preprocessor = DataTransformation().get_data_transformer()
+        features = FEATURE_SCHEMA.select(sample_data)
+        X = preprocessor.fit_transform(features)
+        return preprocessor, features, X, sample_data['churn']
+
+    @pytest.mark.parametrize("model", [
+        RandomForestClassifier(n_estimators=20, max_depth=4, random_state=0),
+        LogisticRegression(max_iter=1000),
+    ])
+    def test_contributions_sum_to_prediction(self, fitted, model):
+        """Test base value plus contributions reproduces predict_proba for every row"""
+        preprocessor, features, X, y = fitted
+        model.fit(X, y)
+        ModelExplainer.fit_baseline(model, X)
+        explanations = ModelExplainer(model, preprocessor).explain(features)
+
+        probabilities = model.predict_proba(X)[:, 1]
+        for explanation, probability in zip(explanations, probabilities):
+            assert explanation['churn_probability'] == pytest.approx(probability)
+            assert set(explanation['contributions']) == set(FEATURE_SCHEMA.feature_names)
+
+    def test_linear_contributions_are_exact(self, fitted):
+        """Test logistic-regression contributions equal coefficient times deviation from the baseline"""
+        preprocessor, features, X, y = fitted
+        model = ModelExplainer.fit_baseline(LogisticRegression(max_iter=1000).fit(X, y), X)
+        contributions = ModelExplainer(model, preprocessor).contributions(X[:1])
+
+        age = FEATURE_SCHEMA.feature_names.index('age')
+        expected = model.coef_[0, age] * (X[0, age] - model.explanation_baseline_[age])
+        assert contributions[0, age] == pytest.approx(expected)
+
+    def test_unsupported_model(self, fitted):
+        """Test models without a contribution method are rejected"""
+        preprocessor, _, X, y = fitted
+        with pytest.raises(ValueError):
+            ModelExplainer(SVC().fit(X, y), preprocessor)
+
+    def test_weighted_baseline(self, fitted):
+        """Test the baseline is the sample-weighted mean transformed row"""
+        preprocessor, features, X, y = fitted
+        weights = np.where(y == 0, 4.0, 1.0)
+        model = ModelExplainer.fit_baseline(LogisticRegression(max_iter=1000).fit(X, y), X, sample_weight=weights)
+        dense = X.toarray() if hasattr(X, "toarray") else X
+        np.testing.assert_allclose(model.explanation_baseline_, np.average(dense, axis=0, weights=weights))
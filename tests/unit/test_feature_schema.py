@@ -0,0 +1,25 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.data.data_transformation import DataTransformation
+
+class TestFeatureSchema:
+    
+    def test_to_frame_uses_declared_dtypes(self, sample_features):
+        """Test typed frame construction from a single record"""
+        df = FEATURE_SCHEMA.to_frame(sample_features)
+        
+        assert list(df.columns) == FEATURE_SCHEMA.feature_names
+        assert df['age'].dtype == np.float64
+        assert df['contract_length'].dtype == np.int64
+        assert pd.api.types.is_string_dtype(df['payment_method'])
+        
+    def test_transformer_is_independent_of_frame_dtypes(self, sample_data):
+        """Test preprocessor output width is fixed by the schema vocabularies"""
+        transformer = DataTransformation().get_data_transformer()
+        X = FEATURE_SCHEMA.select(sample_data)
+        transformed = transformer.fit_transform(X)
+        
+        n_categories = sum(len(FEATURE_SCHEMA.vocabulary(c)) for c in FEATURE_SCHEMA.categorical_features)
+        assert transformed.shape == (len(sample_data), len(FEATURE_SCHEMA.numeric_features) + n_categories)
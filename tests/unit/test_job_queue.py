@@ -0,0 +1,156 @@
+import pytest
+import time
+import numpy as np
+import pandas as pd
+from src.config.configuration import JobsConfig
+from src.models.threshold_optimizer import DecisionPolicy
+from src.monitoring.performance_monitor import PerformanceMonitor
+from src.pipeline.job_queue import BatchScoringWorker, JobStore, count_rows
+
+class FakePipeline:
+    decision_policy = DecisionPolicy()
+
+    def __init__(self):
+        self.rows_scored = 0
+
+    def predict(self, features):
+        self.rows_scored += len(features)
+        probabilities = features['age'].to_numpy() / 100
+        return self.decision_policy.predict(probabilities), probabilities
+
+class WorkerCrash(BaseException):
+    pass
+
+class TestJobQueue:
+
+    @pytest.fixture
+    def store(self, temp_dir):
+        config = JobsConfig(jobs_dir=f"{temp_dir}/jobs", chunk_size=30, allowed_input_dirs=[temp_dir])
+        return JobStore(config)
+
+    @pytest.fixture
+    def input_path(self, sample_data, temp_dir):
+        path = f"{temp_dir}/customers.csv"
+        sample_data.to_csv(path, index=False)
+        return path
+
+    def test_count_rows(self, sample_data, input_path, temp_dir):
+        """Test row counts for CSV with and without a trailing newline and Parquet"""
+        assert count_rows(input_path) == len(sample_data)
+        with open(input_path, "rb+") as f:
+            f.truncate(f.seek(0, 2) - 1)
+        assert count_rows(input_path) == len(sample_data)
+        sample_data.to_parquet(f"{temp_dir}/customers.parquet", index=False)
+        assert count_rows(f"{temp_dir}/customers.parquet") == len(sample_data)
+
+    def test_scores_in_chunks(self, store, input_path, sample_data):
+        """Test a job scores every row, reports progress and pages results"""
+        job = store.create(input_path)
+        assert BatchScoringWorker(store, FakePipeline()).run_once()
+
+        job = store.get(job['id'])
+        assert job['status'] == "completed"
+        assert (job['total_rows'], job['rows_done'], job['chunks_done']) == (100, 100, 4)
+        assert job['progress'] == 1.0
+
+        result = pd.read_parquet(job['result_path'])
+        assert list(result.columns) == ['customer_id', 'churn_prediction', 'churn_probability', 'risk_level']
+        np.testing.assert_allclose(result['churn_probability'], sample_data['age'] / 100)
+
+        page = store.read_results(job['id'], offset=25, limit=10)
+        assert page['customer_id'].tolist() == list(range(26, 36))
+
+    def test_records_scored_customers_for_monitoring(self, store, input_path, sample_data):
+        """Test scored rows wait in the performance monitor for their churn labels"""
+        store.create(input_path)
+        monitor = PerformanceMonitor(min_samples=1)
+        assert BatchScoringWorker(store, FakePipeline(), monitor=monitor).run_once()
+
+        assert len(monitor.pending) == len(sample_data)
+        assert monitor.record_labels(zip(sample_data['customer_id'], sample_data['churn'])) == len(sample_data)
+        assert monitor.metrics()['samples'] == len(sample_data)
+
+    def test_resumes_after_crash(self, store, input_path, sample_data):
+        """Test a stale job is reclaimed and only its unfinished chunks are scored"""
+        job = store.create(input_path, output_format="csv")
+        crashed = BatchScoringWorker(store, FakePipeline())
+        claimed = store.claim(crashed.worker_id)
+        scored_chunks = []
+        def score_then_crash(chunk, score=crashed.score_chunk):
+            if scored_chunks:
+                raise WorkerCrash()
+            scored_chunks.append(len(chunk))
+            return score(chunk)
+        crashed.score_chunk = score_then_crash
+        with pytest.raises(WorkerCrash):
+            crashed.process(claimed)
+        assert store.get(job['id'])['chunks_done'] == 1
+
+        # Running and heartbeating jobs are not claimable
+        assert store.claim("other") is None
+        store.config.heartbeat_timeout = -1
+        pipeline = FakePipeline()
+        assert BatchScoringWorker(store, pipeline).run_once()
+
+        job = store.get(job['id'])
+        assert job['status'] == "completed"
+        assert pipeline.rows_scored == 70
+        result = pd.read_csv(job['result_path'])
+        assert result['customer_id'].tolist() == sample_data['customer_id'].tolist()
+
+    def test_heartbeat_keeps_slow_job_claimed(self, store, input_path):
+        """Test a job whose chunk outlives heartbeat_timeout is not handed to a second worker"""
+        store.config.heartbeat_timeout = 0.3
+        job = store.create(input_path)
+        worker = BatchScoringWorker(store, FakePipeline())
+        claimed_meanwhile = []
+        def slow_score(chunk, score=worker.score_chunk):
+            if not claimed_meanwhile:
+                time.sleep(1.0)
+                claimed_meanwhile.append(store.claim("other"))
+            return score(chunk)
+        worker.score_chunk = slow_score
+        worker.process(store.claim(worker.worker_id))
+
+        assert claimed_meanwhile == [None]
+        job = store.get(job['id'])
+        assert (job['status'], job['worker_id'], job['rows_done']) == ("completed", worker.worker_id, 100)
+
+    def test_reclaimed_job_is_left_to_its_new_owner(self, store, input_path):
+        """Test a worker that lost its job can neither finish it nor overwrite its row count"""
+        job = store.create(input_path)
+        stale = BatchScoringWorker(store, FakePipeline())
+        claimed = store.claim(stale.worker_id)
+        store.config.heartbeat_timeout = -1
+        assert store.claim("new-owner")['worker_id'] == "new-owner"
+
+        assert not store.heartbeat(job['id'], stale.worker_id)
+        assert not store.set_total_rows(job['id'], stale.worker_id, 5)
+        assert not store.finish(job['id'], stale.worker_id, "failed", error="stale")
+        stale.process(claimed)
+        job = store.get(job['id'])
+        assert (job['status'], job['worker_id'], job['error']) == ("running", "new-owner", None)
+        assert job['total_rows'] is None
+
+    def test_stop_releases_job(self, store, input_path):
+        """Test a stopped worker requeues its job and keeps the finished chunks"""
+        job = store.create(input_path)
+        worker = BatchScoringWorker(store, FakePipeline())
+        worker.score_chunk = lambda chunk, score=worker.score_chunk: worker.stop_event.set() or score(chunk)
+        worker.process(store.claim(worker.worker_id))
+
+        job = store.get(job['id'])
+        assert (job['status'], job['chunks_done']) == ("queued", 1)
+        pipeline = FakePipeline()
+        assert BatchScoringWorker(store, pipeline).run_once()
+        assert store.get(job['id'])['status'] == "completed"
+        assert pipeline.rows_scored == 70
+
+    def test_rejects_paths_outside_allowed_dirs(self, store):
+        """Test inputs must exist under the configured directories"""
+        with pytest.raises(ValueError, match="must be inside"):
+            store.create("/etc/passwd")
+        with pytest.raises(ValueError, match="does not exist"):
+            store.create(f"{store.config.allowed_input_dirs[0]}/missing.csv")
+        with pytest.raises(ValueError, match="Unknown output format"):
+            store.create(store.config.allowed_input_dirs[0], output_format="xlsx")
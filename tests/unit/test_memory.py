@@ -0,0 +1,49 @@
+import tracemalloc
+import numpy as np
+import pytest
+from src.utils.memory import MemoryProfiler, track_memory
+
+
+class TestMemory:
+
+    def test_track_memory_measures_block(self):
+        """Test a block's traced peak and retained allocations"""
+        with track_memory(top=3) as memory:
+            transient = np.ones(4 * 2 ** 20 // 8)
+            del transient
+            kept = np.ones(2 ** 20 // 8)
+
+        assert memory['traced_peak_mb'] >= 4
+        assert 1 <= memory['retained_mb'] < 2
+        assert memory['top_allocators'][0]['size_mb'] >= 1
+        assert not tracemalloc.is_tracing()
+        assert len(kept) == 2 ** 17
+
+    def test_nested_blocks_keep_outer_peak(self):
+        """Test an inner block resetting the peaks does not hide the outer block's earlier peak"""
+        with track_memory() as outer:
+            transient = np.ones(8 * 2 ** 20 // 8)
+            del transient
+            with track_memory() as inner:
+                small = np.ones(1024)
+
+        assert outer['traced_peak_mb'] >= 8
+        assert inner['traced_peak_mb'] < 1
+        assert len(small) == 1024
+
+    def test_memory_profiler_stages(self):
+        """Test per-stage metrics are flattened for MLflow and reported with allocators"""
+        profiler = MemoryProfiler(top=2)
+        with profiler.stage("transform"):
+            data = [bytearray(1024) for _ in range(1000)]
+        with profiler.stage("train"):
+            pass
+
+        metrics = profiler.metrics()
+        assert metrics["memory.transform.retained_mb"] >= 0.9
+        assert "memory.train.traced_peak_mb" in metrics
+        assert all(isinstance(value, float) for value in metrics.values())
+        report = profiler.report()
+        assert report.startswith("transform: ")
+        assert "test_memory.py" in report
+        assert len(data) == 1000
@@ -0,0 +1,73 @@
+import pytest
+import joblib
+import numpy as np
+from pathlib import Path
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import (
+    average_precision_score, classification_report, confusion_matrix,
+    precision_recall_curve, roc_auc_score
+)
+from src.data.data_transformation import DataTransformation
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.models.model_evaluation import ModelEvaluation, ThresholdCurves, metrics_from_confusion
+
+class TestModelEvaluation:
+
+    @pytest.fixture
+    def scores(self):
+        rng = np.random.default_rng(0)
+        y_true = rng.integers(0, 2, 500)
+        # Rounded scores so ties are exercised
+        y_score = np.round(np.clip(0.3 * y_true + rng.random(500) * 0.7, 0, 1), 2)
+        return y_true, y_score
+
+    def test_curves_match_sklearn(self, scores):
+        """Test areas and curve points from one sort agree with sklearn"""
+        y_true, y_score = scores
+        curves = ThresholdCurves.from_scores(y_true, y_score)
+
+        assert curves.roc_auc() == pytest.approx(roc_auc_score(y_true, y_score))
+        assert curves.average_precision() == pytest.approx(average_precision_score(y_true, y_score))
+        precision, recall, thresholds = precision_recall_curve(y_true, y_score)
+        # sklearn orders thresholds ascending and appends the (recall=0, precision=1) point
+        np.testing.assert_allclose(curves.thresholds, thresholds[::-1])
+        np.testing.assert_allclose(curves.precision, precision[:-1][::-1])
+        np.testing.assert_allclose(curves.recall, recall[:-1][::-1])
+
+    def test_confusion_and_report_match_sklearn(self, scores):
+        """Test counts at a threshold and the derived report agree with sklearn"""
+        y_true, y_score = scores
+        curves = ThresholdCurves.from_scores(y_true, y_score)
+        for threshold in (0.0, 0.35, 0.5, 0.99, 1.5):
+            y_pred = (y_score >= threshold).astype(int)
+            counts = curves.confusion_at(threshold)
+            (tn, fp), (fn, tp) = confusion_matrix(y_true, y_pred, labels=[0, 1])
+            assert counts == {'tn': tn, 'fp': fp, 'fn': fn, 'tp': tp}
+
+        y_pred = (y_score >= 0.5).astype(int)
+        expected = classification_report(y_true, y_pred, output_dict=True)
+        report = metrics_from_confusion(**curves.confusion_at(0.5))['classification_report']
+        for label in ('0', '1', 'macro avg', 'weighted avg'):
+            for key in ('precision', 'recall', 'f1-score'):
+                assert report[label][key] == pytest.approx(expected[label][key])
+        assert report['accuracy'] == pytest.approx(expected['accuracy'])
+
+    def test_evaluate_model_is_headless(self, sample_data, temp_dir):
+        """Test evaluation and report saving work without plotting libraries"""
+        transformation = DataTransformation()
+        preprocessor = transformation.get_data_transformer()
+        X = FEATURE_SCHEMA.select(sample_data)
+        model = LogisticRegression().fit(preprocessor.fit_transform(X), sample_data['churn'])
+        model_path = Path(temp_dir) / "model.pkl"
+        preprocessor_path = Path(temp_dir) / "preprocessor.pkl"
+        joblib.dump(model, model_path)
+        joblib.dump(preprocessor, preprocessor_path)
+
+        evaluation = ModelEvaluation(str(model_path), str(preprocessor_path))
+        result = evaluation.evaluate_model(X, sample_data['churn'])
+
+        assert result['confusion_matrix'].sum() == len(sample_data)
+        assert result['metrics']['roc_auc'] == pytest.approx(
+            roc_auc_score(sample_data['churn'], result['probabilities'])
+        )
+        assert Path(evaluation.save_report(result, str(Path(temp_dir) / "evaluation.json"))).exists()
@@ -0,0 +1,91 @@
+import threading
+import pytest
+import numpy as np
+from sklearn.metrics import roc_auc_score, accuracy_score
+from src.monitoring.performance_monitor import PerformanceMonitor
+
+class TestPerformanceMonitor:
+    
+    def test_window_metrics_match_batch_metrics(self):
+        """Test incremental window metrics agree with sklearn on the last window"""
+        rng = np.random.default_rng(0)
+        probabilities = rng.random(500)
+        labels = (rng.random(500) < probabilities).astype(int)
+        
+        monitor = PerformanceMonitor(window_size=200, n_bins=1000)
+        for i, (p, y) in enumerate(zip(probabilities, labels)):
+            monitor.record_prediction(i, p)
+            assert monitor.record_label(i, y)
+        
+        metrics = monitor.metrics()
+        window_p, window_y = probabilities[-200:], labels[-200:]
+        assert metrics['samples'] == 200
+        assert metrics['accuracy'] == pytest.approx(accuracy_score(window_y, window_p >= 0.5))
+        assert metrics['roc_auc'] == pytest.approx(roc_auc_score(window_y, window_p), abs=0.01)
+        
+    def test_alert_when_below_threshold(self):
+        """Test alert fires once the metric drops below the threshold"""
+        alerts = []
+        monitor = PerformanceMonitor(performance_threshold=0.85, min_samples=10, on_alert=alerts.append)
+        for i in range(20):
+            monitor.record_prediction(i, 0.9)
+            monitor.record_label(i, i % 2)
+        
+        assert not monitor.record_label("unknown", 1)
+        assert monitor.check_alerts()[0]['metric'] == 'accuracy'
+        assert len(alerts) == 1
+        
+    def test_concurrent_records_from_threads(self):
+        """Test batches recorded and labelled from several threads are all joined"""
+        monitor = PerformanceMonitor(window_size=4000, min_samples=1)
+        
+        def worker(offset):
+            ids = [offset + i for i in range(500)] + [None]
+            monitor.record_predictions(ids, [0.9] * 501, [1] * 501)
+            assert monitor.record_labels((str(offset + i), 1) for i in range(500)) == 500
+        
+        threads = [threading.Thread(target=worker, args=(k * 1000,)) for k in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        metrics = monitor.metrics()
+        assert metrics['samples'] == 2000
+        assert metrics['accuracy'] == 1.0
+        assert not monitor.pending
+        
+    def test_alerts_only_when_threshold_is_crossed(self):
+        """Test a breach alerts once, and again only after the metric has recovered"""
+        monitor = PerformanceMonitor(performance_threshold=0.85, window_size=20, min_samples=10, max_alerts=1)
+        for i in range(20):
+            monitor.record_prediction(i, 0.9)
+            monitor.record_label(i, i % 2)
+        assert len(monitor.check_alerts()) == 1
+        assert monitor.check_alerts() == []
+        
+        for i in range(20, 40):
+            monitor.record_prediction(i, 0.9)
+            monitor.record_label(i, 1)
+        assert monitor.check_alerts() == [] and not monitor.degraded
+        for i in range(40, 60):
+            monitor.record_prediction(i, 0.9)
+            monitor.record_label(i, 0)
+        assert len(monitor.check_alerts()) == 1
+        assert len(monitor.alerts) == 1
+        
+    def test_lower_is_better_metric(self):
+        """Test calibration error alerts when it rises above the threshold, and unknown metrics are rejected"""
+        monitor = PerformanceMonitor(performance_threshold=0.1, metric="expected_calibration_error", min_samples=10)
+        for i in range(20):
+            monitor.record_prediction(i, 0.95 if i % 2 else 0.05)
+            monitor.record_label(i, i % 2)
+        assert monitor.check_alerts() == []
+        
+        for i in range(20, 40):
+            monitor.record_prediction(i, 0.95)
+            monitor.record_label(i, 0)
+        assert monitor.check_alerts()[0]['metric'] == "expected_calibration_error"
+        
+        with pytest.raises(ValueError, match="Unknown performance metric"):
+            PerformanceMonitor(metric="auc")
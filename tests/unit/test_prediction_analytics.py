@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.models.threshold_optimizer import DecisionPolicy
+from src.monitoring.prediction_analytics import PredictionAnalytics
+
+NOW = 1_700_000_000.0
+
+class TestPredictionAnalytics:
+
+    @pytest.fixture
+    def scored(self, sample_data):
+        features = FEATURE_SCHEMA.select(sample_data)
+        probabilities = np.random.RandomState(0).uniform(size=len(features))
+        policy = DecisionPolicy()
+        return features, probabilities, policy.predict(probabilities), policy.risk_levels(probabilities)
+
+    def test_batch_matches_single_records(self, scored):
+        """Test vectorized batch updates equal one update per prediction"""
+        features, probabilities, predictions, risk_levels = scored
+        single, batch = PredictionAnalytics(), PredictionAnalytics()
+        for record, probability, prediction, risk_level in zip(
+            features.to_dict(orient="records"), probabilities, predictions, risk_levels
+        ):
+            single.record(record, probability, prediction, risk_level, timestamp=NOW)
+        batch.record_batch(features, probabilities, predictions, risk_levels, timestamp=NOW)
+
+        for name, array in single._arrays().items():
+            np.testing.assert_allclose(array, batch._arrays()[name], err_msg=name)
+
+    def test_aggregates(self, scored, monkeypatch):
+        """Test summary, risk, histogram and segment views against the raw predictions"""
+        monkeypatch.setattr("time.time", lambda: NOW)
+        features, probabilities, predictions, risk_levels = scored
+        analytics = PredictionAnalytics()
+        analytics.record_batch(features, probabilities, predictions, risk_levels)
+
+        summary = analytics.summary()
+        assert summary['total_predictions'] == 100
+        assert summary['predicted_churn_rate'] == pytest.approx(predictions.mean())
+        assert summary['high_risk_predictions'] == int((risk_levels == "High").sum())
+        assert analytics.risk_distribution()['Low']['count'] == int((risk_levels == "Low").sum())
+        assert sum(analytics.probability_histogram()['counts']) == 100
+
+        segments = analytics.segment_rates()
+        dsl = features['internet_service'] == "DSL"
+        assert segments['internet_service']['DSL']['count'] == int(dsl.sum())
+        assert segments['internet_service']['DSL']['predicted_churn_rate'] == pytest.approx(predictions[dsl].mean())
+        assert segments['contract_length']['12']['count'] == int((features['contract_length'] == 12).sum())
+
+    def test_buckets_expire(self, monkeypatch):
+        """Test old buckets leave the window and reused slots are reset"""
+        clock = [NOW]
+        monkeypatch.setattr("time.time", lambda: clock[0])
+        analytics = PredictionAnalytics(bucket_seconds=60, n_buckets=3)
+        record = {"contract_length": 12, "payment_method": "Credit Card", "internet_service": "DSL"}
+
+        for minute in range(4):
+            clock[0] = NOW + 60 * minute
+            analytics.record(record, 0.9, 1, "High")
+            analytics.record(record, 0.1, 0, "Low")
+        assert analytics.summary()['total_predictions'] == 6
+        assert analytics.summary(window=1)['total_predictions'] == 2
+        assert [bucket['predictions'] for bucket in analytics.volume()] == [2, 2, 2]
+
+        clock[0] = NOW + 60 * 10
+        assert analytics.summary()['total_predictions'] == 0
+        analytics.record({**record, "payment_method": "Cash"}, 0.5, 0, "Medium")
+        assert analytics.summary()['total_predictions'] == 1
+        assert analytics.segment_rates()['payment_method']['other']['count'] == 1
+
+    def test_save_and_load(self, scored, temp_dir):
+        """Test saved buckets are restored, and ignored if the layout changed"""
+        features, probabilities, predictions, risk_levels = scored
+        analytics = PredictionAnalytics()
+        analytics.record_batch(features, probabilities, predictions, risk_levels, timestamp=NOW)
+        analytics.save(f"{temp_dir}/state.npz")
+
+        restored = PredictionAnalytics()
+        restored.load(f"{temp_dir}/state.npz")
+        np.testing.assert_array_equal(restored.histogram, analytics.histogram)
+
+        resized = PredictionAnalytics(n_buckets=24)
+        resized.load(f"{temp_dir}/state.npz")
+        assert resized.count.sum() == 0
@@ -20,6 +20,18 @@ class TestPredictionPipeline:
         assert pipeline.model is not None
         assert pipeline.preprocessor is not None
         
+    @patch('joblib.load')
+    @patch('pathlib.Path.exists')
+    def test_n_jobs_applied_to_model(self, mock_exists, mock_load):
+        """Test the serving thread budget is set as the model's n_jobs"""
+        from sklearn.ensemble import RandomForestClassifier
+        mock_exists.return_value = True
+        mock_load.side_effect = [RandomForestClassifier(n_jobs=-1), Mock()]
+        
+        pipeline = PredictionPipeline(n_jobs=1)
+        
+        assert pipeline.model.n_jobs == 1
+        
     def test_predict_single(self):
         """Test single prediction"""
         # Mock the pipeline components
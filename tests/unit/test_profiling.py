@@ -0,0 +1,87 @@
+import threading
+import time
+import tracemalloc
+import pytest
+from src.monitoring.profiling import RequestTrace, SamplingProfiler, TraceBuffer, current_trace, phase
+
+
+def _trace(duration_ms):
+    trace = RequestTrace("POST", "/predict")
+    trace.finish(200)
+    trace.duration_ms = duration_ms
+    return trace
+
+
+class TestProfiling:
+
+    def test_phases_accumulate(self):
+        """Test phases split the request time and repeated phases add up"""
+        trace = RequestTrace("POST", "/batch_predict")
+        token = current_trace.set(trace)
+        try:
+            for _ in range(2):
+                phase("transform")
+                time.sleep(0.002)
+                phase("postprocess")
+        finally:
+            current_trace.reset(token)
+        trace.finish(200)
+
+        assert list(trace.phases) == ["receive", "transform", "postprocess"]
+        assert trace.phases["transform"] >= 4
+        assert sum(trace.phases.values()) == pytest.approx(trace.duration_ms)
+        # Outside a traced request phase() is a no-op
+        phase("transform")
+
+    def test_trace_allocations(self):
+        """Test requests record retained blocks, and allocation sizes while tracemalloc runs"""
+        trace = RequestTrace("POST", "/predict")
+        trace.finish(200)
+        assert set(trace.to_dict()['allocations']) == {'retained_blocks'}
+
+        tracemalloc.start()
+        try:
+            trace = RequestTrace("POST", "/predict")
+            payload = [bytearray(1024) for _ in range(200)]
+            trace.finish(200)
+        finally:
+            tracemalloc.stop()
+        assert trace.allocations['retained_blocks'] >= 200
+        assert trace.allocations['peak_kb'] >= 200
+        assert len(payload) == 200
+
+    def test_trace_buffer_keeps_slow_requests(self):
+        """Test tail sampling keeps slow traces in a bounded ring, newest first"""
+        buffer = TraceBuffer(capacity=2, slow_request_ms=100.0)
+        for duration in (5.0, 150.0, 300.0, 450.0):
+            buffer.offer(_trace(duration))
+
+        assert [trace['duration_ms'] for trace in buffer.recent()] == [450.0, 300.0]
+        assert buffer.stats()['seen'] == 4
+        assert buffer.stats()['kept'] == 3
+        assert TraceBuffer(sample_rate=1.0).offer(_trace(1.0))
+
+    def test_sampling_profiler_collapsed_stacks(self):
+        """Test busy threads show up in the collapsed stacks and idle ones do not"""
+        stop = threading.Event()
+
+        def busy_loop():
+            while not stop.is_set():
+                sum(range(1000))
+
+        busy = threading.Thread(target=busy_loop, name="busy")
+        idle = threading.Thread(target=stop.wait, name="idle")
+        busy.start()
+        idle.start()
+        try:
+            profiler = SamplingProfiler(interval=0.001).run(0.2)
+        finally:
+            stop.set()
+            busy.join()
+            idle.join()
+
+        lines = profiler.collapsed().splitlines()
+        assert profiler.samples > 0
+        assert any(line.startswith("busy;") and "busy_loop (" in line for line in lines)
+        assert not any(line.startswith("idle;") for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
@@ -0,0 +1,47 @@
+import pytest
+import numpy as np
+from pathlib import Path
+from src.monitoring.reference_profile import ReferenceProfile
+from src.monitoring.data_drift import DataDriftDetector
+
+class TestReferenceProfile:
+    
+    def test_save_and_load_roundtrip(self, sample_data, temp_dir):
+        """Test profile survives a JSON roundtrip"""
+        profile = ReferenceProfile.from_frame(sample_data, scores=np.linspace(0, 1, 50))
+        path = str(Path(temp_dir) / "reference_profile.json")
+        profile.save(path)
+        
+        loaded = ReferenceProfile.load(path)
+        assert loaded.n_rows == len(sample_data)
+        assert loaded.numeric['age']['quantiles'] == profile.numeric['age']['quantiles']
+        assert loaded.categorical['payment_method'] == profile.categorical['payment_method']
+        assert loaded.scores['count'] == 50
+        
+    def test_drift_detection_from_profile(self, sample_data):
+        """Test profile-backed drift detection flags a shifted feature only"""
+        profile = ReferenceProfile.from_frame(sample_data)
+        detector = DataDriftDetector(reference_profile=profile)
+        
+        current = sample_data.copy()
+        current['monthly_charges'] = current['monthly_charges'] + 100
+        report = detector.detect_drift(current)
+        
+        assert report['monthly_charges']['drift_detected']
+        assert not report['payment_method']['drift_detected']
+        assert 'churn' not in report
+        
+    def test_weighted_profile_matches_unsampled_rows(self, sample_data):
+        """Test sample weights reproduce the counts and moments of the rows they stand for"""
+        weights = np.where(sample_data['churn'] == 0, 3, 1)
+        expanded = sample_data.loc[sample_data.index.repeat(weights)].reset_index(drop=True)
+        weighted = ReferenceProfile.from_frame(sample_data, sample_weight=weights)
+        unsampled = ReferenceProfile.from_frame(expanded)
+        
+        assert weighted.n_rows == len(expanded)
+        assert weighted.categorical == unsampled.categorical
+        for col in ['age', 'tenure', 'monthly_charges']:
+            assert weighted.numeric[col]['count'] == unsampled.numeric[col]['count']
+            assert weighted.numeric[col]['mean'] == pytest.approx(unsampled.numeric[col]['mean'])
+            assert weighted.numeric[col]['std'] == pytest.approx(unsampled.numeric[col]['std'])
+            assert weighted.numeric[col]['histogram'] == unsampled.numeric[col]['histogram']
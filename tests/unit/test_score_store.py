@@ -0,0 +1,61 @@
+import pytest
+from src.config.configuration import ScoreStoreConfig
+from src.models.threshold_optimizer import DecisionPolicy
+from src.pipeline.score_store import ScoreStore
+
+class FakePipeline:
+    decision_policy = DecisionPolicy()
+
+    def __init__(self, model_version="v1"):
+        self.model_version = model_version
+        self.rows_scored = 0
+
+    def predict(self, features):
+        self.rows_scored += len(features)
+        probabilities = features['age'].to_numpy() / 100
+        return self.decision_policy.predict(probabilities), probabilities
+
+class TestScoreStore:
+
+    @pytest.fixture
+    def store(self, temp_dir):
+        return ScoreStore(ScoreStoreConfig(db_path=f"{temp_dir}/scores.db", chunk_size=30))
+
+    @pytest.fixture
+    def input_path(self, sample_data, temp_dir):
+        path = f"{temp_dir}/customers.csv"
+        sample_data.to_csv(path, index=False)
+        return path
+
+    def test_refresh_and_lookup(self, store, input_path, sample_data):
+        """Test every customer is scored and retrievable by id"""
+        summary = store.refresh(input_path, FakePipeline())
+        assert (summary['customers'], summary['scored'], summary['removed']) == (100, 100, 0)
+
+        row = sample_data.iloc[41]
+        score = store.get(int(row['customer_id']))
+        assert score['churn_probability'] == pytest.approx(row['age'] / 100)
+        assert score['risk_level'] == DecisionPolicy().risk_level(row['age'] / 100)
+        assert score['model_version'] == "v1"
+        assert store.get(10_000) is None
+        assert store.stats()['customers'] == 100
+
+    def test_incremental_refresh(self, store, input_path, sample_data, temp_dir):
+        """Test only changed, new or differently-scored customers are re-scored"""
+        store.refresh(input_path, FakePipeline())
+
+        changed = sample_data.iloc[1:].copy()
+        changed.loc[changed.index[:5], 'tenure'] += 1
+        changed.loc[len(changed) + 1] = {**sample_data.iloc[0].to_dict(), 'customer_id': 500}
+        changed.to_csv(input_path, index=False)
+
+        pipeline = FakePipeline()
+        summary = store.refresh(input_path, pipeline)
+        assert (summary['scored'], summary['unchanged'], summary['removed']) == (6, 94, 1)
+        assert pipeline.rows_scored == 6
+        assert store.get(1) is None
+        assert store.get(500) is not None
+
+        summary = store.refresh(input_path, FakePipeline(model_version="v2"))
+        assert summary['scored'] == 100
+        assert store.get(500)['model_version'] == "v2"
@@ -0,0 +1,46 @@
+import pytest
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import SVC
+from src.data.data_transformation import DataTransformation
+from src.data.feature_schema import FEATURE_SCHEMA
+from src.models.score_table import ScoreTable
+
+class TestScoreTable:
+
+    @pytest.fixture
+    def fitted(self, sample_data):
+        preprocessor = DataTransformation().get_data_transformer()
+        features = FEATURE_SCHEMA.select(sample_data)
+        X = preprocessor.fit_transform(features)
+        return preprocessor, features, X, sample_data['churn']
+
+    @pytest.mark.parametrize("model", [
+        RandomForestClassifier(n_estimators=20, max_depth=6, random_state=0),
+        LogisticRegression(max_iter=1000),
+    ])
+    def test_matches_predict_proba(self, fitted, model):
+        """Test tabulated scoring reproduces the full pipeline for every row"""
+        preprocessor, features, X, y = fitted
+        model.fit(X, y)
+        table = ScoreTable.build(model, preprocessor)
+
+        probabilities = model.predict_proba(X)[:, 1]
+        scores = [table.score(record) for record in features.to_dict(orient="records")]
+        np.testing.assert_allclose(scores, probabilities)
+
+    def test_untabulated_rows_fall_back(self, fitted):
+        """Test undeclared discrete values and unsupported models are not tabulated"""
+        preprocessor, features, X, y = fitted
+        table = ScoreTable.build(LogisticRegression().fit(X, y), preprocessor)
+        record = features.iloc[0].to_dict()
+        record['contract_length'] = 6
+        assert table.score(record) is None
+        assert ScoreTable.build(SVC().fit(X, y), preprocessor) is None
+
+    def test_base_class_is_abstract(self, fitted):
+        """Test a table without scoring methods fails when it is created"""
+        preprocessor, features, X, y = fitted
+        with pytest.raises(TypeError):
+            ScoreTable(LogisticRegression().fit(X, y), preprocessor)
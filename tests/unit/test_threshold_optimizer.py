@@ -0,0 +1,63 @@
+import pytest
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from src.config.configuration import DecisionConfig
+from src.models.threshold_optimizer import DecisionPolicy, ThresholdOptimizer
+
+class TestThresholdOptimizer:
+
+    @pytest.fixture
+    def scores(self):
+        rng = np.random.default_rng(1)
+        y_true = rng.integers(0, 2, 300)
+        y_score = np.round(np.clip(0.35 * y_true + rng.random(300) * 0.65, 0, 1), 2)
+        return y_true, y_score
+
+    def test_threshold_minimizes_cost(self, scores):
+        """Test the sweep picks the same cost as checking every threshold directly"""
+        y_true, y_score = scores
+        config = DecisionConfig()
+        policy = ThresholdOptimizer(config).optimize(y_true, y_score)
+
+        def cost(threshold):
+            contacted = y_score >= threshold
+            saved = contacted & (y_true == 1)
+            return (config.action_cost * contacted.sum()
+                    + config.churn_cost * (y_true.sum() - config.action_success_rate * saved.sum()))
+
+        candidates = np.r_[np.unique(y_score), 1.01]
+        assert cost(policy.threshold) == pytest.approx(min(cost(t) for t in candidates))
+
+    def test_risk_cutoffs_minimize_band_cost(self, scores):
+        """Test the band cutoffs match an exhaustive search over ordered pairs"""
+        y_true, y_score = scores
+        config = DecisionConfig()
+        policy = ThresholdOptimizer(config).optimize(y_true, y_score)
+
+        def cost(low, high):
+            high_band = y_score >= high
+            medium_band = (y_score >= low) & ~high_band
+            return (config.high_risk_action_cost * high_band.sum()
+                    + config.medium_risk_action_cost * medium_band.sum()
+                    + config.churn_cost * (y_true.sum()
+                                           - config.high_risk_action_success_rate * (high_band & (y_true == 1)).sum()
+                                           - config.medium_risk_action_success_rate * (medium_band & (y_true == 1)).sum()))
+
+        candidates = np.r_[np.unique(y_score), 1.01]
+        best = min(cost(low, high) for low in candidates for high in candidates if high >= low)
+        assert policy.low_risk_cutoff <= policy.high_risk_cutoff
+        assert cost(policy.low_risk_cutoff, policy.high_risk_cutoff) == pytest.approx(best)
+
+    def test_policy_round_trips_through_model(self, scores):
+        """Test the policy is stored on the model and defaults match the legacy cutoffs"""
+        model = LogisticRegression()
+        assert DecisionPolicy.from_model(model) == DecisionPolicy()
+
+        policy = DecisionPolicy(threshold=0.4, low_risk_cutoff=0.2, high_risk_cutoff=0.6)
+        assert DecisionPolicy.from_model(policy.apply(model)) == policy
+
+        probabilities = np.array([0.1, 0.3, 0.5, 0.7, 0.9])
+        default = DecisionPolicy()
+        assert list(default.risk_levels(probabilities)) == ["Low", "Medium", "Medium", "High", "High"]
+        assert [default.risk_level(p) for p in probabilities] == list(default.risk_levels(probabilities))
+        assert list(policy.predict(probabilities)) == [0, 0, 1, 1, 1]